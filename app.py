@@ -1,14 +1,121 @@
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 from database.db_operations import DatabaseOperations
-from selenium_automation.selenium_executor import SeleniumExecutor
-import json
+from database.excel_operations import ExcelOperations
+from execution.request_coalescer import RequestCoalescer
+from execution.suite_scheduler import SuiteScheduler
+from execution.perf_report import compare_page_performance
+from selenium_automation.selenium_executor import (
+    SeleniumExecutor, ResourceGovernor, SharedBrowserHost, ArtifactStore, EXECUTION_POLICIES
+)
+from selenium_automation.xpath_validator import XPathValidator
+from config import Config
+from logging_config import setup_logging
+from response_utils import (
+    IMMUTABLE_CACHE_CONTROL, PRIVATE_IMMUTABLE_CACHE_CONTROL, compress_response, conditional_json, select_fields
+)
 from datetime import datetime
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
 import traceback
 
+setup_logging()
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
-CORS(app, origins=["http://localhost:5173"])  # Your React app URL
+CORS(app, origins=["http://localhost:5173"], expose_headers=["ETag"])  # Your React app URL
+
+config = Config()
+
+# Endpoints served by each SERVER_ROLE, so read traffic and test execution
+# can be deployed and scaled as separate worker pools. Files written by test
+# runs are on the executing node's disk, so that role serves them.
+ROLE_ENDPOINTS = {
+    'read': {'get_test_result', 'get_test_cases', 'export_test_results', 'get_job', 'get_workers',
+             'compare_page_performance_runs', 'get_xpath_report', 'get_flaky_steps'},
+    'execute': {'execute_test', 'execute_matrix', 'execute_suite', 'resume_test', 'import_test_cases',
+                'enqueue_job', 'get_trace', 'get_artifact'},
+}
+ALWAYS_SERVED_ENDPOINTS = {'health_check', 'detailed_health_check', 'get_resources'}
+
+# Browser sessions running in this process; used to cap concurrency and to
+# let in-flight tests finish during a graceful shutdown
+execution_slots = threading.BoundedSemaphore(config.MAX_CONCURRENT_TESTS)
+in_flight_condition = threading.Condition()
+in_flight_tests = 0
+draining = threading.Event()
+
+coalescer = RequestCoalescer(
+    ttl_seconds=config.RESULT_CACHE_TTL,
+    max_entries=config.RESULT_CACHE_MAX_ENTRIES
+)
+
+
+def acquire_execution_slot(timeout=None):
+    """
+    Reserve a browser slot, returning False when saturated or draining.
+    With a timeout, wait up to that many seconds for a slot to free up.
+    """
+    global in_flight_tests
+    if draining.is_set():
+        return False
+    acquired = (execution_slots.acquire(timeout=timeout) if timeout
+                else execution_slots.acquire(blocking=False))
+    if not acquired:
+        return False
+    with in_flight_condition:
+        in_flight_tests += 1
+    return True
+
+
+def release_execution_slot():
+    """Release a browser slot reserved by acquire_execution_slot"""
+    global in_flight_tests
+    with in_flight_condition:
+        in_flight_tests -= 1
+        in_flight_condition.notify_all()
+    execution_slots.release()
+
+
+def drain_in_flight_tests(timeout):
+    """
+    Stop admitting new test executions and wait for running ones to finish.
+    Returns the number of tests still running when the timeout expired.
+    """
+    draining.set()
+    deadline = time.monotonic() + timeout
+    with in_flight_condition:
+        while in_flight_tests > 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            in_flight_condition.wait(remaining)
+        return in_flight_tests
+
+
+@app.before_request
+def enforce_server_role():
+    """Reject endpoints that are not served by this process's SERVER_ROLE"""
+    role = config.SERVER_ROLE
+    if role == 'all' or request.endpoint is None or request.endpoint in ALWAYS_SERVED_ENDPOINTS:
+        return None
+    
+    if request.endpoint not in ROLE_ENDPOINTS.get(role, set()):
+        return jsonify({
+            "success": False,
+            "error": f"Endpoint not served by '{role}' workers"
+        }), 404
+    return None
+
+@app.after_request
+def compress_json_response(response):
+    """gzip large JSON responses for clients that send Accept-Encoding: gzip"""
+    return compress_response(response)
 
 @app.route('/', methods=['GET'])
 def health_check():
@@ -18,39 +125,41 @@ def health_check():
         "timestamp": datetime.now().isoformat()
     })
 
-@app.route('/api/execute-test', methods=['POST'])
-def execute_test():
-    try:
-        # Get request data
-        request_data = request.get_json()
-        print(f"📥 Received test request: {json.dumps(request_data, indent=2)}")
-        
-        # Extract test data
-        mode = request_data.get('mode')
-        test_data = request_data.get('testData', {})
-        test_case_id = test_data.get('testCaseId')
-        
-        if not mode or not test_case_id:
+def invalid_execution_policy(*test_data_sets):
+    """400 response for an unknown testData.executionPolicy, or None if all are valid"""
+    for test_data in test_data_sets:
+        policy = test_data.get('executionPolicy')
+        if policy is not None and policy not in EXECUTION_POLICIES:
             return jsonify({
-                "success": False, 
-                "error": "Missing required fields: mode and testCaseId"
+                "success": False,
+                "error": f"Unknown executionPolicy '{policy}', expected one of {', '.join(EXECUTION_POLICIES)}"
             }), 400
-        
-        print(f"🚀 Executing test for mode: {mode}, test_case_id: {test_case_id}")
-        
+    return None
+
+class RunnerUnavailable(Exception):
+    """Raised when no browser slot can be reserved for a test run"""
+
+
+def run_test_case(mode, test_data, slot_timeout=None, checkpoint=None):
+    """
+    Fetch steps, execute and store a single test run, resuming from a
+    failed step's checkpoint when one is given.
+    Returns None when the test case has no steps for the mode.
+    """
+    if not acquire_execution_slot(slot_timeout):
+        raise RunnerUnavailable("shutting down" if draining.is_set() else "at capacity")
+    
+    try:
         # Initialize database operations
         db_ops = DatabaseOperations()
         
         # Get XPath data from database
-        xpath_data = db_ops.get_xpath_for_test_case(test_case_id, mode)
+        xpath_data = db_ops.get_xpath_for_test_case(test_data.get('testCaseId'), mode)
         
         if not xpath_data:
-            return jsonify({
-                "success": False, 
-                "error": f"No XPath data found for test case '{test_case_id}' and mode '{mode}'"
-            }), 404
+            return None
         
-        print(f"📊 Found {len(xpath_data)} test steps in database")
+        logger.debug("Found %d test steps in database", len(xpath_data))
         
         # Add mode to test_data for URL construction
         test_data['mode'] = mode
@@ -62,27 +171,81 @@ def execute_test():
         test_result = selenium_executor.execute_test(
             mode=mode,
             test_data=test_data,
-            xpath_data=xpath_data
+            xpath_data=xpath_data,
+            checkpoint=checkpoint
         )
         
         # Store results in database
         result_id = db_ops.store_test_result(test_result)
         if result_id:
             test_result['result_id'] = result_id
+        return test_result
+    finally:
+        release_execution_slot()
+
+@app.route('/api/execute-test', methods=['POST'])
+def execute_test():
+    try:
+        # Get request data
+        request_data = request.get_json()
+        logger.debug("Received test request", extra={'request_keys': sorted((request_data or {}).keys())})
+        
+        # Extract test data
+        mode = request_data.get('mode')
+        test_data = request_data.get('testData', {})
+        test_case_id = test_data.get('testCaseId')
+        
+        if not mode or not test_case_id:
+            return jsonify({
+                "success": False, 
+                "error": "Missing required fields: mode and testCaseId"
+            }), 400
+        
+        policy_error = invalid_execution_policy(test_data)
+        if policy_error:
+            return policy_error
+        
+        if config.EXECUTE_VIA_QUEUE:
+            return enqueue_test_job(mode, test_case_id, test_data, request_data.get('priority', 0))
+        
+        logger.info("Executing test for mode %s, test case %s", mode, test_case_id)
+        
+        # Identical concurrent requests share one run (and, with a TTL, its result)
+        request_key = RequestCoalescer.make_key(mode, test_case_id, test_data)
+        use_cache = not test_data.get('noCache', False)
+        
+        if config.COALESCE_REQUESTS:
+            test_result, source = coalescer.run(
+                request_key, lambda: run_test_case(mode, test_data), use_cache=use_cache
+            )
+        else:
+            test_result, source = run_test_case(mode, test_data), 'executed'
         
-        print(f"✅ Test execution completed - Status: {test_result['status']}")
+        if test_result is None:
+            return jsonify({
+                "success": False, 
+                "error": f"No XPath data found for test case '{test_case_id}' and mode '{mode}'"
+            }), 404
+        
+        logger.info("Test execution completed", extra={'status': test_result['status'], 'result_id': test_result.get('result_id')})
         
         return jsonify({
             "success": True,
-            "result": test_result
+            "execution": source,
+            "result": select_fields(test_result, request.args.get('fields'))
         })
         
+    except RunnerUnavailable as e:
+        return jsonify({
+            "success": False,
+            "error": f"Test runner is {e}, retry later"
+        }), 503
+        
     except Exception as e:
         error_msg = str(e)
         error_trace = traceback.format_exc()
         
-        print(f"❌ Error executing test: {error_msg}")
-        print(f"🔍 Full traceback: {error_trace}")
+        logger.exception("Error executing test: %s", error_msg)
         
         return jsonify({
             "success": False,
@@ -90,6 +253,318 @@ def execute_test():
             "details": error_trace if app.debug else "Enable debug mode for detailed error info"
         }), 500
 
+@app.route('/api/execute-matrix', methods=['POST'])
+def execute_matrix():
+    """Run one test case over many data rows in a single browser session"""
+    try:
+        request_data = request.get_json() or {}
+        
+        mode = request_data.get('mode')
+        test_data = request_data.get('testData', {})
+        if not isinstance(test_data, dict):
+            return jsonify({"success": False, "error": "testData must be an object"}), 400
+        test_case_id = test_data.get('testCaseId')
+        data_rows = request_data.get('rows', [])
+        
+        if not mode or not test_case_id:
+            return jsonify({
+                "success": False, 
+                "error": "Missing required fields: mode and testCaseId"
+            }), 400
+        
+        if mode.lower() not in config.SUPPORTED_MODES:
+            return jsonify({"success": False, "error": f"Unsupported mode '{mode}'"}), 400
+        
+        if not isinstance(data_rows, list) or not data_rows:
+            return jsonify({"success": False, "error": "rows must be a non-empty list"}), 400
+        
+        invalid_rows = [index for index, row in enumerate(data_rows) if not isinstance(row, dict)]
+        if invalid_rows:
+            return jsonify({
+                "success": False,
+                "error": f"rows must be objects of testData overrides (invalid rows: {invalid_rows[:10]})"
+            }), 400
+        
+        policy_error = invalid_execution_policy(test_data, *data_rows)
+        if policy_error:
+            return policy_error
+        
+        if len(data_rows) > config.MAX_MATRIX_ROWS:
+            return jsonify({
+                "success": False,
+                "error": f"Too many rows ({len(data_rows)}), limit is {config.MAX_MATRIX_ROWS}"
+            }), 400
+        
+        if config.EXECUTE_VIA_QUEUE:
+            # Matrix runs need one browser for every row, which a queued job cannot hold
+            return jsonify({
+                "success": False,
+                "error": "Matrix runs are not available when tests run through the job queue"
+            }), 409
+        
+        logger.info("Executing matrix for mode %s, test case %s over %d rows", mode, test_case_id, len(data_rows))
+        
+        if not acquire_execution_slot():
+            status = "shutting down" if draining.is_set() else "at capacity"
+            return jsonify({
+                "success": False,
+                "error": f"Test runner is {status}, retry later"
+            }), 503
+        
+        start_time = datetime.now()
+        try:
+            db_ops = DatabaseOperations()
+            
+            # Steps are fetched once and shared by every row
+            xpath_data = db_ops.get_xpath_for_test_case(test_case_id, mode)
+            
+            if not xpath_data:
+                return jsonify({
+                    "success": False, 
+                    "error": f"No XPath data found for test case '{test_case_id}' and mode '{mode}'"
+                }), 404
+            
+            test_data['mode'] = mode
+            
+            results = SeleniumExecutor().execute_matrix(
+                mode=mode,
+                test_data=test_data,
+                xpath_data=xpath_data,
+                data_rows=data_rows
+            )
+            
+            for test_result in results:
+                result_id = db_ops.store_test_result(test_result)
+                if result_id:
+                    test_result['result_id'] = result_id
+        finally:
+            release_execution_slot()
+        
+        passed_rows = sum(1 for result in results if result['status'] == 'passed')
+        summary = {
+            "total_rows": len(results),
+            "passed_rows": passed_rows,
+            "failed_rows": len(results) - passed_rows,
+            "execution_time": str(datetime.now() - start_time)
+        }
+        logger.info("Matrix execution completed", extra=summary)
+        
+        return jsonify({
+            "success": True,
+            "summary": summary,
+            "results": results
+        })
+        
+    except Exception as e:
+        logger.exception("Error executing matrix: %s", e)
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "details": traceback.format_exc() if app.debug else "Enable debug mode for detailed error info"
+        }), 500
+
+def enqueue_test_job(mode, test_case_id, test_data, priority=0):
+    """Queue a test run for the worker pool and return a 202 response with the job ID"""
+    db_ops = DatabaseOperations()
+    job_id = db_ops.enqueue_job(mode, test_case_id, test_data, priority=priority,
+                                max_attempts=config.JOB_MAX_ATTEMPTS)
+    if job_id is None:
+        return jsonify({"success": False, "error": "Could not enqueue test job"}), 500
+    
+    return jsonify({
+        "success": True,
+        "job_id": job_id,
+        "status": "queued"
+    }), 202
+
+@app.route('/api/jobs', methods=['POST'])
+def enqueue_job():
+    """Queue a test run for the distributed workers"""
+    try:
+        request_data = request.get_json()
+        
+        mode = request_data.get('mode')
+        test_data = request_data.get('testData', {})
+        test_case_id = test_data.get('testCaseId')
+        
+        if not mode or not test_case_id:
+            return jsonify({
+                "success": False, 
+                "error": "Missing required fields: mode and testCaseId"
+            }), 400
+        
+        policy_error = invalid_execution_policy(test_data)
+        if policy_error:
+            return policy_error
+        
+        return enqueue_test_job(mode, test_case_id, test_data, request_data.get('priority', 0))
+        
+    except Exception as e:
+        logger.exception("Error enqueuing job: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    try:
+        job = DatabaseOperations().get_job(job_id)
+        
+        if job:
+            return jsonify({"success": True, "job": job})
+        else:
+            return jsonify({"success": False, "error": "Job not found"}), 404
+            
+    except Exception as e:
+        logger.error("Error retrieving job %s: %s", job_id, e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/workers', methods=['GET'])
+def get_workers():
+    """Live workers, their capacity and the queue depth"""
+    try:
+        # A worker that missed three heartbeats is considered gone
+        workers = DatabaseOperations().get_workers(config.WORKER_HEARTBEAT_SECONDS * 3)
+        
+        if workers is None:
+            return jsonify({"success": False, "error": "Could not read worker registry"}), 500
+        return jsonify({"success": True, **workers})
+        
+    except Exception as e:
+        logger.error("Error retrieving workers: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/execute-suite', methods=['POST'])
+def execute_suite():
+    """Run several test cases in parallel, longest (by history) first"""
+    try:
+        request_data = request.get_json()
+        
+        mode = request_data.get('mode')
+        test_case_ids = request_data.get('testCaseIds', [])
+        test_data = request_data.get('testData', {})
+        
+        if not mode or not isinstance(test_case_ids, list) or not test_case_ids:
+            return jsonify({
+                "success": False, 
+                "error": "Missing required fields: mode and testCaseIds"
+            }), 400
+        
+        try:
+            slots = int(request_data.get('slots', config.MAX_CONCURRENT_TESTS))
+            priority = int(request_data.get('priority', 0))
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "error": "slots and priority must be numbers"}), 400
+        
+        policy_error = invalid_execution_policy(test_data)
+        if policy_error:
+            return policy_error
+        
+        scheduler = SuiteScheduler()
+        
+        if config.EXECUTE_VIA_QUEUE:
+            # Workers claim longest estimate first within the caller's priority
+            estimates = scheduler.estimate_costs(mode, test_case_ids)
+            db_ops = DatabaseOperations()
+            jobs = []
+            for test_case_id in sorted(estimates, key=lambda tc: estimates[tc]['seconds'], reverse=True):
+                job_id = db_ops.enqueue_job(
+                    mode, test_case_id, {**test_data, 'testCaseId': test_case_id},
+                    priority=priority,
+                    max_attempts=config.JOB_MAX_ATTEMPTS,
+                    estimated_seconds=estimates[test_case_id]['seconds']
+                )
+                jobs.append({
+                    "test_case_id": test_case_id,
+                    "job_id": job_id,
+                    "estimated_seconds": round(estimates[test_case_id]['seconds'], 1)
+                })
+            return jsonify({"success": True, "status": "queued", "jobs": jobs}), 202
+        
+        # Suite runs can use at most this process's browser slots
+        slots = max(1, min(slots, config.MAX_CONCURRENT_TESTS))
+        
+        # Each lane holds one slot while it pipelines its share of the suite; a pre-warmed
+        # browser only launches in a spare slot
+        report = scheduler.run(
+            mode, test_case_ids, test_data, slots,
+            reserve_slot=lambda: acquire_execution_slot(config.SERVER_TIMEOUT),
+            release_slot=release_execution_slot,
+            reserve_warm_slot=acquire_execution_slot
+        )
+        return jsonify({"success": True, "suite": report})
+        
+    except Exception as e:
+        logger.exception("Error executing suite: %s", e)
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "details": traceback.format_exc() if app.debug else "Enable debug mode for detailed error info"
+        }), 500
+
+@app.route('/api/resume-test', methods=['POST'])
+def resume_test():
+    """Rerun a failed test from the checkpoint of one of its failed steps"""
+    try:
+        request_data = request.get_json() or {}
+        result_id = request_data.get('resultId')
+        step_number = request_data.get('stepNumber')
+        
+        if not result_id:
+            return jsonify({"success": False, "error": "Missing required field: resultId"}), 400
+        
+        if step_number is not None:
+            try:
+                step_number = int(step_number)
+            except (TypeError, ValueError):
+                return jsonify({"success": False, "error": "stepNumber must be a number"}), 400
+        
+        if config.EXECUTE_VIA_QUEUE:
+            return jsonify({
+                "success": False,
+                "error": "Resuming is not available when tests run through the job queue"
+            }), 409
+        
+        db_ops = DatabaseOperations()
+        previous = db_ops.get_test_result(result_id)
+        if not previous:
+            return jsonify({"success": False, "error": "Test result not found"}), 404
+        
+        # The first failed step with a checkpoint, unless a step is named
+        checkpoint = db_ops.get_checkpoint(result_id, step_number)
+        if not checkpoint:
+            return jsonify({
+                "success": False,
+                "error": "No checkpoint to resume from in this result"
+            }), 409
+        
+        checkpoint['result_id'] = result_id
+        logger.info("Resuming test %s from step %d", previous['test_case_id'], checkpoint['step_index'] + 1)
+        
+        test_result = run_test_case(previous['mode'], previous['test_data'], checkpoint=checkpoint)
+        if test_result is None:
+            return jsonify({
+                "success": False,
+                "error": f"No XPath data found for test case '{previous['test_case_id']}'"
+            }), 404
+        
+        return jsonify({
+            "success": True,
+            "result": select_fields(test_result, request.args.get('fields'))
+        })
+        
+    except RunnerUnavailable as e:
+        return jsonify({
+            "success": False,
+            "error": f"Test runner is {e}, retry later"
+        }), 503
+        
+    except Exception as e:
+        logger.exception("Error resuming test: %s", e)
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "details": traceback.format_exc() if app.debug else "Enable debug mode for detailed error info"
+        }), 500
+
 @app.route('/api/test-result/<result_id>', methods=['GET'])
 def get_test_result(result_id):
     try:
@@ -97,12 +572,127 @@ def get_test_result(result_id):
         result = db_ops.get_test_result(result_id)
         
         if result:
-            return jsonify({"success": True, "result": result})
+            # Stored results never change, so clients and proxies may keep them
+            payload = {"success": True, "result": select_fields(result, request.args.get('fields'))}
+            return conditional_json(payload, IMMUTABLE_CACHE_CONTROL)
         else:
             return jsonify({"success": False, "error": "Test result not found"}), 404
             
     except Exception as e:
-        print(f"❌ Error retrieving test result: {str(e)}")
+        logger.error("Error retrieving test result %s: %s", result_id, e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/traces/<test_id>', methods=['GET'])
+def get_trace(test_id):
+    """Download the Chrome trace-event JSON recorded for a traced run"""
+    if not re.fullmatch(r'[A-Za-z0-9_\-]+', test_id):
+        return jsonify({"success": False, "error": "Invalid test ID"}), 400
+    
+    trace_path = os.path.join(os.path.abspath(config.TRACE_DIR), f"{test_id}.trace.json")
+    if not os.path.isfile(trace_path):
+        return jsonify({"success": False, "error": "Trace not found"}), 404
+    
+    return send_file(trace_path, mimetype='application/json', as_attachment=True)
+
+@app.route('/api/artifacts/<digest>', methods=['GET'])
+def get_artifact(digest):
+    """Screenshot or page source referenced by a step result"""
+    if not re.fullmatch(r'[0-9a-f]{64}', digest):
+        return jsonify({"success": False, "error": "Invalid artifact digest"}), 400
+    
+    artifact = ArtifactStore().load(digest)
+    if artifact is None:
+        return jsonify({"success": False, "error": "Artifact not found"}), 404
+    
+    data, mimetype = artifact
+    # Content-addressed, so a digest always names the same bytes; pages may show
+    # logged-in state, so only the client keeps them
+    response = Response(data, mimetype=mimetype)
+    response.headers['Cache-Control'] = PRIVATE_IMMUTABLE_CACHE_CONTROL
+    response.set_etag(digest)
+    return response.make_conditional(request)
+
+@app.route('/api/perf/compare', methods=['GET'])
+def compare_page_performance_runs():
+    """Compare page performance of a test case's latest run against earlier runs"""
+    try:
+        mode = request.args.get('mode')
+        test_case_id = request.args.get('testCaseId')
+        
+        if not mode or not test_case_id:
+            return jsonify({
+                "success": False, 
+                "error": "Missing required parameters: mode and testCaseId"
+            }), 400
+        
+        try:
+            runs = int(request.args.get('runs', 10))
+        except ValueError:
+            runs = 0
+        if runs < 1:
+            return jsonify({"success": False, "error": "runs must be a positive number"}), 400
+        
+        samples = DatabaseOperations().get_page_performance_history(mode, test_case_id, runs)
+        if samples is None:
+            return jsonify({"success": False, "error": "Could not read performance history"}), 500
+        
+        comparison = compare_page_performance(samples, config.PERF_REGRESSION_THRESHOLD)
+        return jsonify({
+            "success": True,
+            "mode": mode,
+            "test_case_id": test_case_id,
+            "comparison": comparison
+        })
+        
+    except Exception as e:
+        logger.error("Error comparing page performance: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/xpath-report', methods=['GET'])
+def get_xpath_report():
+    """Validate stored locators against the latest DOM snapshots without a browser"""
+    try:
+        mode = request.args.get('mode', None)
+        include_ok = request.args.get('all', 'false').lower() == 'true'
+        
+        if mode and mode.lower() not in config.SUPPORTED_MODES:
+            return jsonify({"success": False, "error": f"Unsupported mode '{mode}'"}), 400
+        
+        report = XPathValidator().run([mode.lower()] if mode else None)
+        if not include_ok:
+            report['locators'] = [result for result in report['locators'] if result['status'] != 'ok']
+        
+        return jsonify({"success": True, "report": report})
+        
+    except Exception as e:
+        logger.error("Error validating XPath locators: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/flaky-steps', methods=['GET'])
+def get_flaky_steps():
+    """Steps that needed retries in recent runs, to find flaky locators"""
+    try:
+        mode = request.args.get('mode', None)
+        
+        if mode and mode.lower() not in config.SUPPORTED_MODES:
+            return jsonify({"success": False, "error": f"Unsupported mode '{mode}'"}), 400
+        
+        try:
+            days = int(request.args.get('days', 30))
+            min_runs = int(request.args.get('minRuns', 1))
+        except ValueError:
+            return jsonify({"success": False, "error": "days and minRuns must be numbers"}), 400
+        if days < 1 or min_runs < 1:
+            return jsonify({"success": False, "error": "days and minRuns must be at least 1"}), 400
+        
+        steps = DatabaseOperations().get_flaky_steps(mode.lower() if mode else None, days, min_runs)
+        if steps is None:
+            return jsonify({"success": False, "error": "Could not read step history"}), 500
+        
+        return jsonify({"success": True, "days": days, "steps": steps})
+        
+    except Exception as e:
+        logger.error("Error retrieving flaky steps: %s", e)
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/test-cases', methods=['GET'])
@@ -113,15 +703,79 @@ def get_test_cases():
         db_ops = DatabaseOperations()
         test_cases = db_ops.get_available_test_cases(mode)
         
-        return jsonify({
+        # The catalog changes on import, so clients revalidate with If-None-Match
+        return conditional_json({
             "success": True,
             "test_cases": test_cases
         })
         
     except Exception as e:
-        print(f"❌ Error retrieving test cases: {str(e)}")
+        logger.error("Error retrieving test cases: %s", e)
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/api/test-cases/import', methods=['POST'])
+def import_test_cases():
+    """Bulk import test steps from an uploaded Excel workbook"""
+    upload = request.files.get('file')
+    if not upload:
+        return jsonify({"success": False, "error": "Missing workbook upload in field 'file'"}), 400
+    
+    mode = request.form.get('mode') or None
+    if mode and mode.lower() not in config.SUPPORTED_MODES:
+        return jsonify({"success": False, "error": f"Unsupported mode '{mode}'"}), 400
+    
+    replace = request.form.get('replace', 'true').lower() == 'true'
+    strict = request.form.get('strict', 'false').lower() == 'true'
+    
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        upload.save(path)
+        summary = ExcelOperations().import_test_cases(path, mode=mode, replace=replace, strict=strict)
+        if summary.get('rolled_back'):
+            return jsonify({"success": False, "error": "Import rolled back: the workbook has invalid rows or sheets",
+                            "summary": summary}), 422
+        return jsonify({"success": True, "summary": summary})
+    
+    except Exception as e:
+        logger.exception("Error importing test cases: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
+    finally:
+        os.remove(path)
+
+@app.route('/api/test-results/export', methods=['GET'])
+def export_test_results():
+    """Download test results as an Excel workbook"""
+    mode = request.args.get('mode', None)
+    since = request.args.get('since', None)
+    include_steps = request.args.get('steps', 'true').lower() == 'true'
+    
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        ExcelOperations().export_test_results(path, mode=mode, since=since, include_steps=include_steps)
+        response = send_file(
+            path,
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            as_attachment=True,
+            download_name=f"test_results_{datetime.now():%Y%m%d_%H%M%S}.xlsx"
+        )
+        response.call_on_close(lambda: os.remove(path))
+        return response
+    
+    except Exception as e:
+        os.remove(path)
+        logger.exception("Error exporting test results: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/resources', methods=['GET'])
+def get_resources():
+    """Live host and per-browser CPU/memory figures for this process"""
+    snapshot = ResourceGovernor.instance().snapshot()
+    snapshot['tests_running'] = in_flight_tests
+    snapshot['shared_browser'] = SharedBrowserHost.instance().snapshot()
+    return jsonify({"success": True, "resources": snapshot})
+
 @app.route('/api/health', methods=['GET'])
 def detailed_health_check():
     """Detailed health check including database connectivity"""
@@ -134,7 +788,9 @@ def detailed_health_check():
         return jsonify({
             "status": "healthy",
             "database": "connected",
-            "selenium": "ready",
+            "selenium": "draining" if draining.is_set() else "ready",
+            "role": config.SERVER_ROLE,
+            "tests_running": in_flight_tests,
             "timestamp": datetime.now().isoformat()
         })
         
@@ -147,9 +803,6 @@ def detailed_health_check():
         }), 500
 
 if __name__ == '__main__':
-    print("🚀 Starting Ixigo Test Automation API...")
-    print("📊 Database: SSMS Integration")
-    print("🌐 CORS: Enabled for React Frontend")
-    print("🔧 Selenium: Ready for test execution")
+    logger.info("Starting Ixigo Test Automation API (development server - use serve.py for production)")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=config.FLASK_DEBUG, host=config.SERVER_HOST, port=config.SERVER_PORT)
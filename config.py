@@ -38,3 +38,128 @@ class Config:
     # Flask Configuration
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
     FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
+    
+    # Booking modes that have a <Mode>_TestCases table
+    SUPPORTED_MODES = ['flight', 'bus', 'train', 'hotel']
+    
+    # Action types understood by IxigoTestClass.execute_action
+    SUPPORTED_ACTION_TYPES = [
+        'OPEN_BROWSER', 'CLICK', 'CLICK_AND_SELECT', 'CLICK_AND_SELECT_DATE',
+        'CLICK_QUICK_DATE', 'CLICK_BUS_QUICK_DATE', 'SELECT_COUNT',
+        'CLICK_AND_SELECT_AGE', 'HANDLE_CHECKBOX',
+    ]
+    
+    # Excel Import/Export Configuration
+    EXCEL_BATCH_SIZE = int(os.getenv('EXCEL_BATCH_SIZE', '1000'))
+    
+    # Logging Configuration
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    # 'text' for human-readable lines, 'json' for one JSON object per line
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()
+    # Keep one in every N high-frequency messages (click attempts, scrolls, ...)
+    LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', '10'))
+    
+    # Step Execution Configuration
+    # continue, stop_on_failure or skip_dependents (individual runs can set testData.executionPolicy)
+    EXECUTION_POLICY = os.getenv('EXECUTION_POLICY', 'skip_dependents')
+    # Extra attempts per action type after a failed step, as ACTION_TYPE:retries pairs
+    STEP_RETRIES = os.getenv(
+        'STEP_RETRIES',
+        'OPEN_BROWSER:1,CLICK:1,CLICK_AND_SELECT:1,CLICK_AND_SELECT_DATE:1,'
+        'CLICK_QUICK_DATE:1,CLICK_BUS_QUICK_DATE:1,HANDLE_CHECKBOX:1'
+    )
+    # Backoff before retry n is STEP_RETRY_BACKOFF * 2^(n-1), capped at STEP_RETRY_MAX_BACKOFF seconds
+    STEP_RETRY_BACKOFF = float(os.getenv('STEP_RETRY_BACKOFF', '0.5'))
+    STEP_RETRY_MAX_BACKOFF = float(os.getenv('STEP_RETRY_MAX_BACKOFF', '4'))
+    
+    # Production Server Configuration
+    SERVER_HOST = os.getenv('SERVER_HOST', '0.0.0.0')
+    SERVER_PORT = int(os.getenv('SERVER_PORT', '5000'))
+    # Which endpoints this process serves: 'all', 'read' or 'execute'
+    SERVER_ROLE = os.getenv('SERVER_ROLE', 'all').lower()
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', '2'))
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', '8'))
+    # Test runs are long-lived requests, so the worker timeout must cover a full run
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', '900'))
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', '600'))
+    SERVER_KEEPALIVE = int(os.getenv('SERVER_KEEPALIVE', '5'))
+    SERVER_BACKLOG = int(os.getenv('SERVER_BACKLOG', '2048'))
+    # Maximum browser sessions a single process will run at once
+    MAX_CONCURRENT_TESTS = int(os.getenv('MAX_CONCURRENT_TESTS', '2'))
+    # Upper bound on data rows accepted by a single matrix run
+    MAX_MATRIX_ROWS = int(os.getenv('MAX_MATRIX_ROWS', '500'))
+    
+    # Request Coalescing Configuration
+    COALESCE_REQUESTS = os.getenv('COALESCE_REQUESTS', 'True').lower() == 'true'
+    # Seconds to reuse a finished result for identical requests (0 disables the cache)
+    RESULT_CACHE_TTL = int(os.getenv('RESULT_CACHE_TTL', '0'))
+    RESULT_CACHE_MAX_ENTRIES = int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '256'))
+    
+    # Distributed Job Queue Configuration
+    # When enabled, /api/execute-test and /api/execute-suite only enqueue and worker.py
+    # runs the tests; matrix and resume requests are refused with 409
+    EXECUTE_VIA_QUEUE = os.getenv('EXECUTE_VIA_QUEUE', 'False').lower() == 'true'
+    WORKER_CAPACITY = int(os.getenv('WORKER_CAPACITY', os.getenv('MAX_CONCURRENT_TESTS', '2')))
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '120'))
+    WORKER_HEARTBEAT_SECONDS = int(os.getenv('WORKER_HEARTBEAT_SECONDS', '30'))
+    JOB_POLL_SECONDS = float(os.getenv('JOB_POLL_SECONDS', '2'))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+    
+    # Suite Scheduling Configuration
+    # Recent runs per test case used to estimate its duration
+    SUITE_HISTORY_RUNS = int(os.getenv('SUITE_HISTORY_RUNS', '10'))
+    # Assumed step duration when a mode has no history yet
+    SUITE_DEFAULT_STEP_SECONDS = float(os.getenv('SUITE_DEFAULT_STEP_SECONDS', '8'))
+    # Suite lanes open the next run's start page while the current run executes, in a spare browser slot
+    PIPELINE_PREWARM_BROWSER = os.getenv('PIPELINE_PREWARM_BROWSER', 'False').lower() == 'true'
+    
+    # Browser Resource Governor Configuration (requires psutil)
+    RESOURCE_GOVERNOR_ENABLED = os.getenv('RESOURCE_GOVERNOR_ENABLED', 'True').lower() == 'true'
+    # Memory that must stay free after launching another browser
+    BROWSER_MIN_FREE_MB = int(os.getenv('BROWSER_MIN_FREE_MB', '1024'))
+    # Assumed footprint of a new browser until real ones have been measured
+    BROWSER_ESTIMATED_MB = int(os.getenv('BROWSER_ESTIMATED_MB', '600'))
+    # Sessions above these limits are recycled between runs (0 disables the CPU limit)
+    BROWSER_MAX_RSS_MB = int(os.getenv('BROWSER_MAX_RSS_MB', '2500'))
+    BROWSER_MAX_CPU_PERCENT = float(os.getenv('BROWSER_MAX_CPU_PERCENT', '0'))
+    RESOURCE_SAMPLE_SECONDS = float(os.getenv('RESOURCE_SAMPLE_SECONDS', '5'))
+    BROWSER_ADMISSION_TIMEOUT = int(os.getenv('BROWSER_ADMISSION_TIMEOUT', '300'))
+    
+    # Shared Browser Configuration
+    # Run tests in isolated contexts of one Chrome per process (individual runs can opt in with testData.sharedBrowser);
+    # raise MAX_CONCURRENT_TESTS to use the extra density
+    SHARED_BROWSER_CONTEXTS = os.getenv('SHARED_BROWSER_CONTEXTS', 'False').lower() == 'true'
+    CONTEXTS_PER_BROWSER = int(os.getenv('CONTEXTS_PER_BROWSER', '6'))
+    
+    # Command Trace Configuration
+    # Trace every run (individual runs can also opt in with testData.trace)
+    TRACE_COMMANDS = os.getenv('TRACE_COMMANDS', 'False').lower() == 'true'
+    TRACE_DIR = os.getenv('TRACE_DIR', 'traces')
+    
+    # Page Performance Capture Configuration
+    # Collect timings on every run (individual runs can also opt in with testData.perf)
+    CAPTURE_PAGE_PERF = os.getenv('CAPTURE_PAGE_PERF', 'False').lower() == 'true'
+    # Relative slowdown against the baseline median reported as a regression
+    PERF_REGRESSION_THRESHOLD = float(os.getenv('PERF_REGRESSION_THRESHOLD', '0.2'))
+    
+    # DOM Snapshot Configuration
+    # Save the page source before every step (individual runs can opt in with testData.snapshot)
+    CAPTURE_DOM_SNAPSHOTS = os.getenv('CAPTURE_DOM_SNAPSHOTS', 'False').lower() == 'true'
+    SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', 'snapshots')
+    
+    # Failure Artifact Configuration
+    # Screenshot and page source of failed steps (individual runs can opt out with testData.artifacts)
+    CAPTURE_FAILURE_ARTIFACTS = os.getenv('CAPTURE_FAILURE_ARTIFACTS', 'True').lower() == 'true'
+    # Also capture after every Nth step (0 disables)
+    ARTIFACT_EVERY_N_STEPS = int(os.getenv('ARTIFACT_EVERY_N_STEPS', '0'))
+    ARTIFACT_DIR = os.getenv('ARTIFACT_DIR', 'artifacts')
+    # Background threads writing artifacts and DOM snapshots
+    ARTIFACT_WRITERS = int(os.getenv('ARTIFACT_WRITERS', '2'))
+    ARTIFACT_RETENTION_DAYS = int(os.getenv('ARTIFACT_RETENTION_DAYS', '14'))
+    ARTIFACT_MAX_MB = int(os.getenv('ARTIFACT_MAX_MB', '2048'))
+    ARTIFACT_PRUNE_SECONDS = int(os.getenv('ARTIFACT_PRUNE_SECONDS', '300'))
+    
+    # API Response Configuration
+    # JSON bodies smaller than this are sent uncompressed
+    COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', '6'))
@@ -2,8 +2,17 @@ import pyodbc
 from config import Config
 from datetime import datetime
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 class DatabaseOperations:
+    # Set once test_result_perf is known to exist
+    _perf_table_ready = False
+    _checkpoint_table_ready = False
+    # Steps table name -> whether it has the optional depends_on / step_group columns
+    _dependency_columns = {}
+    
     def __init__(self):
         self.config = Config()
     
@@ -14,6 +23,7 @@ class DatabaseOperations:
         """
         Fetch XPath elements and action types for given test case and mode
         Updated to work with mode-specific tables like Bus_TestCases, Train_TestCases, etc.
+        Tables may add optional depends_on / step_group columns for execution policies.
         """
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -21,9 +31,11 @@ class DatabaseOperations:
         try:
             # Construct table name based on mode
             table_name = f"{mode.capitalize()}_TestCases"
+            has_dependencies = self._has_dependency_columns(cursor, table_name)
             
+            dependency_columns = ", depends_on, step_group" if has_dependencies else ""
             query = f"""
-            SELECT element_name, xpath_value, action_type, expected_result, step_order
+            SELECT element_name, xpath_value, action_type, expected_result, step_order{dependency_columns}
             FROM {table_name}
             WHERE test_case_id = ?
             ORDER BY step_order ASC
@@ -34,27 +46,45 @@ class DatabaseOperations:
             
             xpath_data = []
             for row in rows:
-                xpath_data.append({
+                step = {
                     'element_name': row[0],
                     'xpath': row[1],
                     'action_type': row[2],
                     'expected_result': row[3],
                     'step_order': row[4]
-                })
+                }
+                if has_dependencies:
+                    step['depends_on'] = row[5]
+                    step['step_group'] = row[6]
+                xpath_data.append(step)
             
-            print(f"✅ Found {len(xpath_data)} XPath elements for {test_case_id} - {mode} from table {table_name}")
+            logger.debug("Found %d XPath elements for %s - %s from table %s",
+                         len(xpath_data), test_case_id, mode, table_name)
             return xpath_data
             
         except Exception as e:
-            print(f"❌ Database error: {str(e)}")
+            logger.error("Database error fetching steps for %s - %s: %s", test_case_id, mode, e)
             return None
         finally:
             conn.close()
     
+    def _has_dependency_columns(self, cursor, table_name):
+        """Whether a steps table has both depends_on and step_group (cached per process)"""
+        if table_name not in DatabaseOperations._dependency_columns:
+            cursor.execute("""
+            SELECT COUNT(*) FROM sys.columns
+            WHERE object_id = OBJECT_ID(?) AND name IN ('depends_on', 'step_group')
+            """, (table_name,))
+            DatabaseOperations._dependency_columns[table_name] = cursor.fetchone()[0] == 2
+        return DatabaseOperations._dependency_columns[table_name]
+    
     def store_test_result(self, test_result):
         """
-        Store test execution results in database
+        Store test execution results in database.
+        Checkpoints of failed steps go to test_checkpoints and are removed
+        from test_result, so they never reach an API response.
         """
+        checkpoints = test_result.pop('checkpoints', None)
         conn = self.get_connection()
         cursor = conn.cursor()
         
@@ -86,11 +116,16 @@ class DatabaseOperations:
             cursor.execute("SELECT @@IDENTITY")
             result_id = cursor.fetchone()[0]
             
-            print(f"✅ Test result stored with ID: {result_id}")
+            logger.info("Test result stored with ID %s", result_id)
+            
+            if test_result.get('page_perf'):
+                self.store_page_performance(result_id, test_result)
+            if checkpoints:
+                self.store_checkpoints(result_id, checkpoints)
             return result_id
             
         except Exception as e:
-            print(f"❌ Error storing test result: {str(e)}")
+            logger.error("Error storing test result: %s", e)
             return None
         finally:
             conn.close()
@@ -115,6 +150,7 @@ class DatabaseOperations:
             row = cursor.fetchone()
             
             if row:
+                result_details = json.loads(row[9])
                 return {
                     'test_id': row[0],
                     'test_case_id': row[1],
@@ -125,13 +161,18 @@ class DatabaseOperations:
                     'failed_steps': row[6],
                     'execution_time': row[7],
                     'test_data': json.loads(row[8]),
-                    'result_details': json.loads(row[9]),
+                    'result_details': result_details,
+                    # Screenshot references are only stored with their steps
+                    'screenshots': [
+                        artifact for step in result_details
+                        for artifact in step.get('artifacts', []) if artifact['kind'] == 'screenshot'
+                    ],
                     'created_at': row[10].isoformat()
                 }
             return None
             
         except Exception as e:
-            print(f"❌ Error retrieving test result: {str(e)}")
+            logger.error("Error retrieving test result %s: %s", result_id, e)
             return None
         finally:
             conn.close()
@@ -165,10 +206,9 @@ class DatabaseOperations:
                     })
             else:
                 # Query all mode tables
-                modes = ['flight', 'bus', 'train', 'hotel']
                 test_cases = []
                 
-                for booking_mode in modes:
+                for booking_mode in self.config.SUPPORTED_MODES:
                     try:
                         table_name = f"{booking_mode.capitalize()}_TestCases"
                         query = f"""
@@ -187,13 +227,757 @@ class DatabaseOperations:
                                 'step_count': row[1]
                             })
                     except Exception as table_error:
-                        print(f"⚠️ Table {table_name} not found or accessible: {str(table_error)}")
+                        logger.warning("Table %s not found or accessible: %s", table_name, table_error)
                         continue
             
             return test_cases
             
         except Exception as e:
-            print(f"❌ Error retrieving test cases: {str(e)}")
+            logger.error("Error retrieving test cases: %s", e)
+            return []
+        finally:
+            conn.close()
+    
+    def ensure_job_tables(self):
+        """
+        Create the job queue tables used by distributed workers if missing
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+            IF OBJECT_ID('test_jobs', 'U') IS NULL
+            CREATE TABLE test_jobs (
+                id INT IDENTITY(1,1) PRIMARY KEY,
+                mode NVARCHAR(20) NOT NULL,
+                test_case_id NVARCHAR(100) NOT NULL,
+                test_data NVARCHAR(MAX) NOT NULL,
+                status NVARCHAR(20) NOT NULL DEFAULT 'queued',
+                priority INT NOT NULL DEFAULT 0,
+                estimated_seconds FLOAT NULL,
+                attempts INT NOT NULL DEFAULT 0,
+                max_attempts INT NOT NULL DEFAULT 3,
+                worker_id NVARCHAR(200) NULL,
+                lease_expires_at DATETIME2 NULL,
+                result_id INT NULL,
+                error NVARCHAR(MAX) NULL,
+                created_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
+                started_at DATETIME2 NULL,
+                finished_at DATETIME2 NULL
+            )
+            """)
+            # Tables created before suite jobs carried a duration estimate
+            cursor.execute("""
+            IF COL_LENGTH('test_jobs', 'estimated_seconds') IS NULL
+            ALTER TABLE test_jobs ADD estimated_seconds FLOAT NULL
+            """)
+            cursor.execute("""
+            IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_test_jobs_claim')
+            CREATE INDEX IX_test_jobs_claim ON test_jobs (status, priority DESC, id)
+            INCLUDE (lease_expires_at, worker_id)
+            """)
+            cursor.execute("""
+            IF OBJECT_ID('test_workers', 'U') IS NULL
+            CREATE TABLE test_workers (
+                worker_id NVARCHAR(200) PRIMARY KEY,
+                hostname NVARCHAR(200) NOT NULL,
+                capacity INT NOT NULL,
+                active_jobs INT NOT NULL DEFAULT 0,
+                started_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
+                last_heartbeat DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
+            )
+            """)
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
+    def enqueue_job(self, mode, test_case_id, test_data, priority=0, max_attempts=3, estimated_seconds=None):
+        """
+        Add a test run to the job queue and return its job ID.
+        Jobs of equal priority are claimed longest estimate first.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            query = """
+            INSERT INTO test_jobs (mode, test_case_id, test_data, priority, estimated_seconds, max_attempts)
+            OUTPUT inserted.id
+            VALUES (?, ?, ?, ?, ?, ?)
+            """
+            cursor.execute(query, (
+                mode, test_case_id, json.dumps(test_data), priority, estimated_seconds, max_attempts
+            ))
+            job_id = cursor.fetchone()[0]
+            conn.commit()
+            
+            logger.info("Enqueued job %s for %s - %s", job_id, test_case_id, mode)
+            return job_id
+            
+        except Exception as e:
+            logger.error("Error enqueuing job for %s - %s: %s", test_case_id, mode, e)
+            return None
+        finally:
+            conn.close()
+    
+    def peek_job(self):
+        """
+        The queued job claim_job would most likely return next, without
+        claiming it, so its steps can be fetched ahead. Returns None if the
+        queue is empty or cannot be read.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+            SELECT TOP (1) id, mode, test_case_id, test_data
+            FROM test_jobs WITH (READPAST)
+            WHERE status = 'queued'
+            ORDER BY priority DESC, estimated_seconds DESC, id ASC
+            """)
+            row = cursor.fetchone()
+            
+            if row:
+                return {
+                    'job_id': row[0],
+                    'mode': row[1],
+                    'test_case_id': row[2],
+                    'test_data': json.loads(row[3])
+                }
+            return None
+            
+        except Exception as e:
+            logger.error("Error peeking at the job queue: %s", e)
+            return None
+        finally:
+            conn.close()
+    
+    def claim_job(self, worker_id, lease_seconds):
+        """
+        Atomically claim the highest-priority queued job for a worker, the
+        longest estimated one among equal priorities.
+        READPAST skips rows locked by other claimers, so concurrent workers
+        never block on or receive the same job.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            query = """
+            WITH next_job AS (
+                SELECT TOP (1) *
+                FROM test_jobs WITH (UPDLOCK, READPAST, ROWLOCK)
+                WHERE status = 'queued'
+                ORDER BY priority DESC, estimated_seconds DESC, id ASC
+            )
+            UPDATE next_job
+            SET status = 'running',
+                worker_id = ?,
+                attempts = attempts + 1,
+                lease_expires_at = DATEADD(second, ?, SYSUTCDATETIME()),
+                started_at = SYSUTCDATETIME()
+            OUTPUT inserted.id, inserted.mode, inserted.test_case_id, inserted.test_data, inserted.attempts
+            """
+            cursor.execute(query, (worker_id, lease_seconds))
+            row = cursor.fetchone()
+            conn.commit()
+            
+            if row:
+                return {
+                    'job_id': row[0],
+                    'mode': row[1],
+                    'test_case_id': row[2],
+                    'test_data': json.loads(row[3]),
+                    'attempts': row[4]
+                }
+            return None
+            
+        except Exception as e:
+            logger.error("Error claiming job: %s", e)
+            return None
+        finally:
+            conn.close()
+    
+    def extend_job_leases(self, job_ids, worker_id, lease_seconds):
+        """
+        Heartbeat for running jobs; returns the IDs whose lease is still held
+        """
+        if not job_ids:
+            return []
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            held = []
+            for job_id in job_ids:
+                cursor.execute("""
+                UPDATE test_jobs
+                SET lease_expires_at = DATEADD(second, ?, SYSUTCDATETIME())
+                WHERE id = ? AND worker_id = ? AND status = 'running'
+                """, (lease_seconds, job_id, worker_id))
+                if cursor.rowcount:
+                    held.append(job_id)
+            conn.commit()
+            return held
+            
+        except Exception as e:
+            logger.error("Error extending job leases: %s", e)
+            return list(job_ids)
+        finally:
+            conn.close()
+    
+    def complete_job(self, job_id, worker_id, status, result_id=None, error=None):
+        """
+        Mark a running job finished. Returns False if the worker had lost its lease.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+            UPDATE test_jobs
+            SET status = ?, result_id = ?, error = ?, finished_at = SYSUTCDATETIME(),
+                lease_expires_at = NULL
+            WHERE id = ? AND worker_id = ? AND status = 'running'
+            """, (status, result_id, error, job_id, worker_id))
+            completed = cursor.rowcount > 0
+            conn.commit()
+            return completed
+            
+        except Exception as e:
+            logger.error("Error completing job %s: %s", job_id, e)
+            return False
+        finally:
+            conn.close()
+    
+    def requeue_expired_jobs(self):
+        """
+        Requeue running jobs whose worker stopped heartbeating; jobs out of
+        attempts are marked failed. Returns the number of jobs affected.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+            UPDATE test_jobs WITH (READPAST)
+            SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+                error = CASE WHEN attempts >= max_attempts
+                             THEN CONCAT('Lease expired on worker ', worker_id) ELSE error END,
+                finished_at = CASE WHEN attempts >= max_attempts THEN SYSUTCDATETIME() ELSE NULL END,
+                worker_id = NULL,
+                lease_expires_at = NULL
+            WHERE status = 'running' AND lease_expires_at < SYSUTCDATETIME()
+            """)
+            affected = cursor.rowcount
+            conn.commit()
+            
+            if affected:
+                logger.warning("Requeued %d job(s) with expired leases", affected)
+            return affected
+            
+        except Exception as e:
+            logger.error("Error requeuing expired jobs: %s", e)
+            return 0
+        finally:
+            conn.close()
+    
+    def get_job(self, job_id):
+        """
+        Retrieve a job's status by ID
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+            SELECT id, mode, test_case_id, status, priority, attempts, max_attempts,
+                   worker_id, result_id, error, created_at, started_at, finished_at
+            FROM test_jobs
+            WHERE id = ?
+            """, (job_id,))
+            row = cursor.fetchone()
+            
+            if row:
+                return {
+                    'job_id': row[0],
+                    'mode': row[1],
+                    'test_case_id': row[2],
+                    'status': row[3],
+                    'priority': row[4],
+                    'attempts': row[5],
+                    'max_attempts': row[6],
+                    'worker_id': row[7],
+                    'result_id': row[8],
+                    'error': row[9],
+                    'created_at': row[10].isoformat() if row[10] else None,
+                    'started_at': row[11].isoformat() if row[11] else None,
+                    'finished_at': row[12].isoformat() if row[12] else None
+                }
+            return None
+            
+        except Exception as e:
+            logger.error("Error retrieving job %s: %s", job_id, e)
+            return None
+        finally:
+            conn.close()
+    
+    def register_worker(self, worker_id, hostname, capacity, active_jobs):
+        """
+        Insert or refresh a worker's heartbeat and reported capacity
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+            MERGE test_workers AS target
+            USING (SELECT ? AS worker_id) AS source
+            ON target.worker_id = source.worker_id
+            WHEN MATCHED THEN
+                UPDATE SET capacity = ?, active_jobs = ?, last_heartbeat = SYSUTCDATETIME()
+            WHEN NOT MATCHED THEN
+                INSERT (worker_id, hostname, capacity, active_jobs)
+                VALUES (?, ?, ?, ?);
+            """, (worker_id, capacity, active_jobs, worker_id, hostname, capacity, active_jobs))
+            conn.commit()
+            
+        except Exception as e:
+            logger.error("Error registering worker %s: %s", worker_id, e)
+        finally:
+            conn.close()
+    
+    def unregister_worker(self, worker_id):
+        """
+        Remove a worker that shut down cleanly
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("DELETE FROM test_workers WHERE worker_id = ?", (worker_id,))
+            conn.commit()
+            
+        except Exception as e:
+            logger.error("Error unregistering worker %s: %s", worker_id, e)
+        finally:
+            conn.close()
+    
+    def get_workers(self, stale_after_seconds):
+        """
+        List workers with a heartbeat in the last stale_after_seconds and
+        the current queue depth
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+            SELECT worker_id, hostname, capacity, active_jobs, started_at, last_heartbeat
+            FROM test_workers
+            WHERE last_heartbeat >= DATEADD(second, -?, SYSUTCDATETIME())
+            ORDER BY worker_id
+            """, (stale_after_seconds,))
+            workers = []
+            for row in cursor.fetchall():
+                workers.append({
+                    'worker_id': row[0],
+                    'hostname': row[1],
+                    'capacity': row[2],
+                    'active_jobs': row[3],
+                    'started_at': row[4].isoformat(),
+                    'last_heartbeat': row[5].isoformat()
+                })
+            
+            cursor.execute("SELECT COUNT(*) FROM test_jobs WHERE status = 'queued'")
+            queued_jobs = cursor.fetchone()[0]
+            
+            return {
+                'workers': workers,
+                'total_capacity': sum(worker['capacity'] for worker in workers),
+                'active_jobs': sum(worker['active_jobs'] for worker in workers),
+                'queued_jobs': queued_jobs
+            }
+            
+        except Exception as e:
+            logger.error("Error retrieving workers: %s", e)
+            return None
+        finally:
+            conn.close()
+    
+    def get_execution_history(self, mode, test_case_ids=None, runs_per_case=10):
+        """
+        Recent completed runs per test case for cost estimation.
+        Returns {test_case_id: [{'execution_time', 'total_steps', 'step_results'}, ...]}
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            query = """
+            SELECT test_case_id, execution_time, total_steps, result_details
+            FROM (
+                SELECT test_case_id, execution_time, total_steps, result_details,
+                       ROW_NUMBER() OVER (PARTITION BY test_case_id ORDER BY created_at DESC) AS run_rank
+                FROM test_results
+                WHERE mode = ? AND status IN ('passed', 'failed')
+            ) AS ranked
+            WHERE run_rank <= ?
+            """
+            params = [mode, runs_per_case]
+            if test_case_ids:
+                placeholders = ", ".join("?" for _ in test_case_ids)
+                query += f" AND test_case_id IN ({placeholders})"
+                params.extend(test_case_ids)
+            
+            cursor.execute(query, params)
+            
+            history = {}
+            for row in cursor.fetchall():
+                history.setdefault(row[0], []).append({
+                    'execution_time': row[1],
+                    'total_steps': row[2],
+                    'step_results': json.loads(row[3]) if row[3] else []
+                })
+            return history
+            
+        except Exception as e:
+            logger.error("Error retrieving execution history for %s: %s", mode, e)
+            return {}
+        finally:
+            conn.close()
+    
+    def ensure_perf_table(self):
+        """
+        Create the per-page performance table if missing (checked once per process)
+        """
+        if DatabaseOperations._perf_table_ready:
+            return
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+            IF OBJECT_ID('test_result_perf', 'U') IS NULL
+            CREATE TABLE test_result_perf (
+                id INT IDENTITY(1,1) PRIMARY KEY,
+                result_id INT NOT NULL,
+                test_case_id NVARCHAR(100) NOT NULL,
+                mode NVARCHAR(20) NOT NULL,
+                step_number INT NOT NULL,
+                page_url NVARCHAR(1000) NOT NULL,
+                ttfb_ms INT NULL,
+                dcl_ms INT NULL,
+                load_ms INT NULL,
+                lcp_ms INT NULL,
+                cls FLOAT NULL,
+                long_tasks INT NULL,
+                long_task_ms INT NULL,
+                resource_count INT NULL,
+                transfer_kb INT NULL,
+                slowest_resource_ms INT NULL,
+                resource_types NVARCHAR(1000) NULL,
+                created_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
+            )
+            """)
+            cursor.execute("""
+            IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_test_result_perf_case')
+            CREATE INDEX IX_test_result_perf_case ON test_result_perf (mode, test_case_id, result_id)
+            """)
+            conn.commit()
+            DatabaseOperations._perf_table_ready = True
+            
+        finally:
+            conn.close()
+    
+    def store_page_performance(self, result_id, test_result):
+        """
+        Store the page performance samples of a stored test result
+        """
+        try:
+            self.ensure_perf_table()
+            conn = self.get_connection()
+        except Exception as e:
+            logger.error("Error preparing performance table: %s", e)
+            return
+        
+        cursor = conn.cursor()
+        
+        try:
+            query = """
+            INSERT INTO test_result_perf
+            (result_id, test_case_id, mode, step_number, page_url, ttfb_ms, dcl_ms, load_ms,
+             lcp_ms, cls, long_tasks, long_task_ms, resource_count, transfer_kb,
+             slowest_resource_ms, resource_types)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """
+            rows = [(
+                result_id,
+                test_result['test_case_id'],
+                test_result['mode'],
+                sample['step'],
+                sample['url'][:1000],
+                sample.get('ttfb'),
+                sample.get('dcl'),
+                sample.get('load'),
+                sample.get('lcp'),
+                sample.get('cls'),
+                sample.get('lt'),
+                sample.get('ltMs'),
+                sample.get('res'),
+                sample.get('kb'),
+                sample.get('slowRes'),
+                json.dumps(sample.get('types', {}))
+            ) for sample in test_result['page_perf']]
+            
+            cursor.fast_executemany = True
+            cursor.executemany(query, rows)
+            conn.commit()
+            
+        except Exception as e:
+            logger.error("Error storing page performance for result %s: %s", result_id, e)
+        finally:
+            conn.close()
+    
+    def ensure_checkpoint_table(self):
+        """
+        Create the table of failed-step checkpoints if missing (checked once per process)
+        """
+        if DatabaseOperations._checkpoint_table_ready:
+            return
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+            IF OBJECT_ID('test_checkpoints', 'U') IS NULL
+            CREATE TABLE test_checkpoints (
+                id INT IDENTITY(1,1) PRIMARY KEY,
+                result_id INT NOT NULL,
+                step_number INT NOT NULL,
+                checkpoint NVARCHAR(MAX) NOT NULL,
+                created_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
+            )
+            """)
+            cursor.execute("""
+            IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_test_checkpoints_result')
+            CREATE INDEX IX_test_checkpoints_result ON test_checkpoints (result_id, step_number)
+            """)
+            conn.commit()
+            DatabaseOperations._checkpoint_table_ready = True
+            
+        finally:
+            conn.close()
+    
+    def store_checkpoints(self, result_id, checkpoints):
+        """
+        Store the checkpoints of a stored test result's failed steps, by step number
+        """
+        try:
+            self.ensure_checkpoint_table()
+            conn = self.get_connection()
+        except Exception as e:
+            logger.error("Error preparing checkpoint table: %s", e)
+            return
+        
+        cursor = conn.cursor()
+        
+        try:
+            query = """
+            INSERT INTO test_checkpoints (result_id, step_number, checkpoint)
+            VALUES (?, ?, ?)
+            """
+            rows = [
+                (result_id, step_number, json.dumps(checkpoint))
+                for step_number, checkpoint in checkpoints.items()
+            ]
+            cursor.executemany(query, rows)
+            conn.commit()
+            
+        except Exception as e:
+            logger.error("Error storing checkpoints for result %s: %s", result_id, e)
+        finally:
+            conn.close()
+    
+    def get_checkpoint(self, result_id, step_number=None):
+        """
+        Checkpoint of a result's first failed step, or of the given step.
+        Returns None if there is none.
+        """
+        try:
+            self.ensure_checkpoint_table()
+            conn = self.get_connection()
+        except Exception as e:
+            logger.error("Error preparing checkpoint table: %s", e)
+            return None
+        
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+            SELECT TOP (1) step_number, checkpoint
+            FROM test_checkpoints
+            WHERE result_id = ? AND (? IS NULL OR step_number = ?)
+            ORDER BY step_number ASC
+            """, (result_id, step_number, step_number))
+            row = cursor.fetchone()
+            
+            if row:
+                return {**json.loads(row[1]), 'step_number': row[0]}
+            return None
+            
+        except Exception as e:
+            logger.error("Error retrieving checkpoint for result %s: %s", result_id, e)
+            return None
+        finally:
+            conn.close()
+    
+    def get_page_performance_history(self, mode, test_case_id, runs=10):
+        """
+        Page performance samples of the most recent runs of a test case, newest first
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            query = """
+            SELECT p.result_id, p.step_number, p.page_url, p.ttfb_ms, p.dcl_ms, p.load_ms,
+                   p.lcp_ms, p.cls, p.long_tasks, p.long_task_ms, p.resource_count,
+                   p.transfer_kb, p.created_at
+            FROM test_result_perf p
+            WHERE p.mode = ? AND p.test_case_id = ? AND p.result_id IN (
+                SELECT DISTINCT TOP (?) result_id
+                FROM test_result_perf
+                WHERE mode = ? AND test_case_id = ?
+                ORDER BY result_id DESC
+            )
+            ORDER BY p.result_id DESC, p.step_number ASC
+            """
+            cursor.execute(query, (mode, test_case_id, runs, mode, test_case_id))
+            
+            samples = []
+            for row in cursor.fetchall():
+                samples.append({
+                    'result_id': row[0],
+                    'step_number': row[1],
+                    'page_url': row[2],
+                    'ttfb_ms': row[3],
+                    'dcl_ms': row[4],
+                    'load_ms': row[5],
+                    'lcp_ms': row[6],
+                    'cls': row[7],
+                    'long_tasks': row[8],
+                    'long_task_ms': row[9],
+                    'resource_count': row[10],
+                    'transfer_kb': row[11],
+                    'created_at': row[12].isoformat()
+                })
+            return samples
+            
+        except Exception as e:
+            logger.error("Error retrieving page performance for %s - %s: %s", test_case_id, mode, e)
+            return None
+        finally:
+            conn.close()
+    
+    def get_all_test_steps(self, mode):
+        """
+        Every stored step of a mode, ordered by test case and step order
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            table_name = f"{mode.capitalize()}_TestCases"
+            query = f"""
+            SELECT test_case_id, element_name, xpath_value, action_type, step_order
+            FROM {table_name}
+            ORDER BY test_case_id ASC, step_order ASC
+            """
+            cursor.execute(query)
+            
+            steps = []
+            for row in cursor.fetchall():
+                steps.append({
+                    'test_case_id': row[0],
+                    'element_name': row[1],
+                    'xpath': row[2],
+                    'action_type': row[3],
+                    'step_order': row[4]
+                })
+            return steps
+            
+        except Exception as e:
+            logger.warning("Table for mode %s not found or accessible: %s", mode, e)
             return []
         finally:
             conn.close()
+    
+    def get_flaky_steps(self, mode=None, days=30, min_runs=1):
+        """
+        Steps that needed retries in recent runs, most often retried first.
+        Aggregates the per-step attempts stored in result_details.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            query = """
+            SELECT r.mode, r.test_case_id, s.step_number, s.element_name, s.action_type,
+                   COUNT(*) AS runs,
+                   SUM(CASE WHEN s.attempts > 1 THEN 1 ELSE 0 END) AS retried_runs,
+                   SUM(CASE WHEN s.attempts > 1 AND s.status = 'passed' THEN 1 ELSE 0 END) AS recovered_runs,
+                   SUM(CASE WHEN s.status = 'failed' THEN 1 ELSE 0 END) AS failed_runs,
+                   SUM(s.attempts - 1) AS extra_attempts,
+                   MAX(r.created_at) AS last_seen
+            FROM test_results r
+            CROSS APPLY OPENJSON(r.result_details) WITH (
+                step_number INT '$.step_number',
+                element_name NVARCHAR(200) '$.element_name',
+                action_type NVARCHAR(50) '$.action_type',
+                status NVARCHAR(20) '$.status',
+                attempts INT '$.attempts'
+            ) AS s
+            WHERE r.created_at >= DATEADD(day, -?, GETDATE()) AND s.attempts IS NOT NULL
+            """
+            params = [days]
+            if mode:
+                query += " AND r.mode = ?"
+                params.append(mode)
+            query += """
+            GROUP BY r.mode, r.test_case_id, s.step_number, s.element_name, s.action_type
+            HAVING SUM(CASE WHEN s.attempts > 1 THEN 1 ELSE 0 END) > 0 AND COUNT(*) >= ?
+            ORDER BY retried_runs DESC, extra_attempts DESC
+            """
+            params.append(min_runs)
+            cursor.execute(query, params)
+            
+            steps = []
+            for row in cursor.fetchall():
+                steps.append({
+                    'mode': row[0],
+                    'test_case_id': row[1],
+                    'step_number': row[2],
+                    'element_name': row[3],
+                    'action_type': row[4],
+                    'runs': row[5],
+                    'retried_runs': row[6],
+                    'recovered_runs': row[7],
+                    'failed_runs': row[8],
+                    'extra_attempts': row[9],
+                    'retry_rate': round(row[6] / row[5], 3) if row[5] else None,
+                    'last_seen': row[10].isoformat() if row[10] else None
+                })
+            return steps
+            
+        except Exception as e:
+            logger.error("Error retrieving flaky steps: %s", e)
+            return None
+        finally:
+            conn.close()
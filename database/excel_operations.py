@@ -0,0 +1,355 @@
+import argparse
+import json
+import logging
+import re
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from config import Config
+from database.db_operations import DatabaseOperations
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ['test_case_id', 'element_name', 'xpath_value', 'action_type', 'step_order']
+OPTIONAL_COLUMNS = ['expected_result']
+
+# Alternative header spellings used in the QA team's sheets
+COLUMN_ALIASES = {
+    'xpath': 'xpath_value',
+    'testcaseid': 'test_case_id',
+    'tc_id': 'test_case_id',
+    'element': 'element_name',
+    'action': 'action_type',
+    'step': 'step_order',
+    'step_no': 'step_order',
+    'expected': 'expected_result',
+}
+
+RESULT_COLUMNS = [
+    'id', 'test_id', 'test_case_id', 'mode', 'status', 'total_steps', 'passed_steps',
+    'failed_steps', 'execution_time', 'test_data', 'created_at'
+]
+STEP_COLUMNS = [
+    'result_id', 'test_id', 'step_number', 'element_name', 'action_type', 'xpath',
+    'test_value', 'status', 'message'
+]
+
+# Validation errors kept in an import summary; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+
+def cell_value_as_string(cell):
+    """Cell text with whole numbers written without a decimal point"""
+    if cell is None or cell.value is None:
+        return ""
+    value = cell.value
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def normalize_header(cell):
+    header = re.sub(r'[\s\-]+', '_', cell_value_as_string(cell).lower())
+    return COLUMN_ALIASES.get(header, header)
+
+
+class ExcelOperations:
+    """
+    Bulk import of test steps from workbooks and export of test results.
+    Workbooks are streamed (read-only / write-only mode) so memory stays flat
+    regardless of sheet size.
+    """
+
+    def __init__(self, db_ops=None):
+        self.config = Config()
+        self.db_ops = db_ops or DatabaseOperations()
+        self.batch_size = self.config.EXCEL_BATCH_SIZE
+
+    def resolve_mode(self, mode, sheet_title):
+        """Use the given mode, or derive it from a sheet named e.g. 'Flight' or 'Flight_TestCases'"""
+        candidate = (mode or sheet_title.split('_')[0]).strip().lower()
+        return candidate if candidate in self.config.SUPPORTED_MODES else None
+
+    def validate_row(self, row):
+        """Return an error message for an invalid step row, or None"""
+        for column in REQUIRED_COLUMNS:
+            if not row.get(column):
+                return f"Missing {column}"
+
+        if row['action_type'] not in self.config.SUPPORTED_ACTION_TYPES:
+            return f"Unknown action_type '{row['action_type']}'"
+
+        try:
+            row['step_order'] = int(row['step_order'])
+        except ValueError:
+            return f"step_order '{row['step_order']}' is not a number"
+
+        for xpath in row['xpath_value'].split('|'):
+            if not xpath.strip():
+                return "xpath_value contains an empty alternative"
+        return None
+
+    def import_test_cases(self, source, mode=None, replace=True, strict=False):
+        """
+        Stream step rows from a workbook into the <Mode>_TestCases tables.
+
+        Each sheet is imported into the table for `mode`, or for the mode named
+        by the sheet title when no mode is given. With `replace`, existing steps
+        of every test case found in the workbook are deleted first, but only for
+        test cases whose rows are all valid, across every sheet of that mode;
+        the others are left untouched. Invalid rows and sheets are skipped and
+        reported; with `strict` the whole import is rolled back if anything was
+        skipped.
+        """
+        summary = {'inserted': 0, 'skipped': 0, 'invalid_sheets': 0, 'errors': [], 'sheets': {}}
+        workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+        conn = self.db_ops.get_connection()
+        cursor = conn.cursor()
+        cursor.fast_executemany = True
+
+        try:
+            sheets = []
+            for sheet in workbook.worksheets:
+                sheet_mode = self.resolve_mode(mode, sheet.title)
+                if not sheet_mode:
+                    logger.warning("Skipping sheet '%s': cannot determine booking mode", sheet.title)
+                    continue
+                indexes = self._column_indexes(sheet, summary)
+                if indexes is not None:
+                    sheets.append((sheet, sheet_mode, indexes))
+                summary['sheets'][sheet.title] = {'mode': sheet_mode, 'inserted': 0}
+
+            # A test case is only replaced when every one of its rows is valid,
+            # wherever they are in the workbook, so a first streaming pass finds
+            # the ones that are not. Both sets are keyed by (mode, test_case_id).
+            rejected_test_cases = set()
+            if replace:
+                for sheet, sheet_mode, indexes in sheets:
+                    for _, row, error in self._parse_rows(sheet, indexes):
+                        if error:
+                            rejected_test_cases.add((sheet_mode, row['test_case_id']))
+
+            seen_test_cases = set()
+            for sheet, sheet_mode, indexes in sheets:
+                summary['sheets'][sheet.title]['inserted'] = self._import_sheet(
+                    cursor, sheet, sheet_mode, indexes, replace, summary, seen_test_cases, rejected_test_cases
+                )
+
+            if strict and (summary['skipped'] or summary['invalid_sheets']):
+                conn.rollback()
+                summary['inserted'] = 0
+                for sheet_summary in summary['sheets'].values():
+                    sheet_summary['inserted'] = 0
+                summary['rolled_back'] = True
+                logger.warning("Import rolled back: %d invalid row(s), %d invalid sheet(s)",
+                               summary['skipped'], summary['invalid_sheets'])
+            else:
+                conn.commit()
+                logger.info("Imported test steps", extra={
+                    'inserted': summary['inserted'], 'skipped': summary['skipped']
+                })
+            return summary
+
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            workbook.close()
+            conn.close()
+
+    def _column_indexes(self, sheet, summary):
+        """Map each known column to its position, or return None for a sheet missing required columns"""
+        header_row = next(sheet.iter_rows(max_row=1), None)
+        if not header_row:
+            return None
+
+        headers = [normalize_header(cell) for cell in header_row]
+        missing = [column for column in REQUIRED_COLUMNS if column not in headers]
+        if missing:
+            summary['invalid_sheets'] += 1
+            self._add_error(summary, sheet.title, 1, f"Missing columns: {', '.join(missing)}")
+            return None
+
+        return {column: headers.index(column) for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+                if column in headers}
+
+    def _import_sheet(self, cursor, sheet, mode, indexes, replace, summary, seen_test_cases, rejected_test_cases):
+        table_name = f"{mode.capitalize()}_TestCases"
+        insert_query = f"""
+        INSERT INTO {table_name}
+        (test_case_id, element_name, xpath_value, action_type, expected_result, step_order)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """
+        delete_query = f"DELETE FROM {table_name} WHERE test_case_id = ?"
+
+        batch = []
+        inserted = 0
+
+        for row_number, row, error in self._parse_rows(sheet, indexes):
+            if error:
+                summary['skipped'] += 1
+                self._add_error(summary, sheet.title, row_number, error)
+                continue
+
+            key = (mode, row['test_case_id'])
+            if key in rejected_test_cases:
+                summary['skipped'] += 1
+                self._add_error(summary, sheet.title, row_number,
+                                f"Test case '{row['test_case_id']}' has invalid rows and was not replaced")
+                continue
+
+            if replace and key not in seen_test_cases:
+                # Pending inserts may belong to a test case being replaced now
+                inserted += self._flush(cursor, insert_query, batch)
+                cursor.execute(delete_query, (row['test_case_id'],))
+            seen_test_cases.add(key)
+
+            batch.append((
+                row['test_case_id'],
+                row['element_name'],
+                row['xpath_value'],
+                row['action_type'],
+                row.get('expected_result') or None,
+                row['step_order'],
+            ))
+            if len(batch) >= self.batch_size:
+                inserted += self._flush(cursor, insert_query, batch)
+
+        inserted += self._flush(cursor, insert_query, batch)
+        summary['inserted'] += inserted
+        return inserted
+
+    def _parse_rows(self, sheet, indexes):
+        """Yield (row number, row, validation error) for each non-empty data row"""
+        for row_number, cells in enumerate(sheet.iter_rows(min_row=2), start=2):
+            if not any(cell.value is not None for cell in cells):
+                continue
+
+            row = {
+                column: cell_value_as_string(cells[index]) if index < len(cells) else ""
+                for column, index in indexes.items()
+            }
+            row['action_type'] = row['action_type'].upper()
+            yield row_number, row, self.validate_row(row)
+
+    def _flush(self, cursor, query, batch):
+        if not batch:
+            return 0
+        count = len(batch)
+        cursor.executemany(query, batch)
+        batch.clear()
+        return count
+
+    def _add_error(self, summary, sheet_title, row_number, message):
+        if len(summary['errors']) < MAX_REPORTED_ERRORS:
+            summary['errors'].append({'sheet': sheet_title, 'row': row_number, 'error': message})
+
+    def export_test_results(self, destination, mode=None, since=None, include_steps=True):
+        """
+        Stream rows from test_results into a write-only workbook.
+
+        Results go to a 'Results' sheet and, with `include_steps`, every step
+        from result_details goes to a 'Steps' sheet. Rows are fetched in
+        batches, so the export never holds the full result set in memory.
+        Returns the number of results written.
+        """
+        workbook = openpyxl.Workbook(write_only=True)
+        results_sheet = workbook.create_sheet('Results')
+        results_sheet.append(self._header_cells(results_sheet, RESULT_COLUMNS))
+        steps_sheet = None
+        if include_steps:
+            steps_sheet = workbook.create_sheet('Steps')
+            steps_sheet.append(self._header_cells(steps_sheet, STEP_COLUMNS))
+
+        query = """
+        SELECT id, test_id, test_case_id, mode, status, total_steps, passed_steps,
+               failed_steps, execution_time, test_data, created_at, result_details
+        FROM test_results
+        WHERE (? IS NULL OR mode = ?) AND (? IS NULL OR created_at >= ?)
+        ORDER BY id ASC
+        """
+
+        conn = self.db_ops.get_connection()
+        cursor = conn.cursor()
+        exported = 0
+
+        try:
+            cursor.execute(query, (mode, mode, since, since))
+            while True:
+                rows = cursor.fetchmany(self.batch_size)
+                if not rows:
+                    break
+
+                for row in rows:
+                    results_sheet.append(list(row[:11]))
+                    if steps_sheet is not None and row[11]:
+                        for step in json.loads(row[11]):
+                            steps_sheet.append([
+                                row[0],
+                                row[1],
+                                step.get('step_number'),
+                                step.get('element_name'),
+                                step.get('action_type'),
+                                step.get('xpath'),
+                                step.get('test_value'),
+                                step.get('status'),
+                                step.get('message') or step.get('error'),
+                            ])
+                    exported += 1
+
+            workbook.save(destination)
+            logger.info("Exported %d test result(s)", exported)
+            return exported
+
+        finally:
+            conn.close()
+
+    def _header_cells(self, sheet, columns):
+        cells = []
+        for column in columns:
+            cell = WriteOnlyCell(sheet, value=column)
+            cell.font = Font(bold=True)
+            cells.append(cell)
+        return cells
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import test steps from / export results to Excel")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help="Import test steps from a workbook")
+    import_parser.add_argument('path')
+    import_parser.add_argument('--mode', help="Booking mode for every sheet (default: from sheet name)")
+    import_parser.add_argument('--append', action='store_true', help="Keep existing steps of imported test cases")
+    import_parser.add_argument('--strict', action='store_true', help="Roll back if any row is invalid")
+
+    export_parser = subparsers.add_parser('export', help="Export test results to a workbook")
+    export_parser.add_argument('path')
+    export_parser.add_argument('--mode')
+    export_parser.add_argument('--since', help="Only results created on or after this date (YYYY-MM-DD)")
+    export_parser.add_argument('--no-steps', action='store_true', help="Skip the per-step sheet")
+
+    args = parser.parse_args()
+    excel_ops = ExcelOperations()
+
+    if args.command == 'import':
+        summary = excel_ops.import_test_cases(
+            args.path, mode=args.mode, replace=not args.append, strict=args.strict
+        )
+        print(json.dumps(summary, indent=2))
+    else:
+        count = excel_ops.export_test_results(
+            args.path, mode=args.mode, since=args.since, include_steps=not args.no_steps
+        )
+        print(f"Exported {count} test result(s) to {args.path}")
+
+
+if __name__ == '__main__':
+    from logging_config import setup_logging
+
+    setup_logging()
+    main()
@@ -0,0 +1,73 @@
+import statistics
+from urllib.parse import urlsplit
+
+# Stored metrics compared across runs, with the smallest change worth reporting
+METRIC_FLOORS = {
+    'ttfb_ms': 50,
+    'dcl_ms': 100,
+    'load_ms': 100,
+    'lcp_ms': 100,
+    'cls': 0.05,
+    'long_task_ms': 50,
+    'transfer_kb': 100,
+    'resource_count': 10,
+}
+
+
+def page_key(sample):
+    """Pages are matched across runs by step and URL path (query strings vary per search)"""
+    return sample['step_number'], urlsplit(sample['page_url']).path
+
+
+def compare_page_performance(samples, threshold):
+    """
+    Compare the newest run of a test case against the median of its earlier
+    runs, page by page. A metric regresses when it is worse than the baseline
+    by more than `threshold` (relative) and by more than its absolute floor.
+    """
+    run_ids = []
+    for sample in samples:
+        if sample['result_id'] not in run_ids:
+            run_ids.append(sample['result_id'])
+
+    if not run_ids:
+        return {'latest_result_id': None, 'baseline_runs': 0, 'pages': [], 'regressions': []}
+
+    latest_id = run_ids[0]
+    baseline = {}
+    latest = {}
+    for sample in samples:
+        target = latest if sample['result_id'] == latest_id else baseline
+        target.setdefault(page_key(sample), []).append(sample)
+
+    pages = []
+    regressions = []
+    for key, latest_samples in latest.items():
+        current = latest_samples[0]
+        page = {'step_number': key[0], 'path': key[1], 'url': current['page_url'], 'metrics': {}}
+
+        for metric, floor in METRIC_FLOORS.items():
+            value = current.get(metric)
+            history = [s[metric] for s in baseline.get(key, []) if s.get(metric) is not None]
+            entry = {'latest': value, 'baseline': None, 'delta': None, 'delta_pct': None}
+
+            if value is not None and history:
+                reference = statistics.median(history)
+                delta = value - reference
+                entry.update({
+                    'baseline': round(reference, 3),
+                    'delta': round(delta, 3),
+                    'delta_pct': round(delta / reference, 3) if reference else None,
+                })
+                if delta > floor and (not reference or delta / reference > threshold):
+                    regressions.append({'step_number': key[0], 'path': key[1], 'metric': metric, **entry})
+
+            page['metrics'][metric] = entry
+        pages.append(page)
+
+    return {
+        'latest_result_id': latest_id,
+        'baseline_runs': len(run_ids) - 1,
+        'pages': pages,
+        'regressions': regressions,
+    }
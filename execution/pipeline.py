@@ -0,0 +1,203 @@
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from database.db_operations import DatabaseOperations
+from selenium_automation.selenium_executor import SeleniumExecutor
+
+logger = logging.getLogger(__name__)
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def job_key(job):
+    """Identity of a job's work, to match a look-ahead preparation with the job later claimed"""
+    return job['mode'], job['test_case_id'], json.dumps(job['test_data'], sort_keys=True, default=str)
+
+
+class PreparedRun:
+    """A job whose steps are fetched and compiled, optionally with a warm browser"""
+
+    def __init__(self, job):
+        self.job = job
+        self.key = job_key(job)
+        self.xpath_data = None
+        self.executor = None
+        self.error = None
+        self.started_at = None
+        self.timings = {}
+        self.holds_warm_slot = False
+
+
+class RunPipeline:
+    """
+    Runs a lane of jobs back to back, overlapping each run with the
+    preparation of the next one and the storage of the previous one:
+
+      fetch    - load the next job's steps from the database
+      compile  - resolve every step's test value
+      warm     - launch its browser and open the start page (PIPELINE_PREWARM_BROWSER)
+      execute  - run the steps
+      persist  - store the result on a background thread
+
+    A job is a dict with 'mode', 'test_case_id' and 'test_data'. Jobs are
+    only claimed once the lane is free; while a run executes, the lane looks
+    ahead at the job it will probably claim next and prepares it without
+    claiming it. Stage timings in milliseconds are added to each result as
+    'pipeline_timings'.
+
+    The warm browser is a second browser for the lane while the current run
+    executes, so it is only launched when reserve_warm_slot() grants one
+    more browser slot; release_warm_slot() is called once the lane is back
+    to one browser.
+    """
+
+    def __init__(self, db_ops=None, prewarm=None, reserve_warm_slot=None, release_warm_slot=None):
+        self.config = Config()
+        self.db_ops = db_ops or DatabaseOperations()
+        self.prewarm = self.config.PIPELINE_PREWARM_BROWSER if prewarm is None else prewarm
+        self.reserve_warm_slot = reserve_warm_slot
+        self.release_warm_slot = release_warm_slot
+        self._prepare_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pipeline-prepare')
+        self._persist_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pipeline-persist')
+
+    def prepare(self, job, warm=False):
+        """Fetch, compile and (optionally) warm up one job; never raises"""
+        prepared = PreparedRun(job)
+        try:
+            started = time.perf_counter()
+            xpath_data = self.db_ops.get_xpath_for_test_case(job['test_case_id'], job['mode'])
+            prepared.timings['fetch_ms'] = _elapsed_ms(started)
+            if not xpath_data:
+                return prepared
+
+            test_data = job['test_data']
+            test_data['mode'] = job['mode']
+
+            started = time.perf_counter()
+            executor = SeleniumExecutor()
+            prepared.xpath_data = executor.compile_steps(xpath_data, test_data)
+            prepared.timings['compile_ms'] = _elapsed_ms(started)
+            prepared.executor = executor
+
+            if warm and self.reserve_warm_slot():
+                prepared.holds_warm_slot = True
+                started = time.perf_counter()
+                try:
+                    executor.prewarm(test_data, prepared.xpath_data)
+                    prepared.timings['warm_ms'] = _elapsed_ms(started)
+                except Exception as e:
+                    # The run launches its own browser as usual
+                    logger.warning("Could not pre-warm browser for %s: %s", job['test_case_id'], e)
+                    self._release_warm_slot(prepared)
+
+        except Exception as e:
+            logger.exception("Could not prepare %s: %s", job['test_case_id'], e)
+            prepared.error = str(e)
+        return prepared
+
+    def prepare_ahead(self, job):
+        """Prepare a job the lane has looked at but not claimed"""
+        warm = self.prewarm and self.reserve_warm_slot is not None
+        return self.prepare(job, warm=warm)
+
+    def adopt(self, job, ahead):
+        """The look-ahead preparation if it is for the claimed job, otherwise a fresh one"""
+        if ahead is not None:
+            prepared = ahead.result()
+            if prepared.key == job_key(job) and not prepared.error:
+                # The claimed job carries queue fields (job_id, attempts) the peeked one may lack
+                job['test_data'] = prepared.job['test_data']
+                prepared.job = job
+                return prepared
+            self.discard(prepared)
+        return self.prepare(job)
+
+    def execute(self, prepared):
+        """Run a prepared job; returns None when the test case has no steps"""
+        # The previous run's browser is closed by now, so a warm one is the lane's only browser
+        self._release_warm_slot(prepared)
+        if prepared.error or not prepared.xpath_data:
+            return None
+
+        job = prepared.job
+        prepared.started_at = time.monotonic()
+        started = time.perf_counter()
+        test_result = prepared.executor.execute_test(
+            mode=job['mode'], test_data=job['test_data'], xpath_data=prepared.xpath_data
+        )
+        prepared.executor = None
+        prepared.timings['execute_ms'] = _elapsed_ms(started)
+        test_result['pipeline_timings'] = prepared.timings
+        return test_result
+
+    def persist_async(self, prepared, test_result, on_done):
+        """Store the result on the persist thread, then call on_done(prepared, test_result, result_id)"""
+        def persist():
+            result_id = None
+            try:
+                if test_result is not None:
+                    started = time.perf_counter()
+                    result_id = self.db_ops.store_test_result(test_result)
+                    prepared.timings['persist_ms'] = _elapsed_ms(started)
+                    if result_id:
+                        test_result['result_id'] = result_id
+            except Exception as e:
+                logger.exception("Could not store result of %s: %s", prepared.job['test_case_id'], e)
+            finally:
+                on_done(prepared, test_result, result_id)
+
+        return self._persist_pool.submit(persist)
+
+    def discard(self, prepared):
+        """Close the warm browser of a prepared job that will not run here"""
+        if prepared.executor:
+            prepared.executor.close_session()
+            prepared.executor = None
+        self._release_warm_slot(prepared)
+
+    def _release_warm_slot(self, prepared):
+        if prepared.holds_warm_slot:
+            prepared.holds_warm_slot = False
+            self.release_warm_slot()
+
+    def run_lane(self, take_job, on_done, should_stop=None, peek_job=None):
+        """
+        Run jobs from take_job() until it returns None or should_stop() is
+        true. take_job claims a job and may block until one is available.
+        peek_job(), if given, returns the job take_job would probably return
+        next without claiming it (or None); it must not block.
+        """
+        ahead = None
+        try:
+            while not (should_stop and should_stop()):
+                job = take_job()
+                if job is None:
+                    break
+
+                started = time.perf_counter()
+                prepared = self.adopt(job, ahead)
+                prepared.timings['wait_ms'] = _elapsed_ms(started)
+
+                next_job = peek_job() if peek_job else None
+                ahead = self._prepare_pool.submit(self.prepare_ahead, next_job) if next_job else None
+
+                try:
+                    test_result = self.execute(prepared)
+                except Exception as e:
+                    logger.exception("Run of %s failed: %s", prepared.job['test_case_id'], e)
+                    prepared.error = str(e)
+                    test_result = None
+                self.persist_async(prepared, test_result, on_done)
+        finally:
+            if ahead is not None:
+                self.discard(ahead.result())
+
+    def close(self):
+        """Wait for queued result writes and stop the pipeline threads"""
+        self._prepare_pool.shutdown(wait=True)
+        self._persist_pool.shutdown(wait=True)
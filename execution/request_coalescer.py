@@ -0,0 +1,101 @@
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+# test_data keys that do not change what a run does
+VOLATILE_KEYS = {'mode', 'noCache'}
+
+
+class RequestCoalescer:
+    """
+    Share one execution between identical concurrent test requests.
+
+    Requests are identified by a canonical hash of (mode, testCaseId, testData).
+    While a run is in flight, identical requests wait for it instead of starting
+    another browser session. Finished results can optionally be kept for a short
+    TTL so back-to-back duplicates are answered from memory.
+
+    State is per process; each server worker coalesces its own requests.
+    """
+
+    def __init__(self, ttl_seconds=0, max_entries=256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._cache = OrderedDict()
+
+    @staticmethod
+    def make_key(mode, test_case_id, test_data):
+        """Canonical hash of the inputs that determine a run"""
+        payload = {
+            'mode': (mode or '').lower(),
+            'test_case_id': test_case_id,
+            'test_data': {k: v for k, v in (test_data or {}).items() if k not in VOLATILE_KEYS},
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def run(self, key, func, use_cache=True):
+        """
+        Return (result, source) where source is 'executed', 'coalesced' or 'cached'.
+        Exceptions raised by func propagate to every caller sharing the run.
+        """
+        with self._lock:
+            if use_cache:
+                cached = self._get_cached(key)
+                if cached is not None:
+                    return copy.deepcopy(cached), 'cached'
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not owner:
+            logger.info("Coalescing with in-flight run", extra={'request_key': key[:12]})
+            return copy.deepcopy(future.result()), 'coalesced'
+
+        try:
+            result = func()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            if self._should_cache(result):
+                self._cache[key] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(result))
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        future.set_result(result)
+        return result, 'executed'
+
+    def _get_cached(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        return result
+
+    def _should_cache(self, result):
+        # Runs that errored out (browser crash, infrastructure) are worth retrying
+        return self.ttl_seconds > 0 and result is not None and result.get('status') != 'error'
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,213 @@
+import heapq
+import logging
+import re
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from database.db_operations import DatabaseOperations
+from execution.pipeline import RunPipeline
+
+logger = logging.getLogger(__name__)
+
+_EXECUTION_TIME_PATTERN = re.compile(r'^(?:(\d+) days?, )?(\d+):(\d{2}):(\d{2}(?:\.\d+)?)$')
+
+
+def parse_execution_time(value):
+    """Parse a stored str(timedelta) such as '0:01:23.456789' into seconds"""
+    if value is None:
+        return None
+    match = _EXECUTION_TIME_PATTERN.match(str(value).strip())
+    if not match:
+        return None
+    days, hours, minutes, seconds = match.groups()
+    return int(days or 0) * 86400 + int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+class SuiteScheduler:
+    """
+    Orders a suite of test cases longest-first across the available browser
+    slots, using run and step durations from test_results to estimate cost.
+
+    Longest-processing-time-first keeps a slow case from starting last and
+    stretching the whole run; the plan's makespan is reported next to the
+    actual wall time so estimates can be checked.
+    """
+
+    def __init__(self, db_ops=None):
+        self.config = Config()
+        self.db_ops = db_ops or DatabaseOperations()
+
+    def estimate_costs(self, mode, test_case_ids):
+        """
+        Estimated seconds per test case, with the basis used for each:
+        'runs' - median of recent runs with the current step count
+        'steps' - sum of per-step median durations (steps changed since those runs)
+        'default' - step count times the mode-wide median step duration
+        """
+        history = self.db_ops.get_execution_history(
+            mode, test_case_ids, runs_per_case=self.config.SUITE_HISTORY_RUNS
+        )
+        step_counts = {
+            case['test_case_id']: case['step_count']
+            for case in self.db_ops.get_available_test_cases(mode)
+        }
+
+        all_step_durations = [
+            step['duration']
+            for runs in history.values() for run in runs for step in run['step_results']
+            if step.get('duration') is not None
+        ]
+        default_step_seconds = (
+            statistics.median(all_step_durations) if all_step_durations
+            else self.config.SUITE_DEFAULT_STEP_SECONDS
+        )
+
+        estimates = {}
+        for test_case_id in test_case_ids:
+            runs = history.get(test_case_id, [])
+            step_count = step_counts.get(test_case_id)
+            estimates[test_case_id] = self._estimate_case(runs, step_count, default_step_seconds)
+        return estimates
+
+    def _estimate_case(self, runs, step_count, default_step_seconds):
+        matching_runs = [
+            parse_execution_time(run['execution_time']) for run in runs
+            if step_count is None or run['total_steps'] == step_count
+        ]
+        matching_runs = [seconds for seconds in matching_runs if seconds is not None]
+        if matching_runs:
+            return {'seconds': statistics.median(matching_runs), 'basis': 'runs', 'samples': len(matching_runs)}
+
+        durations_by_step = {}
+        for run in runs:
+            for step in run['step_results']:
+                if step.get('duration') is not None:
+                    durations_by_step.setdefault(step['step_number'], []).append(step['duration'])
+        if durations_by_step:
+            total_steps = step_count or max(durations_by_step)
+            seconds = sum(
+                statistics.median(durations_by_step[number]) if number in durations_by_step
+                else default_step_seconds
+                for number in range(1, total_steps + 1)
+            )
+            return {'seconds': seconds, 'basis': 'steps', 'samples': len(runs)}
+
+        return {'seconds': (step_count or 1) * default_step_seconds, 'basis': 'default', 'samples': 0}
+
+    def plan(self, estimates, slots):
+        """
+        Longest-first list schedule over `slots`.
+        Returns (ordered test case IDs, predicted makespan in seconds, slot assignment).
+        """
+        order = sorted(estimates, key=lambda test_case_id: estimates[test_case_id]['seconds'], reverse=True)
+        loads = [(0.0, slot) for slot in range(max(1, slots))]
+        assignment = {}
+
+        for test_case_id in order:
+            load, slot = heapq.heappop(loads)
+            assignment[test_case_id] = slot
+            heapq.heappush(loads, (load + estimates[test_case_id]['seconds'], slot))
+
+        makespan = max(load for load, _ in loads)
+        return order, makespan, assignment
+
+    def run(self, mode, test_case_ids, test_data, slots, reserve_slot=None, release_slot=None,
+            reserve_warm_slot=None):
+        """
+        Execute the suite over `slots` RunPipeline lanes, dispatching
+        longest-first: a lane takes the next case from the shared order only
+        when it is free, and prepares the case then at the head of the order
+        while its current case runs.
+        A lane only starts once reserve_slot() returns True, and calls
+        release_slot() when it has no more work. Pre-warmed browsers need a
+        slot of their own from reserve_warm_slot(), which must not block.
+        """
+        estimates = self.estimate_costs(mode, test_case_ids)
+        order, predicted_makespan, assignment = self.plan(estimates, slots)
+        logger.info("Suite planned", extra={
+            'test_cases': len(order), 'slots': slots, 'predicted_makespan': round(predicted_makespan, 1)
+        })
+
+        remaining = deque(order)
+        queue_lock = threading.Lock()
+        outcomes = {}
+        suite_start = time.monotonic()
+
+        def make_job(test_case_id):
+            return {'mode': mode, 'test_case_id': test_case_id, 'test_data': {**test_data, 'testCaseId': test_case_id}}
+
+        def take_job():
+            with queue_lock:
+                if not remaining:
+                    return None
+                test_case_id = remaining.popleft()
+            return make_job(test_case_id)
+
+        def peek_job():
+            with queue_lock:
+                test_case_id = remaining[0] if remaining else None
+            return make_job(test_case_id) if test_case_id else None
+
+        def on_done(prepared, test_result, result_id):
+            outcomes[prepared.job['test_case_id']] = (prepared, test_result, time.monotonic() - suite_start)
+
+        def lane():
+            if reserve_slot and not reserve_slot():
+                return
+            pipeline = RunPipeline(db_ops=self.db_ops, reserve_warm_slot=reserve_warm_slot,
+                                   release_warm_slot=release_slot)
+            try:
+                pipeline.run_lane(take_job, on_done, peek_job=peek_job)
+            finally:
+                pipeline.close()
+                if release_slot:
+                    release_slot()
+
+        with ThreadPoolExecutor(max_workers=max(1, slots), thread_name_prefix='suite') as pool:
+            for _ in range(max(1, slots)):
+                pool.submit(lane)
+
+        actual_wall_time = time.monotonic() - suite_start
+        cases = []
+        for test_case_id in order:
+            estimate = estimates[test_case_id]
+            case = {
+                'test_case_id': test_case_id,
+                'estimated_seconds': round(estimate['seconds'], 1),
+                'estimate_basis': estimate['basis'],
+                'planned_slot': assignment[test_case_id],
+            }
+            if test_case_id not in outcomes:
+                case.update({'status': 'error', 'error': "Not run: no browser slot became available"})
+            else:
+                prepared, result, finished = outcomes[test_case_id]
+                case['stage_timings'] = prepared.timings
+                if prepared.started_at is not None:
+                    case.update({
+                        'started_at_offset': round(prepared.started_at - suite_start, 1),
+                        'actual_seconds': round(prepared.timings.get('execute_ms', 0) / 1000, 1),
+                    })
+                if prepared.error:
+                    case.update({'status': 'error', 'error': prepared.error})
+                else:
+                    case.update({'status': result['status'] if result else 'not_found', 'result': result})
+            cases.append(case)
+
+        report = {
+            'mode': mode,
+            'slots': slots,
+            'predicted_wall_time': round(predicted_makespan, 1),
+            'actual_wall_time': round(actual_wall_time, 1),
+            'passed': sum(1 for case in cases if case['status'] == 'passed'),
+            'failed': sum(1 for case in cases if case['status'] != 'passed'),
+            'cases': cases,
+        }
+        logger.info("Suite completed", extra={
+            'predicted_wall_time': report['predicted_wall_time'],
+            'actual_wall_time': report['actual_wall_time'],
+        })
+        return report
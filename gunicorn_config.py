@@ -0,0 +1,49 @@
+"""
+Gunicorn settings for running the Ixigo Test Automation API in production.
+
+Usage:
+    gunicorn -c gunicorn_config.py app:app
+
+All values come from Config, so they can be tuned through the .env file.
+"""
+from config import Config
+
+# Private name: gunicorn treats a module-level `config` as its config file path setting
+_config = Config()
+
+bind = f"{_config.SERVER_HOST}:{_config.SERVER_PORT}"
+backlog = _config.SERVER_BACKLOG
+
+# Threaded workers: test executions spend most of their time waiting on the
+# browser, so a few processes with several threads each is the best fit
+workers = _config.SERVER_WORKERS
+worker_class = 'gthread'
+threads = _config.SERVER_THREADS
+
+# A single test run can take minutes, so the worker timeout has to cover it
+timeout = _config.SERVER_TIMEOUT
+
+# On SIGTERM workers stop accepting connections and get this long to finish
+# in-flight test executions before being killed
+graceful_timeout = _config.SERVER_GRACEFUL_TIMEOUT
+
+keepalive = _config.SERVER_KEEPALIVE
+
+# Each worker imports app.py itself, so per-process state stays per-process
+preload_app = False
+
+
+def on_starting(server):
+    server.log.info(
+        f"Starting Ixigo Test Automation API (role={_config.SERVER_ROLE}, "
+        f"workers={workers}, threads={threads}, max_tests={_config.MAX_CONCURRENT_TESTS})"
+    )
+
+
+def worker_exit(server, worker):
+    """Report tests that were still running when the worker stopped"""
+    from app import drain_in_flight_tests
+
+    remaining = drain_in_flight_tests(0)
+    if remaining:
+        server.log.warning(f"Worker {worker.pid} exited with {remaining} test(s) still running")
@@ -0,0 +1,162 @@
+"""
+Structured, non-blocking logging for the API and the Selenium executor.
+
+Log calls on the executing thread only filter the record and put it on a
+queue; formatting and console I/O happen on a background QueueListener
+thread. Every record carries the test_id of the run that produced it, and
+high-frequency messages can be sampled by passing ``extra={'sample': key}``.
+"""
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from config import Config
+
+_test_id = contextvars.ContextVar('test_id', default=None)
+_listener = None
+_setup_lock = threading.Lock()
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {
+    'message', 'asctime', 'test_id', 'sample', 'taskName'
+}
+
+
+@contextmanager
+def log_context(test_id):
+    """Tag every record logged inside the block with the given test_id"""
+    token = _test_id.set(test_id)
+    try:
+        yield
+    finally:
+        _test_id.reset(token)
+
+
+def current_test_id():
+    """Return the test_id of the run active on this thread, if any"""
+    return _test_id.get()
+
+
+class CorrelationFilter(logging.Filter):
+    """Attach the active test_id to each record"""
+
+    def filter(self, record):
+        if getattr(record, 'test_id', None) is None:
+            record.test_id = _test_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Let through one in every N records that share the same `sample` key"""
+
+    def __init__(self, every_n):
+        super().__init__()
+        self.every_n = max(1, every_n)
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, 'sample', None)
+        if key is None or self.every_n == 1:
+            return True
+
+        with self._lock:
+            count = self._counters.get(key, 0)
+            self._counters[key] = count + 1
+
+        if count % self.every_n:
+            return False
+        record.sampled_every = self.every_n
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread"""
+
+    def prepare(self, record):
+        # Resolve %-args now so later mutation of the arguments cannot change
+        # the message, but skip the formatter and traceback rendering
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _extra_fields(record):
+    return {
+        key: value for key, value in record.__dict__.items()
+        if key not in _RESERVED_ATTRS and not key.startswith('_')
+    }
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        if getattr(record, 'test_id', None):
+            entry['test_id'] = record.test_id
+        entry.update(_extra_fields(record))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines with extra fields appended as key=value pairs"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s%(test_tag)s: %(message)s')
+
+    def format(self, record):
+        test_id = getattr(record, 'test_id', None)
+        record.test_tag = f" [{test_id}]" if test_id else ""
+        line = super().format(record)
+        extras = {k: v for k, v in _extra_fields(record).items() if k != 'test_tag'}
+        if extras:
+            line += " | " + " ".join(f"{key}={value}" for key, value in extras.items())
+        return line
+
+
+def setup_logging(level=None, log_format=None):
+    """
+    Route the root logger through a queue to a background writer thread.
+    Safe to call more than once; only the first call has an effect.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        config = Config()
+        log_format = (log_format or config.LOG_FORMAT).lower()
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(JsonFormatter() if log_format == 'json' else TextFormatter())
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        queue_handler.addFilter(CorrelationFilter())
+        queue_handler.addFilter(SamplingFilter(config.LOG_SAMPLE_EVERY))
+
+        root = logging.getLogger()
+        root.handlers = [queue_handler]
+        root.setLevel(level or config.LOG_LEVEL)
+
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
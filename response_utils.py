@@ -0,0 +1,68 @@
+"""
+Response helpers for the API: field selection, ETag/conditional GETs and
+gzip compression of JSON payloads.
+"""
+import gzip
+
+from flask import jsonify, request
+
+from config import Config
+
+config = Config()
+
+# Bulky per-step data left out of ?fields=summary
+DETAIL_FIELDS = {'step_results', 'result_details', 'page_perf', 'screenshots', 'test_data'}
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# For immutable responses that must not be kept by shared caches
+PRIVATE_IMMUTABLE_CACHE_CONTROL = 'private, max-age=31536000, immutable'
+
+
+def select_fields(result, fields=None):
+    """
+    Trim a test result according to a ?fields= value:
+    'summary' drops the per-step details, a comma-separated list keeps only
+    those keys, and None/'full' returns the result unchanged.
+    """
+    if not fields or fields == 'full' or not isinstance(result, dict):
+        return result
+    if fields == 'summary':
+        return {key: value for key, value in result.items() if key not in DETAIL_FIELDS}
+
+    wanted = {field.strip() for field in fields.split(',') if field.strip()}
+    return {key: value for key, value in result.items() if key in wanted}
+
+
+def conditional_json(payload, cache_control='no-cache'):
+    """
+    JSON response with a content ETag that answers 304 Not Modified when the
+    client's If-None-Match still matches
+    """
+    response = jsonify(payload)
+    response.add_etag()
+    response.headers['Cache-Control'] = cache_control
+    return response.make_conditional(request)
+
+
+def compress_response(response):
+    """gzip JSON bodies above COMPRESS_MIN_BYTES for clients that accept it"""
+    if (response.direct_passthrough
+            or response.status_code < 200 or response.status_code >= 300
+            or response.mimetype != 'application/json'
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+        return response
+
+    body = response.get_data()
+    if len(body) < config.COMPRESS_MIN_BYTES:
+        return response
+
+    response.set_data(gzip.compress(body, compresslevel=config.COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+
+    # The compressed bytes differ from what the strong ETag describes
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
@@ -1,9 +1,9 @@
 
 import time
 import os
+import logging
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
@@ -20,7 +20,55 @@ from webdriver_manager.chrome import ChromeDriverManager
 import openpyxl
 from openpyxl.styles import Font
 from openpyxl.utils import get_column_letter
+from resource_governor import ResourceGovernor
+from browser_host import SharedBrowserHost, build_chrome_options
 
+logger = logging.getLogger(__name__)
+
+# Installed before any page script runs so buffered LCP, layout shifts and
+# long tasks are collected from the very start of each navigation
+PERF_OBSERVER_SCRIPT = """
+(() => {
+    const perf = window.__ixigoPerf = {lcp: null, cls: 0, longTasks: 0, longTaskMs: 0};
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(callback))
+                .observe({type: type, buffered: true});
+        } catch (e) {}
+    };
+    observe('largest-contentful-paint', entry => { perf.lcp = entry.startTime; });
+    observe('layout-shift', entry => { if (!entry.hadRecentInput) perf.cls += entry.value; });
+    observe('longtask', entry => { perf.longTasks += 1; perf.longTaskMs += entry.duration; });
+})();
+"""
+
+COLLECT_PERF_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+const perf = window.__ixigoPerf || {};
+let transfer = 0, slowest = 0;
+const byType = {};
+for (const r of resources) {
+    transfer += r.transferSize || 0;
+    slowest = Math.max(slowest, r.duration);
+    byType[r.initiatorType] = (byType[r.initiatorType] || 0) + 1;
+}
+const ms = value => value == null ? null : Math.round(value);
+return {
+    url: location.href,
+    ttfb: nav ? ms(nav.responseStart) : null,
+    dcl: nav ? ms(nav.domContentLoadedEventEnd) : null,
+    load: nav ? ms(nav.loadEventEnd) : null,
+    lcp: ms(perf.lcp),
+    cls: perf.cls == null ? null : Math.round(perf.cls * 1000) / 1000,
+    lt: perf.longTasks == null ? null : perf.longTasks,
+    ltMs: ms(perf.longTaskMs),
+    res: resources.length,
+    kb: Math.round(transfer / 1024),
+    slowRes: ms(slowest),
+    types: byType
+};
+"""
 
 class BaseClass:
     def __init__(self):
@@ -28,44 +76,96 @@ class BaseClass:
         self.wait = None
         self.fluent_wait = None
         self.actions = None
+        # Optional CommandTracer recording commands, waits and sleeps
+        self.tracer = None
+        # Install page performance observers on every navigation
+        self.capture_performance = False
+        # Run in a context of the shared Chrome instead of a dedicated browser
+        self.use_shared_browser = False
+        self.browser_context = None
+        # Start page already loaded by SeleniumExecutor.prewarm
+        self.prewarmed_url = None
 
     def launch_browser(self):
         """Initialize WebDriver with optimized settings"""
+        if self.use_shared_browser:
+            # Isolated context inside the process-wide shared Chrome
+            self.browser_context = SharedBrowserHost.instance().open_context()
+            self.driver = self.browser_context.driver
+            try:
+                self.configure_driver()
+            except Exception as e:
+                self.close_browser()
+                logger.error("Error opening browser context: %s", e)
+                raise RuntimeError(f"Failed to open browser context: {str(e)}")
+            logger.info("Browser context opened successfully")
+            return
+        
+        governor = ResourceGovernor.instance()
+        # Wait until the host has memory for another browser
+        governor.admit()
+        registered = False
         try:
-            # Chrome options for optimized performance
-            chrome_options = Options()
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_argument("--remote-allow-origins=*")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
             # Use WebDriverManager to automatically handle ChromeDriver
             service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            # Remove webdriver property
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            # Configure timeouts
-            self.driver.maximize_window()
-            self.driver.implicitly_wait(5)
-            self.driver.set_page_load_timeout(60)
+            self.driver = webdriver.Chrome(service=service, options=build_chrome_options())
+            governor.register(id(self), self.driver)
+            registered = True
+            self.configure_driver()
             
-            # Initialize wait objects
-            self.wait = WebDriverWait(self.driver, 30)
-            self.fluent_wait = WebDriverWait(self.driver, 45, poll_frequency=0.5, 
-            ignored_exceptions=[NoSuchElementException, TimeoutException, StaleElementReferenceException])
-            
-            self.actions = ActionChains(self.driver)
-            
-            print("✓ Browser launched successfully")
+            logger.info("Browser launched successfully")
             
         except Exception as e:
-            print(f"✗ Error launching browser: {str(e)}")
+            if not registered:
+                governor.cancel_admission()
+            logger.error("Error launching browser: %s", e)
             raise RuntimeError(f"Failed to launch browser: {str(e)}")
 
+    def configure_driver(self):
+        """Apply tracing, stealth, timeouts and waits to a freshly started driver"""
+        if self.tracer:
+            self.tracer.attach(self.driver)
+        
+        # Remove webdriver property
+        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        
+        if self.capture_performance:
+            self.enable_performance_capture()
+        
+        # Configure timeouts
+        self.driver.maximize_window()
+        self.driver.implicitly_wait(5)
+        self.driver.set_page_load_timeout(60)
+        
+        # Initialize wait objects
+        self.wait = WebDriverWait(self.driver, 30)
+        self.fluent_wait = WebDriverWait(self.driver, 45, poll_frequency=0.5, 
+        ignored_exceptions=[NoSuchElementException, TimeoutException, StaleElementReferenceException])
+        
+        self.actions = ActionChains(self.driver)
+
+    def enable_performance_capture(self):
+        """Register the LCP/CLS/long-task observers for all future navigations"""
+        try:
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': PERF_OBSERVER_SCRIPT})
+        except Exception as e:
+            logger.warning("Could not enable performance capture: %s", e)
+
+    def collect_page_performance(self):
+        """Navigation timing, resource summary and LCP/CLS/long tasks of the current page"""
+        try:
+            return self.driver.execute_script(COLLECT_PERF_SCRIPT)
+        except Exception as e:
+            logger.debug("Could not collect page performance: %s", e)
+            return None
+
+    def pause(self, seconds):
+        """Sleep between UI interactions (recorded when a tracer is attached)"""
+        if self.tracer:
+            self.tracer.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
     def find_element_with_advanced_wait(self, xpath_with_alternatives):
         """Find element with multiple XPath options and advanced waiting strategies"""
         if not xpath_with_alternatives or not xpath_with_alternatives.strip():
@@ -106,16 +206,16 @@ class BaseClass:
         """Wait for SPA to be ready"""
         try:
             self.wait.until(lambda driver: driver.execute_script("return document.readyState") == "complete")
-            time.sleep(1)
+            self.pause(1)
         except Exception:
-            print("SPA ready wait completed")
+            logger.debug("SPA ready wait timed out, continuing")
 
     def perform_robust_click(self, element):
         """Enhanced click with fallback strategies"""
         for attempt in range(1, 4):
             try:
                 self.scroll_to_element(element)
-                time.sleep(0.2)
+                self.pause(0.2)
                 
                 if attempt == 1:
                     element.click()
@@ -124,13 +224,13 @@ class BaseClass:
                 elif attempt == 3:
                     self.actions.move_to_element(element).click().perform()
                 
-                print(f"✓ Click successful on attempt {attempt}")
+                logger.debug("Click successful on attempt %d", attempt, extra={'sample': 'click_attempt'})
                 return
                 
             except Exception as e:
                 if attempt == 3:
                     raise RuntimeError(f"All click attempts failed: {str(e)}")
-                time.sleep(0.3)
+                self.pause(0.3)
 
     def scroll_to_element(self, element):
         """Scroll to element"""
@@ -139,15 +239,15 @@ class BaseClass:
                 "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", 
                 element
             )
-            time.sleep(0.3)
+            self.pause(0.3)
         except Exception:
-            print("Could not scroll to element")
+            logger.debug("Could not scroll to element", extra={'sample': 'scroll_failed'})
 
     def highlight_element(self, element):
         """Highlight element for debugging"""
         try:
             self.driver.execute_script("arguments[0].style.border='3px solid red';", element)
-            time.sleep(0.3)
+            self.pause(0.3)
             self.driver.execute_script("arguments[0].style.border='';", element)
         except Exception:
             pass  # Ignore highlighting errors
@@ -156,19 +256,19 @@ class BaseClass:
         """Enhanced text input for SPAs"""
         try:
             self.clear_input_field(element)
-            time.sleep(0.2)
+            self.pause(0.2)
             
             # Type with realistic speed
             for char in text:
                 element.send_keys(char)
-                time.sleep(0.05)
+                self.pause(0.05)
             
             # Trigger change events
             self.driver.execute_script("""
                 arguments[0].dispatchEvent(new Event('input', {bubbles: true}));
                 arguments[0].dispatchEvent(new Event('change', {bubbles: true}));
             """, element)
-            time.sleep(0.3)
+            self.pause(0.3)
             
         except Exception:
             # Fallback: Direct JavaScript input
@@ -186,7 +286,7 @@ class BaseClass:
             element.send_keys(Keys.DELETE)
             self.driver.execute_script("arguments[0].value = '';", element)
         except Exception:
-            print("Could not clear input field")
+            logger.debug("Could not clear input field")
 
     def get_cell_value_as_string(self, cell):
         """Get cell value as string (handles different cell types)"""
@@ -207,32 +307,51 @@ class BaseClass:
             return str(cell_value)
 
     def print_test_step_info(self, tc_id, step_no, description, action_type, values, element_name):
-        """Print test step information"""
-        print("\n" + "=" * 60)
-        print(f"🔄 Test Case: {tc_id} | Step: {step_no}")
-        print(f"📋 {description}")
-        print(f"⚡ Action: {action_type} | Element: {element_name}")
+        """Log test step information"""
+        extra = {'test_case_id': tc_id, 'step': step_no, 'action_type': action_type, 'element': element_name}
         if values and values.upper() != "N/A":
-            print(f"💾 Data: {values}")
-        print("=" * 60)
+            extra['data'] = values
+        logger.info("%s", description, extra=extra)
 
     def close_browser(self):
         """Close browser"""
         try:
-            if self.driver:
+            if self.browser_context:
+                SharedBrowserHost.instance().close_context(self.browser_context)
+                logger.info("Browser context closed successfully")
+            elif self.driver:
                 self.driver.quit()
-                print("✓ Browser closed successfully")
+                logger.info("Browser closed successfully")
         except Exception as e:
-            print(f"✗ Error closing browser: {str(e)}")
+            logger.warning("Error closing browser: %s", e)
+        finally:
+            self.browser_context = None
+            ResourceGovernor.instance().unregister(id(self))
+
+    def get_resource_usage(self):
+        """Current CPU/RSS of this session's browser process tree, if tracked"""
+        return ResourceGovernor.instance().sample(id(self))
+
+    def should_recycle_browser(self):
+        """True if this session's browser has grown past the governor's limits"""
+        return ResourceGovernor.instance().should_recycle(id(self))
+
+    def is_session_alive(self):
+        """Check that the WebDriver session still responds"""
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
 
     def navigate_to_url(self, url):
         """Navigate to specified URL"""
         try:
             self.driver.get(url)
             self.wait_for_spa_ready()
-            print(f"✓ Navigated to: {url}")
+            logger.info("Navigated to %s", url)
         except Exception as e:
-            print(f"✗ Error navigating to URL: {str(e)}")
+            logger.error("Error navigating to %s: %s", url, e)
             raise
 
     def get_current_url(self):
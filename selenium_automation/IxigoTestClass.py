@@ -11,24 +11,309 @@ from selenium.common.exceptions import (
     TimeoutException, 
     ElementClickInterceptedException
 )
-import time
+import logging
 from datetime import datetime, timedelta
 import re
+from date_resolver import resolve_date, quick_date_labels
+
+logger = logging.getLogger(__name__)
+
+# Picks a date in one async call: clicks a visible day cell or quick-date chip,
+# otherwise opens the calendar from the date field and pages months in the
+# browser, waiting for each re-render with a MutationObserver instead of
+# polling from Python.
+# Arguments: year, month (1-12), day, quick chip labels, date field or null, max month steps
+SELECT_DATE_SCRIPT = """
+const [year, month, day, quickLabels, field, maxSteps, done] = arguments;
+const MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+                'August', 'September', 'October', 'November', 'December'];
+const pad = n => String(n).padStart(2, '0');
+const iso = `${year}-${pad(month)}-${pad(day)}`;
+const targetKey = year * 12 + month - 1;
+const labels = [
+    `${day} ${MONTHS[month - 1]} ${year}`,
+    `${MONTHS[month - 1]} ${day}, ${year}`,
+    `${MONTHS[month - 1]} ${day} ${year}`,
+    new Date(year, month - 1, day).toDateString()
+];
+const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+
+const findCell = () => {
+    const selectors = [`[data-date="${iso}"]`, `[data-date="${pad(day)}${pad(month)}${year}"]`,
+                       `[data-testid*="${iso}"]`, `[data-day="${iso}"]`];
+    for (const selector of selectors) {
+        for (const el of document.querySelectorAll(selector)) if (visible(el)) return el;
+    }
+    for (const el of document.querySelectorAll('[aria-label]')) {
+        const label = el.getAttribute('aria-label');
+        if (labels.some(text => label.includes(text)) && visible(el)) return el;
+    }
+    return null;
+};
+
+const findChip = () => {
+    const wanted = quickLabels.map(label => label.toLowerCase());
+    if (!wanted.length) return null;
+    for (const el of document.querySelectorAll('button, [role="button"], label, span, p, div')) {
+        if (el.children.length > 2 || !visible(el)) continue;
+        if (wanted.includes(el.textContent.trim().toLowerCase())) return el;
+    }
+    return null;
+};
+
+const shownMonths = () => {
+    const pattern = new RegExp(`(${MONTHS.join('|')})\\\\s+(\\\\d{4})`);
+    const keys = [];
+    for (const el of document.querySelectorAll('[class*="calendar" i] *, [class*="picker" i] *, [role="dialog"] *')) {
+        if (el.children.length) continue;
+        const match = pattern.exec(el.textContent);
+        if (match && visible(el)) keys.push(Number(match[2]) * 12 + MONTHS.indexOf(match[1]));
+    }
+    return keys;
+};
+
+const navButton = forward => {
+    const words = forward ? ['next'] : ['prev', 'previous', 'back'];
+    for (const el of document.querySelectorAll('button, [role="button"], [class*="nav" i], [class*="arrow" i]')) {
+        const hint = [el.getAttribute('aria-label'), el.getAttribute('data-testid'), el.getAttribute('title'),
+                      typeof el.className === 'string' ? el.className : ''].join(' ').toLowerCase();
+        if (visible(el) && words.some(word => hint.includes(word))) return el;
+    }
+    return null;
+};
+
+const rendered = () => new Promise(resolve => {
+    const observer = new MutationObserver(() => {
+        observer.disconnect();
+        requestAnimationFrame(() => resolve(true));
+    });
+    observer.observe(document.body, {childList: true, subtree: true, attributes: true});
+    setTimeout(() => { observer.disconnect(); resolve(false); }, 1500);
+});
+
+const pick = (el, via, steps) => {
+    const disabled = el.getAttribute('aria-disabled') === 'true' || el.disabled ||
+                     /disabled/i.test(typeof el.className === 'string' ? el.className : '');
+    if (disabled) return done({ok: false, reason: 'date is disabled', steps: steps});
+    el.scrollIntoView({block: 'center'});
+    el.click();
+    done({ok: true, via: via, steps: steps});
+};
+
+(async () => {
+    let cell = findCell();
+    if (cell) return pick(cell, 'calendar', 0);
+    const chip = findChip();
+    if (chip) return pick(chip, 'quick', 0);
+
+    if (field && !navButton(true)) {
+        field.click();
+        await rendered();
+    }
+    for (let steps = 0; steps <= maxSteps; steps++) {
+        cell = findCell();
+        if (cell) return pick(cell, 'calendar', steps);
+        const months = shownMonths();
+        const forward = !months.length || targetKey > Math.max(...months);
+        const button = navButton(forward);
+        if (!button) return done({ok: false, reason: 'calendar navigation not found', steps: steps});
+        button.click();
+        await rendered();
+    }
+    done({ok: false, reason: `date not shown within ${maxSteps} months`, steps: maxSteps});
+})().catch(e => done({ok: false, reason: String(e), steps: 0}));
+"""
+
+# ixigo offers bookings up to a year ahead
+MAX_CALENDAR_MONTHS = 13
+
+# Shared lookups for the traveller/room popup. Rows are found from their
+# label ("Adults", "Children", ...) and may use +/- steppers or number chips.
+POPUP_HELPERS = """
+const ROW_LABELS = {room: ['rooms', 'room'], adult: ['adults', 'adult'],
+                    children: ['children', 'child'], infant: ['infants', 'infant']};
+const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+const text = el => el.textContent.trim().toLowerCase();
+const clickables = root => [...root.querySelectorAll('button, [role="button"], li, span, div')]
+    .filter(el => visible(el) && el.children.length === 0);
+
+const findRow = type => {
+    for (const el of document.querySelectorAll('p, span, div, label, h4, h5')) {
+        if (el.children.length > 1 || !visible(el)) continue;
+        if (!ROW_LABELS[type].some(label => text(el).startsWith(label))) continue;
+        for (let row = el.parentElement; row && row !== document.body; row = row.parentElement) {
+            if (row.querySelectorAll('button, [role="button"]').length >= 2) return row;
+        }
+    }
+    return null;
+};
+
+const stepper = (row, increase) => {
+    const words = increase ? ['increase', 'increment', 'add', 'plus'] : ['decrease', 'decrement', 'remove', 'minus'];
+    const symbols = increase ? ['+'] : ['-', '−'];
+    for (const el of row.querySelectorAll('button, [role="button"]')) {
+        const hint = [el.getAttribute('aria-label'), el.getAttribute('data-testid'),
+                      typeof el.className === 'string' ? el.className : ''].join(' ').toLowerCase();
+        if (visible(el) && (symbols.includes(el.textContent.trim()) || words.some(word => hint.includes(word)))) return el;
+    }
+    return null;
+};
+
+const chips = row => clickables(row).filter(el => /^\\d+\\+?$/.test(el.textContent.trim()));
+
+const isSelected = el => {
+    for (let node = el; node && node !== document.body; node = node.parentElement) {
+        if (node.getAttribute('aria-pressed') === 'true' || node.getAttribute('aria-checked') === 'true' ||
+            node.getAttribute('aria-selected') === 'true' ||
+            /selected|active|checked/i.test(typeof node.className === 'string' ? node.className : '')) return true;
+        if (node.matches('button, [role="button"], li')) break;
+    }
+    return false;
+};
+
+const readCount = row => {
+    const numbered = chips(row);
+    if (numbered.length >= 3) {
+        const selected = numbered.find(isSelected);
+        return selected ? parseInt(selected.textContent, 10) : null;
+    }
+    const value = [...row.querySelectorAll('*')].find(el =>
+        el.children.length === 0 && !el.closest('button') && visible(el) && /^\\d+$/.test(el.textContent.trim()));
+    return value ? parseInt(value.textContent, 10) : null;
+};
+
+const ageSelects = () => [...document.querySelectorAll('select')].filter(el =>
+    visible(el) && /age/i.test([el.name, el.id, el.getAttribute('aria-label'),
+                                el.closest('div') ? el.closest('div').textContent : ''].join(' ')));
+
+const readClass = wanted => {
+    for (const el of clickables(document)) {
+        if (text(el) === wanted.toLowerCase()) return isSelected(el) ? el.textContent.trim() : null;
+    }
+    return null;
+};
+
+const rendered = () => new Promise(resolve => {
+    const observer = new MutationObserver(() => {
+        observer.disconnect();
+        requestAnimationFrame(() => resolve(true));
+    });
+    observer.observe(document.body, {childList: true, subtree: true, attributes: true, characterData: true});
+    setTimeout(() => { observer.disconnect(); resolve(false); }, 1000);
+});
+"""
+
+# Applies all pending counts, child ages and travel class in one async call.
+# Each click waits for React to re-render before the next one.
+APPLY_POPUP_SCRIPT = POPUP_HELPERS + """
+const [targets, done] = arguments;
+const errors = [];
+
+const setCount = async (type, wanted) => {
+    const row = findRow(type);
+    if (!row) return errors.push(`${type} row not found`);
+    const chip = chips(row).find(el => parseInt(el.textContent, 10) === wanted);
+    if (chip && chips(row).length >= 3) {
+        chip.click();
+        return rendered();
+    }
+    for (let guard = 0; guard < 20; guard++) {
+        const current = readCount(row);
+        if (current === null) return errors.push(`${type} count not readable`);
+        if (current === wanted) return;
+        const button = stepper(row, wanted > current);
+        if (!button || button.disabled || button.getAttribute('aria-disabled') === 'true') {
+            return errors.push(`cannot change ${type} from ${current} to ${wanted}`);
+        }
+        button.click();
+        await rendered();
+    }
+    errors.push(`${type} count did not reach ${wanted}`);
+};
+
+const setAge = (select, age) => {
+    const option = [...select.options].find(opt =>
+        parseInt(opt.value, 10) === age || parseInt(opt.textContent, 10) === age);
+    if (!option) return false;
+    // React listens for the native value setter followed by a change event
+    Object.getOwnPropertyDescriptor(HTMLSelectElement.prototype, 'value').set.call(select, option.value);
+    select.dispatchEvent(new Event('change', {bubbles: true}));
+    return true;
+};
+
+(async () => {
+    for (const type of ['room', 'adult', 'children', 'infant']) {
+        if (targets.counts[type] != null) await setCount(type, targets.counts[type]);
+    }
+
+    const ages = targets.child_ages || [];
+    if (ages.some(age => age != null)) {
+        for (let tries = 0; ageSelects().length < ages.length && tries < 10; tries++) await rendered();
+        const selects = ageSelects();
+        ages.forEach((age, index) => {
+            if (age == null) return;
+            if (!selects[index]) errors.push(`age dropdown for child ${index + 1} not found`);
+            else if (!setAge(selects[index], age)) errors.push(`age ${age} not offered for child ${index + 1}`);
+        });
+    }
+
+    if (targets.travel_class) {
+        const option = clickables(document).find(el => text(el) === targets.travel_class.toLowerCase());
+        if (option) {
+            option.click();
+            await rendered();
+        } else {
+            errors.push(`travel class ${targets.travel_class} not found`);
+        }
+    }
+    done({ok: errors.length === 0, errors: errors});
+})().catch(e => done({ok: false, errors: [String(e)]}));
+"""
+
+# Reads back the popup state in one call for verification
+READ_POPUP_SCRIPT = POPUP_HELPERS + """
+const [travelClass] = arguments;
+const counts = {};
+for (const type of Object.keys(ROW_LABELS)) {
+    const row = findRow(type);
+    counts[type] = row ? readCount(row) : null;
+}
+return {
+    counts: counts,
+    child_ages: ageSelects().map(select => parseInt(select.value, 10)),
+    travel_class: travelClass ? readClass(travelClass) : null
+};
+"""
+
+# Steps that only record popup targets; the last one of a run of them applies them
+POPUP_ACTION_TYPES = {"SELECT_COUNT", "CLICK_AND_SELECT_AGE"}
 
 
 class IxigoTestClass(BaseClass):
     def __init__(self):
         super().__init__()
+        # Traveller popup targets recorded by count/age/class steps, applied in one batch
+        self.popup_targets = {}
 
-    def execute_action(self, action_type, test_data, xpath, element_name):
-        """Execute specific action based on action type"""
+    def execute_action(self, action_type, test_data, xpath, element_name, apply_popup=False):
+        """
+        Execute specific action based on action type. With apply_popup the
+        recorded traveller popup targets are applied as part of this action,
+        so a popup failure is reported against the step that closes the popup.
+        """
         try:
             action_type = action_type.upper()
 
             if action_type == "OPEN_BROWSER":
-                self.launch_browser()
-                self.driver.get(test_data)
-                self.wait_for_spa_ready()
+                # Reused sessions just navigate back to the start page
+                if self.driver is None:
+                    self.launch_browser()
+                # A browser pre-warmed by the run pipeline is already there
+                if self.prewarmed_url == test_data:
+                    self.prewarmed_url = None
+                else:
+                    self.driver.get(test_data)
+                    self.wait_for_spa_ready()
 
             elif action_type == "CLICK_AND_SELECT":
                 if element_name.upper() in ["FROM", "TO", "DESTINATION"]:
@@ -36,7 +321,7 @@ class IxigoTestClass(BaseClass):
                 else:
                     element = self.find_element_with_advanced_wait(xpath)
                     self.perform_robust_click(element)
-                    time.sleep(0.3)
+                    self.pause(0.3)
 
             elif action_type == "CLICK_AND_SELECT_DATE":
                 self.handle_date_selection_fast(test_data, xpath, element_name)
@@ -44,12 +329,12 @@ class IxigoTestClass(BaseClass):
             elif action_type == "CLICK_QUICK_DATE":
                 if (test_data.upper() == "TODAY" or 
                     (test_data.upper() == "TOMORROW" and "bus" in element_name.lower())):
-                    self.handle_bus_quick_date_selection(test_data, element_name)
+                    self.handle_bus_quick_date_selection(test_data, element_name, xpath)
                 else:
-                    self.handle_quick_date_selection(test_data, element_name)
+                    self.handle_quick_date_selection(test_data, element_name, xpath)
 
             elif action_type == "CLICK_BUS_QUICK_DATE":
-                self.handle_bus_quick_date_selection(test_data, element_name)
+                self.handle_bus_quick_date_selection(test_data, element_name, xpath)
 
             elif action_type == "CLICK":
                 if element_name.upper() == "TRAVELCLASS":
@@ -57,17 +342,17 @@ class IxigoTestClass(BaseClass):
                 elif element_name.upper() == "DONEBUTTON":
                     self.close_travellers_popup_fast(xpath, element_name)
                 elif test_data.upper() == "TODAY":
-                    self.handle_today_selection(element_name)
+                    self.handle_today_selection(element_name, xpath)
                 elif test_data.upper() == "TOMORROW" and "bus" in element_name.lower():
-                    self.handle_tomorrow_selection_bus(element_name)
+                    self.handle_tomorrow_selection_bus(element_name, xpath)
                 elif test_data.upper() == "TOMORROW":
-                    self.handle_tomorrow_selection(element_name)
+                    self.handle_tomorrow_selection(element_name, xpath)
                 elif "day after" in test_data.lower() or test_data.upper() == "DAY-AFTER-TOMORROW":
-                    self.handle_day_after_tomorrow_selection(element_name)
+                    self.handle_day_after_tomorrow_selection(element_name, xpath)
                 else:
                     click_element = self.find_element_with_advanced_wait(xpath)
                     self.perform_robust_click(click_element)
-                    time.sleep(0.3)
+                    self.pause(0.3)
 
             elif action_type == "SELECT_COUNT":
                 if element_name.upper() == "ROOMSCOUNT":
@@ -99,24 +384,27 @@ class IxigoTestClass(BaseClass):
                 self.handle_checkbox_action(test_data, xpath, element_name)
 
             else:
-                print(f"⚠️ Unknown action type: {action_type}")
+                logger.warning("Unknown action type: %s", action_type)
+
+            if apply_popup and self.popup_targets:
+                self.apply_traveller_popup()
 
         except Exception as e:
-            print(f"💥 Error executing action '{action_type}': {str(e)}")
+            logger.error("Error executing action '%s': %s", action_type, e)
             raise
 
     # Keep all your existing methods from the original class
     def handle_city_selection_fast(self, city_name, xpath, element_name):
         """Fast city selection with minimal waits"""
         try:
-            print(f"🏙️ Selecting city: {city_name} for {element_name}")
+            logger.debug("Selecting city %s for %s", city_name, element_name)
             
             city_input = self.find_element_with_advanced_wait(xpath)
             self.perform_robust_click(city_input)
-            time.sleep(0.3)
+            self.pause(0.3)
             
             self.perform_robust_text_input(city_input, city_name)
-            time.sleep(0.8)
+            self.pause(0.8)
             
             auto_complete_selectors = [
                 f"//*[contains(text(),'{city_name}')][1]",
@@ -131,7 +419,7 @@ class IxigoTestClass(BaseClass):
                         if suggestion.is_displayed() and suggestion.is_enabled():
                             self.perform_robust_click(suggestion)
                             suggestion_clicked = True
-                            print(f"✅ City suggestion clicked: {city_name}")
+                            logger.debug("City suggestion clicked: %s", city_name)
                             break
                     if suggestion_clicked:
                         break
@@ -140,97 +428,175 @@ class IxigoTestClass(BaseClass):
             
             if not suggestion_clicked:
                 city_input.send_keys(Keys.ARROW_DOWN, Keys.ENTER)
-                print("✅ Used keyboard navigation for city selection")
+                logger.debug("Used keyboard navigation for city selection")
             
-            time.sleep(0.3)
+            self.pause(0.3)
 
         except Exception as e:
-            print(f"❌ Failed to select city: {city_name} - {str(e)}")
+            logger.error("Failed to select city %s: %s", city_name, e)
             raise
 
-    # Add placeholder methods for missing functionality
+    def select_date(self, date_value, xpath=None, element_name='', quick=False):
+        """
+        Resolve a test data date once and pick it in a single in-browser call,
+        however many months ahead it is. With `quick`, a matching Today /
+        Tomorrow / Day After chip is preferred to the calendar.
+        """
+        target = resolve_date(date_value)
+        labels = quick_date_labels(target) if quick else []
+        field = self.find_element_with_advanced_wait(xpath) if xpath and xpath.strip() else None
+        
+        outcome = self.driver.execute_async_script(
+            SELECT_DATE_SCRIPT, target.year, target.month, target.day, labels, field, MAX_CALENDAR_MONTHS
+        )
+        if not outcome or not outcome.get('ok'):
+            reason = outcome.get('reason') if outcome else 'no response from page'
+            raise Exception(f"Could not select {target.isoformat()} for {element_name}: {reason}")
+        
+        logger.debug("Selected %s for %s via %s after %d month step(s)",
+                     target.isoformat(), element_name, outcome['via'], outcome['steps'])
+        self.pause(0.3)
+        return target
+
     def handle_date_selection_fast(self, date_string, xpath, element_name):
         """Handle fast date selection for calendar inputs"""
-        print(f"📅 Selecting date: {date_string} for {element_name}")
-        # Your existing date selection logic here
-        pass
+        if not date_string or date_string.upper() == "N/A":
+            # e.g. no return date on a one-way search
+            logger.debug("No date given for %s, skipping", element_name)
+            return
+        logger.debug("Selecting date %s for %s", date_string, element_name)
+        self.select_date(date_string, xpath, element_name)
 
-    def handle_quick_date_selection(self, quick_date_option, element_name):
+    def handle_quick_date_selection(self, quick_date_option, element_name, xpath=None):
         """Handle quick date selection"""
-        print(f"🚀 Quick date selection: {quick_date_option} for {element_name}")
-        # Your existing quick date logic here
-        pass
+        logger.debug("Quick date selection %s for %s", quick_date_option, element_name)
+        self.select_date(quick_date_option, xpath, element_name, quick=True)
 
-    def handle_bus_quick_date_selection(self, quick_date_option, element_name):
+    def handle_bus_quick_date_selection(self, quick_date_option, element_name, xpath=None):
         """Handle bus quick date selection"""
-        print(f"🚌 Bus quick date selection: {quick_date_option} for {element_name}")
-        # Your existing bus date logic here
-        pass
+        logger.debug("Bus quick date selection %s for %s", quick_date_option, element_name)
+        self.select_date(quick_date_option, xpath, element_name, quick=True)
 
-    def handle_today_selection(self, element_name):
+    def handle_today_selection(self, element_name, xpath=None):
         """Handle today selection"""
-        print(f"📅 Selecting Today for {element_name}")
-        # Your existing today selection logic here
-        pass
+        logger.debug("Selecting Today for %s", element_name)
+        self.select_date("Today", xpath, element_name, quick=True)
 
-    def handle_tomorrow_selection(self, element_name):
+    def handle_tomorrow_selection(self, element_name, xpath=None):
         """Handle tomorrow selection"""
-        print(f"📅 Selecting Tomorrow for {element_name}")
-        # Your existing tomorrow selection logic here
-        pass
+        logger.debug("Selecting Tomorrow for %s", element_name)
+        self.select_date("Tomorrow", xpath, element_name, quick=True)
 
-    def handle_tomorrow_selection_bus(self, element_name):
+    def handle_tomorrow_selection_bus(self, element_name, xpath=None):
         """Handle tomorrow selection for bus"""
-        print(f"🚌 Tomorrow selection for bus: {element_name}")
-        # Your existing bus tomorrow logic here
-        pass
+        logger.debug("Tomorrow selection for bus: %s", element_name)
+        self.select_date("Tomorrow", xpath, element_name, quick=True)
 
-    def handle_day_after_tomorrow_selection(self, element_name):
+    def handle_day_after_tomorrow_selection(self, element_name, xpath=None):
         """Handle day after tomorrow selection"""
-        print(f"📅 Selecting Day After Tomorrow for {element_name}")
-        # Your existing day after tomorrow logic here
-        pass
+        logger.debug("Selecting Day After Tomorrow for %s", element_name)
+        self.select_date("Day-After-Tomorrow", xpath, element_name, quick=True)
+
+    def is_popup_action(self, action_type, element_name):
+        """Steps that only record a traveller popup target"""
+        return (action_type in POPUP_ACTION_TYPES
+                or (action_type == "CLICK" and element_name.upper() in ["TRAVELCLASS", "DONEBUTTON"]))
+
+    def apply_traveller_popup(self):
+        """
+        Apply every recorded count, child age and travel class in one async
+        call, then verify the popup with a single read. The popup must be open.
+        The targets are kept until verification passes, so a retry applies
+        them again.
+        """
+        targets = self.popup_targets
+        counts = targets.get('counts', {})
+        child_ages = targets.get('child_ages', {})
+        payload = {
+            'counts': counts,
+            'child_ages': [child_ages.get(index) for index in range(max(child_ages, default=-1) + 1)],
+            'travel_class': targets.get('travel_class'),
+        }
+        logger.debug("Applying traveller popup targets", extra={'targets': payload})
+        
+        outcome = self.driver.execute_async_script(APPLY_POPUP_SCRIPT, payload)
+        if not outcome or not outcome.get('ok'):
+            errors = outcome.get('errors') if outcome else ['no response from page']
+            raise Exception(f"Could not fill traveller popup: {'; '.join(errors)}")
+        
+        state = self.driver.execute_script(READ_POPUP_SCRIPT, payload['travel_class'])
+        mismatches = [
+            f"{count_type} is {state['counts'].get(count_type)}, expected {wanted}"
+            for count_type, wanted in counts.items() if state['counts'].get(count_type) != wanted
+        ]
+        mismatches += [
+            f"child {index + 1} age is {state['child_ages'][index] if index < len(state['child_ages']) else None}, "
+            f"expected {age}"
+            for index, age in child_ages.items()
+            if index >= len(state['child_ages']) or state['child_ages'][index] != age
+        ]
+        if payload['travel_class'] and state['travel_class'] is None:
+            # Selection styling varies, so an unreadable class is only logged
+            logger.debug("Could not confirm travel class %s", payload['travel_class'])
+        if mismatches:
+            raise Exception(f"Traveller popup verification failed: {'; '.join(mismatches)}")
+        
+        self.popup_targets = {}
+        logger.debug("Traveller popup filled", extra={'popup_state': state})
 
     def handle_travel_class_selection_fast(self, test_data, xpath, element_name):
         """Handle travel class selection"""
-        print(f"✈️ Selecting travel class: {test_data}")
-        # Your existing travel class logic here
-        pass
+        logger.debug("Selecting travel class %s", test_data)
+        self.popup_targets['travel_class'] = test_data
 
     def close_travellers_popup_fast(self, xpath, element_name):
         """Close travellers popup"""
-        print(f"🔄 Closing travellers popup")
-        # Your existing popup close logic here
-        pass
+        logger.debug("Closing travellers popup")
+        if self.popup_targets:
+            self.apply_traveller_popup()
+        done_button = self.find_element_with_advanced_wait(xpath)
+        self.perform_robust_click(done_button)
+        self.pause(0.3)
 
     def handle_count_selection_fast(self, test_data, xpath, element_name):
         """Handle count selection"""
-        print(f"🔢 Setting count: {test_data} for {element_name}")
-        # Your existing count selection logic here
-        pass
+        logger.debug("Setting count %s for %s", test_data, element_name)
+        name = element_name.lower()
+        if 'infant' in name:
+            count_type = 'infant'
+        elif 'child' in name:
+            count_type = 'children'
+        elif 'room' in name:
+            count_type = 'room'
+        elif 'adult' in name or 'passenger' in name or 'guest' in name:
+            count_type = 'adult'
+        else:
+            raise Exception(f"Unknown count field: {element_name}")
+        self.set_count_by_increment(count_type, int(test_data))
 
     def set_count_by_increment(self, count_type, target_count):
         """Set count by increment"""
-        print(f"🔢 Setting {count_type} count to {target_count}")
-        # Your existing increment logic here
-        pass
+        logger.debug("Setting %s count to %s", count_type, target_count)
+        self.popup_targets.setdefault('counts', {})[count_type] = target_count
 
     def wait_for_child_age_dropdowns(self, children_count):
         """Wait for child age dropdowns"""
-        print(f"⏳ Waiting for {children_count} child age dropdowns")
-        # Your existing wait logic here
-        pass
+        logger.debug("Waiting for %d child age dropdowns", children_count)
+        # The batched fill waits in the browser for the dropdowns before setting ages;
+        # ages recorded for children beyond the new count no longer apply
+        child_ages = self.popup_targets.get('child_ages', {})
+        for index in [index for index in child_ages if index >= children_count]:
+            del child_ages[index]
 
     def select_child_age(self, child_index, age):
         """Select child age"""
-        print(f"👶 Selecting age {age} for child {child_index + 1}")
-        # Your existing age selection logic here
-        pass
+        logger.debug("Selecting age %s for child %d", age, child_index + 1)
+        self.popup_targets.setdefault('child_ages', {})[child_index] = age
 
     def handle_checkbox_action(self, test_data, xpath, element_name):
         """Handle checkbox actions"""
         try:
-            print(f"🔲 Handling checkbox: {element_name}")
+            logger.debug("Handling checkbox %s", element_name)
             
             should_be_checked = test_data.upper() in ["TRUE", "1", "YES"]
             checkbox = self.find_checkbox_element(xpath, element_name)
@@ -239,19 +605,19 @@ class IxigoTestClass(BaseClass):
                 raise Exception(f"❌ Checkbox element not found: {element_name}")
             
             current_state = checkbox.is_selected()
-            print(f"📋 Current: {current_state} | Target: {should_be_checked}")
+            logger.debug("Checkbox state current=%s target=%s", current_state, should_be_checked)
             
             if current_state != should_be_checked:
                 self.driver.execute_script("arguments[0].click();", checkbox)
-                time.sleep(0.1)
+                self.pause(0.1)
                 
                 action_text = "checked" if should_be_checked else "unchecked"
-                print(f"✅ {element_name} {action_text}")
+                logger.debug("%s %s", element_name, action_text)
             else:
-                print(f"✅ {element_name} already in desired state")
+                logger.debug("%s already in desired state", element_name)
             
         except Exception as e:
-            print(f"❌ Error with checkbox '{element_name}': {str(e)}")
+            logger.error("Error with checkbox '%s': %s", element_name, e)
             raise e
 
     def find_checkbox_element(self, xpath, element_name):
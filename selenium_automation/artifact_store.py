@@ -0,0 +1,141 @@
+import gzip
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+
+import file_writer
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# File suffix and MIME type per artifact kind; PNGs are already compressed
+ARTIFACT_KINDS = {
+    'screenshot': ('.png', 'image/png'),
+    'dom': ('.html.gz', 'text/html'),
+}
+
+_DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+# Artifacts handed to the writers but not on disk yet, by digest, so they can be served meanwhile
+_pending = {}
+_lock = threading.Lock()
+_last_prune = 0.0
+
+
+class ArtifactStore:
+    """
+    Content-addressed store of failure artifacts (screenshots and page
+    sources). The executing thread only hashes the raw bytes and gets a
+    reference back; compression and writing happen on the shared writer pool.
+
+    Identical artifacts are stored once. Files older than
+    ARTIFACT_RETENTION_DAYS, then the least recently referenced ones above
+    ARTIFACT_MAX_MB, are removed by a prune after writes.
+
+    Layout: <ARTIFACT_DIR>/<digest[:2]>/<digest><.png|.html.gz>
+    """
+
+    def __init__(self, root=None):
+        self.config = Config()
+        self.root = root or self.config.ARTIFACT_DIR
+
+    def path_for(self, digest, kind):
+        return os.path.join(self.root, digest[:2], f"{digest}{ARTIFACT_KINDS[kind][0]}")
+
+    def save(self, kind, data, **details):
+        """Queue raw artifact bytes for writing; returns their reference immediately"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        reference = {'digest': digest, 'kind': kind, 'size': len(data), **details}
+
+        with _lock:
+            if (digest, kind) in _pending:
+                return reference
+            _pending[(digest, kind)] = data
+        file_writer.submit(self._write, digest, kind, data)
+        return reference
+
+    def _write(self, digest, kind, data):
+        path = self.path_for(digest, kind)
+        try:
+            if os.path.isfile(path):
+                # Already stored; refresh it so the size limit drops it last
+                os.utime(path)
+                return
+            file_writer.write_file(path, data, compress=(kind == 'dom'))
+        except Exception as e:
+            logger.warning("Could not write artifact %s: %s", path, e)
+        finally:
+            with _lock:
+                _pending.pop((digest, kind), None)
+            self._prune_if_due()
+
+    def load(self, digest):
+        """(raw bytes, MIME type) of an artifact, or None if there is none"""
+        if not _DIGEST_PATTERN.match(digest or ''):
+            return None
+        for kind, (_, mimetype) in ARTIFACT_KINDS.items():
+            with _lock:
+                data = _pending.get((digest, kind))
+            if data is not None:
+                return data, mimetype
+
+            path = self.path_for(digest, kind)
+            if not os.path.isfile(path):
+                continue
+            opener = gzip.open if kind == 'dom' else open
+            with opener(path, 'rb') as artifact_file:
+                return artifact_file.read(), mimetype
+        return None
+
+    def _prune_if_due(self):
+        global _last_prune
+        with _lock:
+            if time.monotonic() - _last_prune < self.config.ARTIFACT_PRUNE_SECONDS:
+                return
+            _last_prune = time.monotonic()
+        try:
+            self.prune()
+        except Exception as e:
+            logger.warning("Could not prune artifacts: %s", e)
+
+    def prune(self):
+        """Apply the retention limits; returns the number of files removed"""
+        if not os.path.isdir(self.root):
+            return 0
+
+        files = []
+        for directory, _, file_names in os.walk(self.root):
+            for file_name in file_names:
+                if file_name.endswith('.tmp'):
+                    continue
+                path = os.path.join(directory, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+
+        expires_before = time.time() - self.config.ARTIFACT_RETENTION_DAYS * 86400
+        max_bytes = self.config.ARTIFACT_MAX_MB * 1024 * 1024
+        total_bytes = sum(size for _, size, _ in files)
+
+        removed = 0
+        for modified, size, path in files:
+            if modified >= expires_before and total_bytes <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_bytes -= size
+            removed += 1
+
+        if removed:
+            logger.info("Pruned %d artifacts", removed, extra={'artifact_bytes': total_bytes})
+        return removed
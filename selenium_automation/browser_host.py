@@ -0,0 +1,182 @@
+import atexit
+import logging
+import threading
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+from config import Config
+from resource_governor import ResourceGovernor
+
+logger = logging.getLogger(__name__)
+
+
+def build_chrome_options():
+    """Chrome options shared by standalone browsers and the shared host"""
+    chrome_options = Options()
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("--remote-allow-origins=*")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    return chrome_options
+
+
+class BrowserContext:
+    """One isolated browser context (own cookies, storage and cache) and the driver attached to its tab"""
+
+    def __init__(self, context_id, target_id, driver):
+        self.context_id = context_id
+        self.target_id = target_id
+        self.driver = driver
+
+
+class SharedBrowserHost:
+    """
+    A single Chrome process per worker process that hands out isolated
+    browser contexts (CDP Target.createBrowserContext) instead of launching a
+    Chrome per test.
+
+    Each context gets its own tab and its own WebDriver session attached to
+    the host through its debugger address, so BaseClass and IxigoTestClass
+    drive it exactly like a standalone browser. At most
+    CONTEXTS_PER_BROWSER contexts are open at once; the host is restarted
+    when it has died or grown past the governor's limits and no context is
+    using it.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                atexit.register(cls._instance.shutdown)
+            return cls._instance
+
+    def __init__(self):
+        self.config = Config()
+        self.driver = None
+        self.debugger_address = None
+        self._driver_path = None
+        self._contexts = {}
+        self._lock = threading.Condition()
+
+    # Host browser
+
+    def _host_alive(self):
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _ensure_host_locked(self):
+        if self.driver is not None:
+            if self._contexts:
+                return
+            governor = ResourceGovernor.instance()
+            if self._host_alive() and not governor.should_recycle(id(self)):
+                return
+            logger.info("Restarting shared browser host")
+            self._stop_host_locked()
+
+        if self._driver_path is None:
+            self._driver_path = ChromeDriverManager().install()
+
+        governor = ResourceGovernor.instance()
+        governor.admit()
+        try:
+            self.driver = webdriver.Chrome(service=Service(self._driver_path), options=build_chrome_options())
+        except Exception:
+            governor.cancel_admission()
+            raise
+        governor.register(id(self), self.driver)
+        self.debugger_address = self.driver.capabilities['goog:chromeOptions']['debuggerAddress']
+        logger.info("Shared browser host started", extra={'debugger_address': self.debugger_address})
+
+    def _stop_host_locked(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning("Error closing shared browser host: %s", e)
+        finally:
+            ResourceGovernor.instance().unregister(id(self))
+            self.driver = None
+
+    # Contexts
+
+    def open_context(self, timeout=None):
+        """Create an isolated context with one blank tab and return it with an attached driver"""
+        timeout = self.config.BROWSER_ADMISSION_TIMEOUT if timeout is None else timeout
+        with self._lock:
+            if not self._lock.wait_for(lambda: len(self._contexts) < self.config.CONTEXTS_PER_BROWSER, timeout):
+                raise RuntimeError(f"All {self.config.CONTEXTS_PER_BROWSER} shared browser contexts are in use")
+            self._ensure_host_locked()
+
+            context_id = self.driver.execute_cdp_cmd(
+                'Target.createBrowserContext', {'disposeOnDetach': False}
+            )['browserContextId']
+            # Reserve the slot before the (slow) attach so concurrent callers see it
+            self._contexts[context_id] = None
+            debugger_address = self.debugger_address
+
+        try:
+            with self._lock:
+                target_id = self.driver.execute_cdp_cmd(
+                    'Target.createTarget', {'url': 'about:blank', 'browserContextId': context_id, 'newWindow': True}
+                )['targetId']
+                self._contexts[context_id] = target_id
+
+            options = Options()
+            options.debugger_address = debugger_address
+            driver = webdriver.Chrome(service=Service(self._driver_path), options=options)
+            # ChromeDriver window handles are CDP target IDs
+            driver.switch_to.window(target_id)
+        except Exception:
+            self._dispose(context_id)
+            raise
+
+        logger.debug("Opened browser context %s", context_id)
+        return BrowserContext(context_id, target_id, driver)
+
+    def close_context(self, context):
+        """Detach the context's driver and dispose of the context with all its tabs"""
+        try:
+            # Sessions attached by debugger address leave the browser running on quit
+            context.driver.quit()
+        except Exception as e:
+            logger.warning("Error detaching from browser context: %s", e)
+        self._dispose(context.context_id)
+
+    def _dispose(self, context_id):
+        with self._lock:
+            try:
+                if self.driver is not None:
+                    self.driver.execute_cdp_cmd('Target.disposeBrowserContext', {'browserContextId': context_id})
+            except Exception as e:
+                logger.warning("Could not dispose browser context %s: %s", context_id, e)
+            finally:
+                self._contexts.pop(context_id, None)
+                self._lock.notify_all()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'running': self.driver is not None,
+                'open_contexts': len(self._contexts),
+                'max_contexts': self.config.CONTEXTS_PER_BROWSER,
+            }
+
+    def shutdown(self):
+        """Close the host browser; open contexts go with it"""
+        with self._lock:
+            if self.driver is not None:
+                self._stop_host_locked()
+            self._contexts.clear()
+            self._lock.notify_all()
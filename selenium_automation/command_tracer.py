@@ -0,0 +1,160 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# BaseClass / IxigoTestClass helpers recorded as spans, by trace category
+TRACED_METHODS = {
+    'browser': ['launch_browser', 'navigate_to_url', 'close_browser'],
+    'wait': ['find_element_with_advanced_wait', 'wait_for_spa_ready', 'find_checkbox_element'],
+    'action': [
+        'execute_action', 'perform_robust_click', 'perform_robust_text_input', 'scroll_to_element',
+        'clear_input_field', 'handle_city_selection_fast', 'handle_date_selection_fast',
+        'handle_quick_date_selection', 'handle_bus_quick_date_selection', 'handle_today_selection',
+        'handle_tomorrow_selection', 'handle_tomorrow_selection_bus', 'handle_day_after_tomorrow_selection',
+        'handle_travel_class_selection_fast', 'close_travellers_popup_fast', 'handle_count_selection_fast',
+        'set_count_by_increment', 'wait_for_child_age_dropdowns', 'select_child_age', 'handle_checkbox_action',
+        'select_date', 'apply_traveller_popup',
+    ],
+}
+
+
+class CommandTracer:
+    """
+    Opt-in recorder of WebDriver commands, helper calls and sleeps for one
+    test run, written as Chrome trace-event JSON (chrome://tracing, Perfetto).
+
+    Every record is a complete ('X') event on the issuing thread, so the
+    viewer nests commands under the helper, action and step that issued them.
+    Nothing is wrapped until attach()/instrument() is called, so runs without
+    a tracer pay no overhead.
+    """
+
+    def __init__(self, test_id):
+        self.test_id = test_id
+        self.events = []
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._thread_names = {}
+        self._patched = []
+
+    def _now_us(self):
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def _record(self, name, category, start_us, args):
+        thread = threading.current_thread()
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round(start_us, 1),
+            'dur': round(self._now_us() - start_us, 1),
+            'pid': self._pid,
+            'tid': thread.ident,
+        }
+        if args:
+            event['args'] = args
+        with self._lock:
+            self._thread_names.setdefault(thread.ident, thread.name)
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name, category, **args):
+        """Record the enclosed block as one trace event"""
+        start_us = self._now_us()
+        try:
+            yield
+        except Exception as e:
+            args['error'] = str(e)[:200]
+            raise
+        finally:
+            self._record(name, category, start_us, args)
+
+    def sleep(self, seconds):
+        with self.span('sleep', 'sleep', seconds=seconds):
+            time.sleep(seconds)
+
+    def attach(self, driver):
+        """Record every command sent through the driver's command executor"""
+        executor = driver.command_executor
+        original = executor.execute
+
+        def traced_execute(command, params):
+            args = {}
+            if params:
+                # Element IDs and scripts are useful; full payloads are not
+                if 'script' in params:
+                    args['script'] = params['script'][:120]
+                if 'value' in params and isinstance(params['value'], str):
+                    args['value'] = params['value'][:120]
+            with self.span(command, 'webdriver', **args):
+                return original(command, params)
+
+        executor.execute = traced_execute
+        self._patched.append((executor, 'execute'))
+
+    def instrument(self, target):
+        """Record the traced helper methods of a BaseClass instance"""
+        for category, names in TRACED_METHODS.items():
+            for name in names:
+                method = getattr(target, name, None)
+                if method is None:
+                    continue
+                setattr(target, name, self._wrap(method, name, category))
+                self._patched.append((target, name))
+
+    def _wrap(self, method, name, category):
+        @functools.wraps(method)
+        def traced(*args, **kwargs):
+            with self.span(name, category):
+                return method(*args, **kwargs)
+        return traced
+
+    def detach(self):
+        """Remove every wrapper installed by attach() and instrument()"""
+        for target, name in reversed(self._patched):
+            try:
+                delattr(target, name)
+            except AttributeError:
+                pass
+        self._patched.clear()
+
+    def to_chrome_trace(self):
+        with self._lock:
+            metadata = [{
+                'name': 'process_name', 'ph': 'M', 'pid': self._pid,
+                'args': {'name': f"test {self.test_id}"}
+            }] + [{
+                'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid,
+                'args': {'name': thread_name}
+            } for tid, thread_name in self._thread_names.items()]
+            events = list(self.events)
+
+        return {
+            'traceEvents': metadata + events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'test_id': self.test_id},
+        }
+
+    def summary(self):
+        """Total time per category, in milliseconds"""
+        totals = {}
+        with self._lock:
+            for event in self.events:
+                totals[event['cat']] = totals.get(event['cat'], 0) + event['dur'] / 1000
+        return {category: round(total, 1) for category, total in totals.items()}
+
+    def write(self, directory):
+        """Write the trace to <directory>/<test_id>.trace.json and return the file name"""
+        os.makedirs(directory, exist_ok=True)
+        file_name = f"{self.test_id}.trace.json"
+        with open(os.path.join(directory, file_name), 'w', encoding='utf-8') as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file, separators=(',', ':'))
+        logger.info("Command trace written to %s", file_name, extra={'trace_ms': self.summary()})
+        return file_name
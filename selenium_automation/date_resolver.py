@@ -0,0 +1,72 @@
+import re
+from datetime import date, datetime, timedelta
+
+# Relative keywords accepted in test data, as days from today
+RELATIVE_DAYS = {
+    'today': 0,
+    'tomorrow': 1,
+    'day-after-tomorrow': 2,
+    'day after tomorrow': 2,
+    'day after': 2,
+    'dayafter': 2,
+}
+
+# Labels of the quick date chips shown next to ixigo's date fields
+QUICK_DATE_LABELS = {
+    0: ['Today'],
+    1: ['Tomorrow'],
+    2: ['Day After', 'Day After Tomorrow'],
+}
+
+_OFFSET_PATTERN = re.compile(r'^(?:today\s*)?\+\s*(\d+)(?:\s*days?)?$|^(\d+)\s*days?(?:\s*from\s*today)?$')
+
+_ABSOLUTE_FORMATS = [
+    '%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%d.%m.%Y',
+    '%d %b %Y', '%d %B %Y', '%b %d %Y', '%B %d %Y', '%a %b %d %Y',
+]
+# Without a year the next occurrence of the date is meant
+_YEARLESS_FORMATS = ['%d %b', '%d %B', '%b %d', '%B %d', '%d/%m', '%d-%m']
+
+
+def resolve_date(value, today=None):
+    """
+    Turn a test data date into an exact date: relative keywords (Today,
+    Tomorrow, Day-After-Tomorrow), offsets ('+3', 'today+3', '10 days') or
+    absolute dates ('2025-01-31', '31/01/2025', '31 Jan 2025', '31 Jan').
+    Raises ValueError for anything else.
+    """
+    today = today or date.today()
+    text = re.sub(r'\s+', ' ', str(value or '').strip().lower().replace(',', ''))
+    if not text:
+        raise ValueError("Date value is empty")
+
+    if text in RELATIVE_DAYS:
+        return today + timedelta(days=RELATIVE_DAYS[text])
+
+    match = _OFFSET_PATTERN.match(text)
+    if match:
+        return today + timedelta(days=int(match.group(1) or match.group(2)))
+
+    for date_format in _ABSOLUTE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+
+    for date_format in _YEARLESS_FORMATS:
+        # The next occurrence, which for 29 Feb can be up to four years away
+        for year in range(today.year, today.year + 5):
+            try:
+                parsed = datetime.strptime(f"{text} {year}", f"{date_format} %Y").date()
+            except ValueError:
+                continue
+            if parsed >= today:
+                return parsed
+
+    raise ValueError(f"Unrecognised date '{value}'")
+
+
+def quick_date_labels(target, today=None):
+    """Quick chip labels that select `target`, if it is one of the chip dates"""
+    today = today or date.today()
+    return QUICK_DATE_LABELS.get((target - today).days, [])
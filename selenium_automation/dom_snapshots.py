@@ -0,0 +1,63 @@
+import gzip
+import logging
+import os
+import re
+
+import file_writer
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_STEP_FILE_PATTERN = re.compile(r'^step_(\d+)\.html\.gz$')
+
+
+def _safe_name(value):
+    return re.sub(r'[^A-Za-z0-9_\-]', '_', str(value))
+
+
+class DomSnapshotStore:
+    """
+    Latest gzip-compressed page source per (mode, test case, step), taken
+    just before the step runs, i.e. the page its locator has to match.
+
+    Layout: <SNAPSHOT_DIR>/<mode>/<test_case_id>/step_<NNN>.html.gz
+    """
+
+    def __init__(self, root=None):
+        self.root = root or Config().SNAPSHOT_DIR
+
+    def path_for(self, mode, test_case_id, step_number):
+        return os.path.join(
+            self.root, _safe_name(mode.lower()), _safe_name(test_case_id), f"step_{step_number:03d}.html.gz"
+        )
+
+    def save(self, mode, test_case_id, step_number, html):
+        """Queue a snapshot for compression and writing; returns immediately"""
+        path = self.path_for(mode, test_case_id, step_number)
+        file_writer.submit(self._write, path, html)
+
+    def _write(self, path, html):
+        try:
+            file_writer.write_file(path, html.encode('utf-8'), compress=True)
+        except Exception as e:
+            logger.warning("Could not write DOM snapshot %s: %s", path, e)
+
+    def load(self, mode, test_case_id, step_number):
+        """Raw HTML bytes of a snapshot, or None if there is none"""
+        path = self.path_for(mode, test_case_id, step_number)
+        if not os.path.isfile(path):
+            return None
+        with gzip.open(path, 'rb') as snapshot_file:
+            return snapshot_file.read()
+
+    def list_steps(self, mode, test_case_id):
+        """Step numbers that have a snapshot for a test case"""
+        directory = os.path.dirname(self.path_for(mode, test_case_id, 0))
+        if not os.path.isdir(directory):
+            return []
+        steps = []
+        for file_name in os.listdir(directory):
+            match = _STEP_FILE_PATTERN.match(file_name)
+            if match:
+                steps.append(int(match.group(1)))
+        return sorted(steps)
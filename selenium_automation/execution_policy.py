@@ -0,0 +1,114 @@
+import re
+
+# continue         - run every step regardless of earlier failures
+# stop_on_failure  - skip everything after the first failed step
+# skip_dependents  - skip only steps whose dependencies failed or were skipped
+EXECUTION_POLICIES = ['continue', 'stop_on_failure', 'skip_dependents']
+
+# Steps that fill the booking form; every later step needs the form they filled
+FORM_ACTION_TYPES = {
+    'CLICK_AND_SELECT', 'CLICK_AND_SELECT_DATE', 'CLICK_QUICK_DATE', 'CLICK_BUS_QUICK_DATE',
+    'SELECT_COUNT', 'CLICK_AND_SELECT_AGE',
+}
+
+
+def parse_retry_limits(value):
+    """Parse 'CLICK:2,OPEN_BROWSER:1' into {'CLICK': 2, 'OPEN_BROWSER': 1}"""
+    limits = {}
+    for pair in str(value or '').split(','):
+        action_type, _, retries = pair.partition(':')
+        if action_type.strip() and retries.strip().isdigit():
+            limits[action_type.strip().upper()] = int(retries)
+    return limits
+
+
+def retry_delay(retry_number, base, cap):
+    """Exponential backoff before the given retry (1-based)"""
+    return min(base * 2 ** (retry_number - 1), cap)
+
+
+def parse_dependencies(value):
+    """Split a depends_on value such as '2, 3, popup' into step orders and group names"""
+    step_orders, groups = set(), set()
+    for token in re.split(r'[,;\s]+', str(value or '').strip()):
+        if not token:
+            continue
+        if token.isdigit():
+            step_orders.add(int(token))
+        else:
+            groups.add(token.lower())
+    return step_orders, groups
+
+
+class StepGate:
+    """
+    Decides, step by step, whether a test step still runs under an execution
+    policy, from the outcomes of the steps before it.
+
+    With skip_dependents a step is skipped when
+      - a step it lists in depends_on (by step_order) did not pass,
+      - any step of a group it lists in depends_on did not pass,
+      - an earlier step of its own step_group did not pass,
+      - the OPEN_BROWSER step that precedes it did not pass (implicit), or
+      - it declares neither depends_on nor step_group and an earlier booking
+        form step (FORM_ACTION_TYPES) did not pass (implicit), since nothing
+        after a broken form, such as the search, can succeed.
+    Other failures, e.g. of a CLICK dismissing an optional banner, leave
+    undeclared steps running.
+    """
+
+    def __init__(self, policy):
+        if policy not in EXECUTION_POLICIES:
+            raise ValueError(f"Unknown execution policy '{policy}', expected one of {EXECUTION_POLICIES}")
+        self.policy = policy
+        self.first_failure = None
+        self.broken_steps = {}
+        self.broken_groups = {}
+        self.browser_step = None
+        self.form_failure = None
+
+    @staticmethod
+    def step_key(step, step_number):
+        return step.get('step_order') if step.get('step_order') is not None else step_number
+
+    def skip_reason(self, step, step_number):
+        """Why the step must be skipped, or None if it should run"""
+        if self.policy == 'continue':
+            return None
+        if self.policy == 'stop_on_failure':
+            if self.first_failure is not None:
+                return f"Skipped: step {self.first_failure} failed"
+            return None
+
+        if self.browser_step is not None and self.browser_step in self.broken_steps:
+            return f"Skipped: browser step {self.browser_step} did not pass"
+
+        step_orders, groups = parse_dependencies(step.get('depends_on'))
+        own_group = (step.get('step_group') or '').strip().lower()
+        if self.form_failure is not None and not (step_orders or groups or own_group):
+            return f"Skipped: form step {self.form_failure} did not pass"
+
+        for step_order in sorted(step_orders):
+            if step_order in self.broken_steps:
+                return f"Skipped: depends on step {step_order}, which {self.broken_steps[step_order]}"
+        for group in sorted(groups | ({own_group} if own_group else set())):
+            if group in self.broken_groups:
+                return f"Skipped: step {self.broken_groups[group]} in group '{group}' did not pass"
+        return None
+
+    def record(self, step, step_number, status):
+        """Register the outcome ('passed', 'failed' or 'skipped') of a step"""
+        key = self.step_key(step, step_number)
+        if step['action_type'].upper() == 'OPEN_BROWSER':
+            self.browser_step = key
+        if status == 'passed':
+            return
+
+        if status == 'failed' and self.first_failure is None:
+            self.first_failure = step_number
+        self.broken_steps[key] = 'failed' if status == 'failed' else 'was skipped'
+        if step['action_type'].upper() in FORM_ACTION_TYPES and self.form_failure is None:
+            self.form_failure = key
+        group = (step.get('step_group') or '').strip().lower()
+        if group:
+            self.broken_groups.setdefault(group, key)
@@ -0,0 +1,28 @@
+import gzip
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+
+# Compression and writing of snapshots and artifacts run off the executing thread
+_writer = ThreadPoolExecutor(max_workers=Config().ARTIFACT_WRITERS, thread_name_prefix='file-writer')
+
+
+def submit(write, *args):
+    """Run a write on the shared writer pool"""
+    return _writer.submit(write, *args)
+
+
+def write_file(path, data, compress=False):
+    """Write bytes to path, gzip-compressed if asked; raises on failure"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    if compress:
+        with gzip.open(temp_path, 'wb', compresslevel=5) as output_file:
+            output_file.write(data)
+    else:
+        with open(temp_path, 'wb') as output_file:
+            output_file.write(data)
+    # Replace atomically so readers never see a half-written file
+    os.replace(temp_path, path)
@@ -0,0 +1,238 @@
+import logging
+import statistics
+import threading
+import time
+
+from config import Config
+
+try:
+    import psutil
+except ImportError:  # Governor degrades to a no-op without psutil
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceGovernor:
+    """
+    Process-wide tracker of the Chrome sessions started by BaseClass.
+
+    Samples CPU and RSS of each browser's chromedriver process tree, admits a
+    new browser only when the host has room for one more, and flags sessions
+    that have grown past the configured limits so callers can recycle them
+    between runs.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self.config = Config()
+        self.enabled = self.config.RESOURCE_GOVERNOR_ENABLED and psutil is not None
+        self._lock = threading.Condition()
+        self._browsers = {}
+        self._pending_launches = 0
+        self._monitor = None
+
+        if self.config.RESOURCE_GOVERNOR_ENABLED and psutil is None:
+            logger.warning("psutil is not installed; browser resource governor disabled")
+
+    # Admission
+
+    def estimated_browser_mb(self):
+        """Expected RSS of one more browser, learned from the running ones"""
+        observed = [stats['peak_rss_mb'] for stats in self._browsers.values() if stats['peak_rss_mb']]
+        if observed:
+            return max(self.config.BROWSER_ESTIMATED_MB, statistics.median(observed))
+        return self.config.BROWSER_ESTIMATED_MB
+
+    def has_capacity(self):
+        """True if the host has enough free memory for another browser"""
+        if not self.enabled:
+            return True
+        with self._lock:
+            return self._has_capacity_locked()
+
+    def _has_capacity_locked(self):
+        available_mb = psutil.virtual_memory().available / (1024 * 1024)
+        # Browsers still starting up have not claimed their memory yet
+        needed_mb = self.estimated_browser_mb() * (self._pending_launches + 1)
+        return available_mb - needed_mb >= self.config.BROWSER_MIN_FREE_MB
+
+    def admit(self, timeout=None):
+        """
+        Block until another browser fits in memory, then reserve a launch.
+        Must be paired with register() or cancel_admission().
+        """
+        if not self.enabled:
+            return
+
+        timeout = self.config.BROWSER_ADMISSION_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while not self._has_capacity_locked():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(
+                        f"Not enough free memory to launch another browser "
+                        f"(need {self.estimated_browser_mb():.0f} MB + {self.config.BROWSER_MIN_FREE_MB} MB reserve)"
+                    )
+                # Memory is freed outside our control, so re-check periodically
+                self._lock.wait(min(remaining, self.config.RESOURCE_SAMPLE_SECONDS))
+            self._pending_launches += 1
+
+    def cancel_admission(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pending_launches = max(0, self._pending_launches - 1)
+            self._lock.notify_all()
+
+    # Session tracking
+
+    def register(self, session_key, driver):
+        """Start tracking the browser launched for an admitted session"""
+        if not self.enabled:
+            return
+        try:
+            root = psutil.Process(driver.service.process.pid)
+        except Exception as e:
+            logger.debug("Cannot track browser process: %s", e)
+            self.cancel_admission()
+            return
+
+        with self._lock:
+            self._pending_launches = max(0, self._pending_launches - 1)
+            self._browsers[session_key] = {
+                'root': root,
+                'processes': {},
+                'started_at': time.time(),
+                'rss_mb': 0.0,
+                'peak_rss_mb': 0.0,
+                'cpu_percent': 0.0,
+                'process_count': 0,
+            }
+            self._ensure_monitor()
+
+    def unregister(self, session_key):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._browsers.pop(session_key, None)
+            self._lock.notify_all()
+
+    def sample(self, session_key):
+        """Refresh and return the CPU/RSS figures of one browser"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            stats = self._browsers.get(session_key)
+            if stats is None:
+                return None
+            self._sample_locked(stats)
+            return self._public_stats(stats)
+
+    def should_recycle(self, session_key):
+        """True if the session has grown past BROWSER_MAX_RSS_MB / BROWSER_MAX_CPU_PERCENT"""
+        stats = self.sample(session_key)
+        if not stats:
+            return False
+
+        if stats['rss_mb'] > self.config.BROWSER_MAX_RSS_MB:
+            logger.info("Browser over RSS limit (%.0f MB), recycling", stats['rss_mb'])
+            return True
+        if self.config.BROWSER_MAX_CPU_PERCENT and stats['cpu_percent'] > self.config.BROWSER_MAX_CPU_PERCENT:
+            logger.info("Browser over CPU limit (%.0f%%), recycling", stats['cpu_percent'])
+            return True
+        return False
+
+    def _sample_locked(self, stats):
+        try:
+            tree = [stats['root']] + stats['root'].children(recursive=True)
+        except psutil.Error:
+            tree = []
+
+        rss = 0
+        cpu = 0.0
+        processes = {}
+        for process in tree:
+            # Reuse Process objects so cpu_percent measures since the last sample
+            process = stats['processes'].get(process.pid, process)
+            try:
+                rss += process.memory_info().rss
+                cpu += process.cpu_percent(interval=None)
+                processes[process.pid] = process
+            except psutil.Error:
+                continue
+
+        stats['processes'] = processes
+        stats['process_count'] = len(processes)
+        stats['rss_mb'] = rss / (1024 * 1024)
+        stats['peak_rss_mb'] = max(stats['peak_rss_mb'], stats['rss_mb'])
+        stats['cpu_percent'] = cpu
+
+    def _public_stats(self, stats):
+        return {
+            'rss_mb': round(stats['rss_mb'], 1),
+            'peak_rss_mb': round(stats['peak_rss_mb'], 1),
+            'cpu_percent': round(stats['cpu_percent'], 1),
+            'process_count': stats['process_count'],
+            'uptime_seconds': round(time.time() - stats['started_at']),
+        }
+
+    def _ensure_monitor(self):
+        if self._monitor is None or not self._monitor.is_alive():
+            self._monitor = threading.Thread(target=self._monitor_loop, name='resource-governor', daemon=True)
+            self._monitor.start()
+
+    def _monitor_loop(self):
+        while True:
+            time.sleep(self.config.RESOURCE_SAMPLE_SECONDS)
+            with self._lock:
+                if not self._browsers:
+                    self._monitor = None
+                    return
+                for stats in self._browsers.values():
+                    self._sample_locked(stats)
+                # Waiting admissions re-check against the fresh figures
+                self._lock.notify_all()
+
+    # Reporting
+
+    def snapshot(self):
+        """Host and per-browser resource figures"""
+        if not self.enabled:
+            return {'enabled': False}
+
+        memory = psutil.virtual_memory()
+        with self._lock:
+            browsers = [
+                {'session': str(session_key), **self._public_stats(stats)}
+                for session_key, stats in self._browsers.items()
+            ]
+            estimated_mb = self.estimated_browser_mb()
+            pending = self._pending_launches
+            has_capacity = self._has_capacity_locked()
+
+        return {
+            'enabled': True,
+            'host': {
+                'cpu_percent': psutil.cpu_percent(interval=None),
+                'memory_total_mb': round(memory.total / (1024 * 1024)),
+                'memory_available_mb': round(memory.available / (1024 * 1024)),
+                'memory_percent': memory.percent,
+            },
+            'browsers': browsers,
+            'browser_count': len(browsers),
+            'pending_launches': pending,
+            'estimated_browser_mb': round(estimated_mb),
+            'min_free_mb': self.config.BROWSER_MIN_FREE_MB,
+            'can_admit': has_capacity,
+        }
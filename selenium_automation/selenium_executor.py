@@ -1,9 +1,16 @@
 
 import sys
 import os
+from contextlib import nullcontext
 from datetime import datetime
 import time
-import json
+import logging
+from urllib.parse import urlsplit
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    TimeoutException
+)
 
 # Add the current directory to Python path to import your classes
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -11,51 +18,302 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Import your existing classes
 from BaseClass import BaseClass
 from IxigoTestClass import IxigoTestClass
+# Imported by the same top-level name as BaseClass so callers share its singleton
+from resource_governor import ResourceGovernor
+from browser_host import SharedBrowserHost
+from command_tracer import CommandTracer
+from dom_snapshots import DomSnapshotStore
+from artifact_store import ArtifactStore
+from execution_policy import EXECUTION_POLICIES, StepGate, parse_retry_limits, retry_delay
+from config import Config
+from logging_config import log_context
+
+logger = logging.getLogger(__name__)
+
+# The singletons and stores are re-exported for app.py
+__all__ = ['SeleniumExecutor', 'ResourceGovernor', 'SharedBrowserHost', 'ArtifactStore', 'EXECUTION_POLICIES']
+
+# Cookie attributes accepted by WebDriver's add_cookie
+CHECKPOINT_COOKIE_FIELDS = {'name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry', 'sameSite'}
+
+# WebDriver failures that can pass on a second try. BaseClass turns a missing
+# element into a RuntimeError, so a TimeoutException here came after the lookup.
+TRANSIENT_STEP_ERRORS = (StaleElementReferenceException, ElementClickInterceptedException, TimeoutException)
+
+def is_transient_step_error(error):
+    """True when the error, or one it was raised from, is worth retrying"""
+    while error is not None:
+        if isinstance(error, TRANSIENT_STEP_ERRORS):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
 
 class SeleniumExecutor:
     def __init__(self):
         self.ixigo_test = None
+        self.config = Config()
+        self.retry_limits = parse_retry_limits(self.config.STEP_RETRIES)
     
-    def execute_test(self, mode, test_data, xpath_data):
+    def execute_test(self, mode, test_data, xpath_data, keep_session=False, test_id=None, checkpoint=None):
         """
-        Execute test using your existing Selenium classes with database data
+        Execute test using your existing Selenium classes with database data.
+        With keep_session the browser is left open for the next run on this executor.
+        With a checkpoint from a failed step, the browser state is restored and
+        the run resumes at that step instead of starting over.
         """
         start_time = datetime.now()
+        test_id = test_id or f"{mode.upper()}_{test_data.get('testCaseId', 'UNKNOWN')}_{int(time.time())}"
+        
+        with log_context(test_id):
+            return self._execute_test(mode, test_data, xpath_data, test_id, start_time, keep_session, checkpoint)
+    
+    def execute_matrix(self, mode, test_data, xpath_data, data_rows):
+        """
+        Run one test case once per data row in a single browser session.
+        Each row's values override the shared test_data; the OPEN_BROWSER step
+        navigates the existing browser instead of relaunching it.
+        """
+        run_stamp = int(time.time())
+        results = []
         
         try:
-            # Initialize your IxigoTestClass
+            for index, row in enumerate(data_rows):
+                row_data = {**test_data, **row}
+                test_id = f"{mode.upper()}_{row_data.get('testCaseId', 'UNKNOWN')}_{run_stamp}_R{index + 1}"
+                
+                # A row that crashed the browser must not take the remaining rows with it
+                if self.ixigo_test and self.ixigo_test.driver and not self.ixigo_test.is_session_alive():
+                    logger.warning("Browser session lost before row %d, relaunching", index + 1)
+                    self.close_session()
+                elif self.ixigo_test and self.ixigo_test.driver and self.ixigo_test.should_recycle_browser():
+                    logger.info("Recycling browser before row %d", index + 1)
+                    self.close_session()
+                
+                result = self.execute_test(mode, row_data, xpath_data, keep_session=True, test_id=test_id)
+                result['row_index'] = index
+                results.append(result)
+        finally:
+            self.close_session()
+        
+        return results
+    
+    def close_session(self):
+        """Close the browser kept open by keep_session runs"""
+        if self.ixigo_test and hasattr(self.ixigo_test, 'driver') and self.ixigo_test.driver:
+            try:
+                self.ixigo_test.close_browser()
+            except Exception:
+                pass
+        self.ixigo_test = None
+    
+    def prepare_session(self, test_data):
+        """
+        Create the IxigoTestClass session if needed and apply the run's browser
+        options. Returns whether page performance is captured for this run.
+        """
+        if self.ixigo_test is None:
             self.ixigo_test = IxigoTestClass()
+            self.ixigo_test.use_shared_browser = test_data.get('sharedBrowser', self.config.SHARED_BROWSER_CONTEXTS)
+        # Nothing recorded by an earlier run on a kept-open session carries over
+        self.ixigo_test.popup_targets = {}
+        
+        capture_perf = test_data.get('perf', self.config.CAPTURE_PAGE_PERF)
+        if capture_perf and not self.ixigo_test.capture_performance:
+            self.ixigo_test.capture_performance = True
+            if self.ixigo_test.driver:
+                self.ixigo_test.enable_performance_capture()
+        return capture_perf
+    
+    def compile_steps(self, xpath_data, test_data):
+        """Resolve every step's test value up front so execution only drives the browser"""
+        return [
+            {**step, 'test_value': self.get_test_value(step['element_name'], test_data, step['action_type'])}
+            for step in xpath_data
+        ]
+    
+    def prewarm(self, test_data, xpath_data):
+        """
+        Launch the browser and open the start page of the first OPEN_BROWSER
+        step ahead of the run; that step then skips its navigation.
+        Returns the URL opened, or None if the test case does not open one.
+        """
+        open_step = next((step for step in xpath_data if step['action_type'].upper() == 'OPEN_BROWSER'), None)
+        if open_step is None:
+            return None
+        
+        url = open_step.get('test_value') or self.get_test_value(
+            open_step['element_name'], test_data, open_step['action_type']
+        )
+        self.prepare_session(test_data)
+        try:
+            if self.ixigo_test.driver is None:
+                self.ixigo_test.launch_browser()
+            self.ixigo_test.navigate_to_url(url)
+        except Exception:
+            self.close_session()
+            raise
+        self.ixigo_test.prewarmed_url = url
+        return url
+    
+    def capture_checkpoint(self, step_index):
+        """
+        Browser state at a failed step, enough to resume the run from it:
+        the page URL, cookies and how many steps had already run
+        """
+        driver = self.ixigo_test.driver
+        if driver is None or not self.ixigo_test.is_session_alive():
+            return None
+        try:
+            return {
+                'step_index': step_index,
+                'completed_steps': step_index,
+                'url': driver.current_url,
+                'cookies': driver.get_cookies(),
+                'captured_at': datetime.now().isoformat()
+            }
+        except Exception as e:
+            logger.debug("Could not capture checkpoint: %s", e)
+            return None
+    
+    def restore_checkpoint(self, checkpoint):
+        """Open a browser on the checkpoint's page with its cookies"""
+        if self.ixigo_test.driver is None:
+            self.ixigo_test.launch_browser()
+        driver = self.ixigo_test.driver
+        
+        # Cookies can only be set for the domain currently loaded
+        url = urlsplit(checkpoint['url'])
+        driver.get(f"{url.scheme}://{url.netloc}/")
+        restored = 0
+        for cookie in checkpoint.get('cookies') or []:
+            cookie = {key: value for key, value in cookie.items() if key in CHECKPOINT_COOKIE_FIELDS}
+            try:
+                driver.add_cookie(cookie)
+                restored += 1
+            except Exception as e:
+                logger.debug("Could not restore cookie %s: %s", cookie.get('name'), e)
+        
+        self.ixigo_test.navigate_to_url(checkpoint['url'])
+        logger.info("Resuming from step %d", checkpoint['step_index'] + 1,
+                    extra={'url': checkpoint['url'], 'cookies_restored': restored})
+    
+    def start_trace(self, test_id):
+        """Attach a CommandTracer to the current session"""
+        tracer = CommandTracer(test_id)
+        self.ixigo_test.tracer = tracer
+        tracer.instrument(self.ixigo_test)
+        if self.ixigo_test.driver:
+            tracer.attach(self.ixigo_test.driver)
+        return tracer
+    
+    def finish_trace(self, tracer):
+        """Detach the tracer and write its Chrome trace file, returning the file name"""
+        tracer.detach()
+        if self.ixigo_test:
+            self.ixigo_test.tracer = None
+        try:
+            return tracer.write(self.config.TRACE_DIR)
+        except Exception as e:
+            logger.warning("Could not write command trace: %s", e)
+            return None
+    
+    def _execute_test(self, mode, test_data, xpath_data, test_id, start_time, keep_session, checkpoint=None):
+        tracer = None
+        try:
+            # Initialize your IxigoTestClass, reusing a kept-open session if there is one
+            capture_perf = self.prepare_session(test_data)
+            
+            policy = test_data.get('executionPolicy', self.config.EXECUTION_POLICY)
+            step_gate = StepGate(policy)
+            
+            if test_data.get('trace', self.config.TRACE_COMMANDS):
+                tracer = self.start_trace(test_id)
+            
+            start_index = 0
+            if checkpoint:
+                self.restore_checkpoint(checkpoint)
+                start_index = checkpoint['step_index']
             
             # Initialize result structure
             test_result = {
-                'test_id': f"{mode.upper()}_{test_data['testCaseId']}_{int(time.time())}",
+                'test_id': test_id,
                 'test_case_id': test_data['testCaseId'],
                 'mode': mode,
                 'status': 'in_progress',
-                'total_steps': len(xpath_data),
+                'total_steps': len(xpath_data) - start_index,
                 'passed_steps': 0,
                 'failed_steps': 0,
                 'execution_time': None,
                 'test_data': test_data,
                 'step_results': [],
-                'screenshots': []
+                'screenshots': [],
+                'skipped_steps': 0,
+                'execution_policy': policy
             }
+            if capture_perf:
+                test_result['page_perf'] = []
+            if checkpoint:
+                test_result['resumed_from'] = {
+                    'result_id': checkpoint.get('result_id'),
+                    'step_number': start_index + 1
+                }
+            
+            snapshot_store = (DomSnapshotStore()
+                              if test_data.get('snapshot', self.config.CAPTURE_DOM_SNAPSHOTS) else None)
+            artifact_store = (ArtifactStore()
+                              if test_data.get('artifacts', self.config.CAPTURE_FAILURE_ARTIFACTS) else None)
+            artifact_every = self.config.ARTIFACT_EVERY_N_STEPS
             
-            print(f"🚀 Starting test execution for {mode} with {len(xpath_data)} steps")
+            logger.info("Starting test execution for %s with %d steps", mode, len(xpath_data))
             
-            # Execute each step from database
-            for i, step in enumerate(xpath_data):
-                step_result = self.execute_database_step(step, test_data, i + 1)
+            # Execute each step from database (steps before a checkpoint already ran)
+            for i, step in enumerate(xpath_data[start_index:], start=start_index):
+                skip_reason = step_gate.skip_reason(step, i + 1)
+                if skip_reason:
+                    # No browser work at all, so a broken run finishes immediately
+                    step_result = self.skipped_step_result(step, test_data, i + 1, skip_reason)
+                    test_result['step_results'].append(step_result)
+                    test_result['skipped_steps'] += 1
+                    step_gate.record(step, i + 1, 'skipped')
+                    continue
+                
+                if snapshot_store:
+                    self.capture_dom_snapshot(snapshot_store, mode, test_data, step, i + 1)
+                
+                step_span = (tracer.span(f"Step {i + 1}: {step['action_type']} {step['element_name']}", 'step')
+                             if tracer else nullcontext())
+                with step_span:
+                    step_result = self.execute_database_step(
+                        step, test_data, i + 1, apply_popup=self.closes_traveller_popup(xpath_data, i)
+                    )
                 test_result['step_results'].append(step_result)
+                step_gate.record(step, i + 1, step_result['status'])
                 
                 if step_result['status'] == 'passed':
                     test_result['passed_steps'] += 1
+                    if capture_perf:
+                        self.capture_step_performance(step_result, test_result['page_perf'])
                 else:
                     test_result['failed_steps'] += 1
+                    if artifact_store:
+                        self.capture_artifacts(artifact_store, step_result, test_result, 'failure')
+                    checkpoint = self.capture_checkpoint(i)
+                    if checkpoint:
+                        # Kept out of the step results: the cookies are live session credentials
+                        test_result.setdefault('checkpoints', {})[i + 1] = checkpoint
+                        step_result['resumable'] = True
+                if (artifact_store and artifact_every and (i + 1) % artifact_every == 0
+                        and 'artifacts' not in step_result):
+                    self.capture_artifacts(artifact_store, step_result, test_result, 'interval')
                 
                 # Add small delay between steps
-                time.sleep(0.5)
-            
+                self.ixigo_test.pause(0.5)
+
+            if self.ixigo_test.popup_targets:
+                # The step that would have applied them was skipped
+                logger.warning("Traveller popup targets were never applied", extra={'targets': self.ixigo_test.popup_targets})
+                self.ixigo_test.popup_targets = {}
+
             # Determine overall test status
             if test_result['failed_steps'] == 0:
                 test_result['status'] = 'passed'
@@ -65,13 +323,19 @@ class SeleniumExecutor:
             end_time = datetime.now()
             test_result['execution_time'] = str(end_time - start_time)
             
-            print(f"✅ Test execution completed - Status: {test_result['status']}")
+            logger.info("Test execution completed", extra={
+                'status': test_result['status'],
+                'passed_steps': test_result['passed_steps'],
+                'failed_steps': test_result['failed_steps'],
+                'skipped_steps': test_result['skipped_steps'],
+                'execution_time': test_result['execution_time'],
+            })
             return test_result
             
         except Exception as e:
-            print(f"❌ Test execution failed: {str(e)}")
+            logger.exception("Test execution failed: %s", e)
             test_result = {
-                'test_id': f"{mode.upper()}_{test_data.get('testCaseId', 'UNKNOWN')}_{int(time.time())}",
+                'test_id': test_id,
                 'test_case_id': test_data.get('testCaseId', 'UNKNOWN'),
                 'mode': mode,
                 'status': 'error',
@@ -86,30 +350,99 @@ class SeleniumExecutor:
             return test_result
             
         finally:
-            # Always clean up
-            if self.ixigo_test and hasattr(self.ixigo_test, 'driver') and self.ixigo_test.driver:
-                try:
-                    self.ixigo_test.close_browser()
-                except Exception:
-                    pass
+            if tracer:
+                test_result['trace_file'] = self.finish_trace(tracer)
+            
+            # Always clean up unless the caller is reusing the session
+            if not keep_session:
+                self.close_session()
+    
+    def capture_dom_snapshot(self, snapshot_store, mode, test_data, step_info, step_number):
+        """Save the page a step's locator will be evaluated against"""
+        if step_info['action_type'].upper() == 'OPEN_BROWSER' or not self.ixigo_test.driver:
+            return
+        try:
+            html = self.ixigo_test.driver.page_source
+        except Exception as e:
+            logger.debug("Could not read page source for snapshot: %s", e)
+            return
+        snapshot_store.save(mode, test_data.get('testCaseId', 'UNKNOWN'), step_number, html)
+    
+    def capture_artifacts(self, artifact_store, step_result, test_result, reason):
+        """
+        Take a screenshot and the page source after a step; only the capture
+        itself runs here, the store writes them in the background
+        """
+        driver = self.ixigo_test.driver
+        if driver is None or not self.ixigo_test.is_session_alive():
+            return
+        details = {'step_number': step_result['step_number'], 'reason': reason}
+        references = []
+        try:
+            references.append(artifact_store.save('screenshot', driver.get_screenshot_as_png(), **details))
+            references.append(artifact_store.save('dom', driver.page_source, url=driver.current_url, **details))
+        except Exception as e:
+            logger.debug("Could not capture artifacts for step %d: %s", step_result['step_number'], e)
+        step_result['artifacts'] = references
+        test_result['screenshots'].extend(ref for ref in references if ref['kind'] == 'screenshot')
     
-    def execute_database_step(self, step_info, test_data, step_number):
+    def capture_step_performance(self, step_result, page_perf):
+        """
+        Record page performance after a navigation: the OPEN_BROWSER step and
+        any step that left the browser on a new URL
+        """
+        metrics = self.ixigo_test.collect_page_performance()
+        if not metrics:
+            return
+        
+        last_url = page_perf[-1]['url'] if page_perf else None
+        if step_result['action_type'].upper() == 'OPEN_BROWSER' or metrics['url'] != last_url:
+            page_perf.append({'step': step_result['step_number'], **metrics})
+    
+    def closes_traveller_popup(self, xpath_data, step_index):
+        """Whether a step is the last of a run of traveller popup steps, which applies their targets"""
+        def is_popup_step(step):
+            return self.ixigo_test.is_popup_action(step['action_type'].upper(), step['element_name'])
+        
+        if not is_popup_step(xpath_data[step_index]):
+            return False
+        return step_index + 1 == len(xpath_data) or not is_popup_step(xpath_data[step_index + 1])
+    
+    def execute_database_step(self, step_info, test_data, step_number, apply_popup=False):
         """
         Execute individual test step using database data with your existing methods
         """
+        step_start = time.perf_counter()
+        attempts = 0
         try:
             element_name = step_info['element_name']
             xpath = step_info['xpath']
             action_type = step_info['action_type']
             expected_result = step_info.get('expected_result', '')
             
-            print(f"🔄 Step {step_number}: {action_type} on {element_name}")
+            logger.info("Step %d: %s on %s", step_number, action_type, element_name)
             
-            # Get the test value based on element name and test data
-            test_value = self.get_test_value(element_name, test_data, action_type)
+            # Get the test value based on element name and test data (pre-resolved by compile_steps)
+            test_value = (step_info['test_value'] if 'test_value' in step_info
+                          else self.get_test_value(element_name, test_data, action_type))
             
-            # Use your existing execute_action method
-            self.ixigo_test.execute_action(action_type, test_value, xpath, element_name)
+            # Use your existing execute_action method, retrying transient WebDriver failures
+            max_attempts = 1 + self.retry_limits.get(action_type.upper(), 0)
+            while True:
+                attempts += 1
+                try:
+                    self.ixigo_test.execute_action(action_type, test_value, xpath, element_name,
+                                                   apply_popup=apply_popup)
+                    break
+                except Exception as e:
+                    # Bad test data and missing elements fail the same way every time
+                    if attempts >= max_attempts or not is_transient_step_error(e):
+                        raise
+                    if self.ixigo_test.driver is not None and not self.ixigo_test.is_session_alive():
+                        raise
+                    delay = retry_delay(attempts, self.config.STEP_RETRY_BACKOFF, self.config.STEP_RETRY_MAX_BACKOFF)
+                    logger.info("Step %d attempt %d failed, retrying in %.1fs: %s", step_number, attempts, delay, e)
+                    self.ixigo_test.pause(delay)
             
             return {
                 'step_number': step_number,
@@ -119,24 +452,47 @@ class SeleniumExecutor:
                 'test_value': test_value,
                 'expected_result': expected_result,
                 'status': 'passed',
-                'message': f'Successfully executed {action_type} on {element_name}'
+                'message': f'Successfully executed {action_type} on {element_name}',
+                'attempts': attempts,
+                'duration': round(time.perf_counter() - step_start, 3)
             }
             
         except Exception as e:
             error_msg = str(e)
-            print(f"❌ Step {step_number} failed: {error_msg}")
+            logger.warning("Step %d failed: %s", step_number, error_msg)
+            if apply_popup:
+                # Reported here; later steps must not apply them again
+                self.ixigo_test.popup_targets = {}
             
             return {
                 'step_number': step_number,
                 'element_name': step_info['element_name'],
                 'action_type': step_info['action_type'],
                 'xpath': step_info['xpath'],
-                'test_value': self.get_test_value(step_info['element_name'], test_data, step_info['action_type']),
+                'test_value': step_info.get('test_value') or self.get_test_value(
+                    step_info['element_name'], test_data, step_info['action_type']),
                 'expected_result': step_info.get('expected_result', ''),
                 'status': 'failed',
-                'error': error_msg
+                'error': error_msg,
+                'attempts': max(attempts, 1),
+                'duration': round(time.perf_counter() - step_start, 3)
             }
     
+    def skipped_step_result(self, step_info, test_data, step_number, reason):
+        """Result entry for a step the execution policy did not run"""
+        return {
+            'step_number': step_number,
+            'element_name': step_info['element_name'],
+            'action_type': step_info['action_type'],
+            'xpath': step_info['xpath'],
+            'test_value': step_info.get('test_value') or self.get_test_value(
+                step_info['element_name'], test_data, step_info['action_type']),
+            'expected_result': step_info.get('expected_result', ''),
+            'status': 'skipped',
+            'message': reason,
+            'duration': 0.0
+        }
+    
     def get_test_value(self, element_name, test_data, action_type):
         """
         Map element names to test data values based on your existing logic
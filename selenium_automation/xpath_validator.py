@@ -0,0 +1,164 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+
+# Same import convention as selenium_executor so both share dom_snapshots; the
+# repo root (config, database) is added too so the script can be run directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from database.db_operations import DatabaseOperations
+from dom_snapshots import DomSnapshotStore
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # Only needed for offline validation
+    etree = None
+    lxml_html = None
+
+logger = logging.getLogger(__name__)
+
+
+class XPathValidator:
+    """
+    Offline check of every stored locator against the latest DOM snapshots.
+
+    Each step's '|' alternatives are evaluated with lxml against the page
+    captured just before that step ran, without launching a browser.
+    Locators are reported as:
+      ok          - an alternative matches exactly one node
+      slow_fallback - works, but earlier alternatives miss and will each
+                      wait out the full find-element timeout first
+      ambiguous   - best alternative matches several nodes
+      broken      - no alternative matches
+      invalid     - no alternative matches and at least one does not compile
+      no_snapshot - nothing captured for this step yet
+    """
+
+    def __init__(self, db_ops=None, snapshot_store=None):
+        if etree is None:
+            raise RuntimeError("lxml is required for offline XPath validation (pip install lxml)")
+        self.config = Config()
+        self.db_ops = db_ops or DatabaseOperations()
+        self.snapshot_store = snapshot_store or DomSnapshotStore()
+        self._compiled = {}
+
+    def compile(self, xpath):
+        if xpath not in self._compiled:
+            try:
+                self._compiled[xpath] = etree.XPath(xpath)
+            except etree.XPathSyntaxError as e:
+                self._compiled[xpath] = e
+        return self._compiled[xpath]
+
+    def evaluate(self, tree, xpath):
+        """Return (status, match_count, error) for one alternative"""
+        compiled = self.compile(xpath)
+        if isinstance(compiled, Exception):
+            return 'invalid', 0, str(compiled)
+        try:
+            result = compiled(tree)
+        except etree.XPathError as e:
+            return 'invalid', 0, str(e)
+
+        count = len(result) if isinstance(result, list) else int(bool(result))
+        if count == 0:
+            return 'missing', 0, None
+        return ('ok' if count == 1 else 'ambiguous'), count, None
+
+    def validate_mode(self, mode):
+        """Validate every stored locator of one mode"""
+        steps_by_case = {}
+        for step in self.db_ops.get_all_test_steps(mode):
+            steps_by_case.setdefault(step['test_case_id'], []).append(step)
+
+        results = []
+        for test_case_id, steps in steps_by_case.items():
+            # Snapshots are keyed by execution position, as in SeleniumExecutor
+            for step_number, step in enumerate(steps, start=1):
+                if step['action_type'].upper() == 'OPEN_BROWSER' or not (step['xpath'] or '').strip():
+                    continue
+                results.append(self.validate_step(mode, test_case_id, step_number, step))
+        return results
+
+    def validate_step(self, mode, test_case_id, step_number, step):
+        report = {
+            'mode': mode,
+            'test_case_id': test_case_id,
+            'step_number': step_number,
+            'element_name': step['element_name'],
+            'action_type': step['action_type'],
+            'xpath': step['xpath'],
+        }
+
+        snapshot = self.snapshot_store.load(mode, test_case_id, step_number)
+        if snapshot is None:
+            report['status'] = 'no_snapshot'
+            return report
+
+        tree = lxml_html.fromstring(snapshot)
+        alternatives = []
+        for xpath in (alternative.strip() for alternative in step['xpath'].split('|')):
+            status, count, error = self.evaluate(tree, xpath)
+            alternative = {'xpath': xpath, 'status': status, 'matches': count}
+            if error:
+                alternative['error'] = error
+            alternatives.append(alternative)
+
+        report['alternatives'] = alternatives
+        report['status'] = self._overall_status(alternatives)
+        return report
+
+    def _overall_status(self, alternatives):
+        statuses = [alternative['status'] for alternative in alternatives]
+        if 'ok' in statuses:
+            first_hit = statuses.index('ok')
+            return 'slow_fallback' if 'missing' in statuses[:first_hit] else 'ok'
+        if 'ambiguous' in statuses:
+            return 'ambiguous'
+        if 'invalid' in statuses:
+            return 'invalid'
+        return 'broken'
+
+    def run(self, modes=None):
+        """Validate all modes and return a report with problem locators first"""
+        started = time.perf_counter()
+        results = []
+        for mode in modes or self.config.SUPPORTED_MODES:
+            results.extend(self.validate_mode(mode))
+
+        summary = {}
+        for result in results:
+            summary[result['status']] = summary.get(result['status'], 0) + 1
+
+        severity = ['broken', 'invalid', 'ambiguous', 'slow_fallback', 'no_snapshot', 'ok']
+        results.sort(key=lambda result: severity.index(result['status']))
+
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'elapsed_seconds': round(time.perf_counter() - started, 2),
+            'total_locators': len(results),
+            'summary': summary,
+            'locators': results,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate stored XPath locators against DOM snapshots")
+    parser.add_argument('--mode', action='append', help="Mode to validate (repeatable, default: all)")
+    parser.add_argument('--all', action='store_true', help="Include locators that are ok")
+    args = parser.parse_args()
+
+    report = XPathValidator().run(args.mode)
+    if not args.all:
+        report['locators'] = [result for result in report['locators'] if result['status'] != 'ok']
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Production entry point for the Ixigo Test Automation API.
+
+Runs the Flask app under gunicorn on Linux/macOS and under waitress on
+Windows, with worker counts, timeouts and keep-alive taken from Config.
+
+Examples:
+    python serve.py                          # all endpoints
+    python serve.py --role read --port 5001  # catalog/result reads only
+    python serve.py --role execute           # test execution only
+"""
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+
+logger = logging.getLogger('serve')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the Ixigo Test Automation API")
+    parser.add_argument('--role', choices=['all', 'read', 'execute'],
+                        help="Endpoints served by this process (default: SERVER_ROLE)")
+    parser.add_argument('--port', type=int, help="Port to bind (default: SERVER_PORT)")
+    parser.add_argument('--server', choices=['gunicorn', 'waitress'],
+                        help="WSGI server (default: waitress on Windows, gunicorn elsewhere)")
+    return parser.parse_args()
+
+
+def run_gunicorn():
+    from gunicorn.app.base import BaseApplication
+    import gunicorn_config
+
+    class IxigoApplication(BaseApplication):
+        def load_config(self):
+            for key in dir(gunicorn_config):
+                value = getattr(gunicorn_config, key)
+                if key in self.cfg.settings and value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            from app import app
+            return app
+
+    IxigoApplication().run()
+
+
+def run_waitress():
+    from waitress import create_server
+    from app import app, config, drain_in_flight_tests
+
+    server = create_server(
+        app,
+        host=config.SERVER_HOST,
+        port=config.SERVER_PORT,
+        threads=config.SERVER_THREADS,
+        backlog=config.SERVER_BACKLOG,
+        channel_timeout=config.SERVER_KEEPALIVE,
+        ident="ixigo-automation",
+    )
+
+    def shutdown():
+        remaining = drain_in_flight_tests(config.SERVER_GRACEFUL_TIMEOUT)
+        if remaining:
+            logger.warning("Shutting down with %d test(s) still running", remaining)
+        server.close()
+
+    def handle_signal(signum, frame):
+        logger.info("Received signal %s, draining in-flight tests", signum)
+        threading.Thread(target=shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+    if hasattr(signal, 'SIGBREAK'):
+        signal.signal(signal.SIGBREAK, handle_signal)
+
+    logger.info("Serving on http://%s:%s (role=%s, threads=%s)",
+                config.SERVER_HOST, config.SERVER_PORT, config.SERVER_ROLE, config.SERVER_THREADS)
+    server.run()
+
+
+def main():
+    args = parse_args()
+
+    # Config reads the environment at import time, so apply overrides first
+    if args.role:
+        os.environ['SERVER_ROLE'] = args.role
+    if args.port:
+        os.environ['SERVER_PORT'] = str(args.port)
+
+    server = args.server or ('waitress' if sys.platform == 'win32' else 'gunicorn')
+    if server == 'gunicorn':
+        run_gunicorn()
+    else:
+        run_waitress()
+
+
+if __name__ == '__main__':
+    main()
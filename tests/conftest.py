@@ -0,0 +1,8 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Same import convention as the app: selenium_automation modules by top-level name
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'selenium_automation'))
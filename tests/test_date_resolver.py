@@ -0,0 +1,46 @@
+from datetime import date
+
+import pytest
+
+from date_resolver import quick_date_labels, resolve_date
+
+TODAY = date(2025, 3, 10)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('Today', date(2025, 3, 10)),
+    ('tomorrow', date(2025, 3, 11)),
+    ('Day-After-Tomorrow', date(2025, 3, 12)),
+    ('+3', date(2025, 3, 13)),
+    ('today + 3', date(2025, 3, 13)),
+    ('10 days', date(2025, 3, 20)),
+    ('2025-04-01', date(2025, 4, 1)),
+    ('01/04/2025', date(2025, 4, 1)),
+    ('1 Apr 2025', date(2025, 4, 1)),
+    ('April 1, 2025', date(2025, 4, 1)),
+])
+def test_resolves_relative_and_absolute_dates(value, expected):
+    assert resolve_date(value, today=TODAY) == expected
+
+
+def test_yearless_date_is_the_next_occurrence():
+    assert resolve_date('15 Mar', today=TODAY) == date(2025, 3, 15)
+    assert resolve_date('1 Mar', today=TODAY) == date(2026, 3, 1)
+    assert resolve_date('10 Mar', today=TODAY) == TODAY
+
+
+def test_yearless_leap_day_rolls_forward_to_a_leap_year():
+    assert resolve_date('29 Feb', today=TODAY) == date(2028, 2, 29)
+    assert resolve_date('29 Feb', today=date(2024, 1, 5)) == date(2024, 2, 29)
+
+
+@pytest.mark.parametrize('value', ['', None, 'someday', '31 Feb', '2025-13-01'])
+def test_rejects_unrecognised_dates(value):
+    with pytest.raises(ValueError):
+        resolve_date(value, today=TODAY)
+
+
+def test_quick_date_labels():
+    assert quick_date_labels(TODAY, today=TODAY) == ['Today']
+    assert quick_date_labels(date(2025, 3, 12), today=TODAY) == ['Day After', 'Day After Tomorrow']
+    assert quick_date_labels(date(2025, 3, 20), today=TODAY) == []
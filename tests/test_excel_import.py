@@ -0,0 +1,97 @@
+import pytest
+
+pytest.importorskip('dotenv')
+pytest.importorskip('pyodbc')
+openpyxl = pytest.importorskip('openpyxl')
+
+from database.excel_operations import ExcelOperations
+
+HEADER = ['Test Case ID', 'Element', 'XPath', 'Action', 'Step']
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.log = log
+        self.fast_executemany = False
+
+    def execute(self, query, params):
+        self.log.append(('delete', query.split()[2], params[0]))
+
+    def executemany(self, query, batch):
+        table = query.split()[2]
+        self.log.extend(('insert', table, row[0]) for row in batch)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.log = []
+        self.outcome = None
+
+    def cursor(self):
+        return FakeCursor(self.log)
+
+    def commit(self):
+        self.outcome = 'commit'
+
+    def rollback(self):
+        self.outcome = 'rollback'
+
+    def close(self):
+        pass
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    def get_connection(self):
+        return self.conn
+
+
+def write_workbook(path, sheets):
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for title, rows in sheets.items():
+        sheet = workbook.create_sheet(title)
+        sheet.append(HEADER)
+        for row in rows:
+            sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+def test_replace_spans_sheets_of_the_same_mode(tmp_path):
+    path = write_workbook(tmp_path / 'steps.xlsx', {
+        'Flight': [['TC1', 'From', '//from', 'CLICK', 1], ['TC2', 'From', '//from', 'CLICK', 1]],
+        'Flight_More': [['TC1', 'To', '//to', 'CLICK', 2], ['TC2', 'To', '//to', 'NOPE', 2]],
+    })
+    db = FakeDatabase()
+
+    summary = ExcelOperations(db).import_test_cases(path)
+
+    # TC1 is deleted once, so the first sheet's rows survive the second sheet
+    assert db.conn.log == [
+        ('delete', 'Flight_TestCases', 'TC1'),
+        ('insert', 'Flight_TestCases', 'TC1'),
+        ('insert', 'Flight_TestCases', 'TC1'),
+    ]
+    # TC2's invalid row on the second sheet keeps its valid row on the first out
+    assert summary['skipped'] == 2
+    assert summary['sheets'] == {'Flight': {'mode': 'flight', 'inserted': 1},
+                                 'Flight_More': {'mode': 'flight', 'inserted': 1}}
+    assert db.conn.outcome == 'commit'
+
+
+def test_strict_rollback_reports_nothing_inserted(tmp_path):
+    path = write_workbook(tmp_path / 'steps.xlsx', {
+        'Flight': [['TC1', 'From', '//from', 'CLICK', 1]],
+        'Bus': [['TC9', 'From', '//from', 'CLICK', 'first']],
+    })
+    db = FakeDatabase()
+
+    summary = ExcelOperations(db).import_test_cases(path, strict=True)
+
+    assert summary['rolled_back']
+    assert summary['inserted'] == 0
+    assert all(sheet['inserted'] == 0 for sheet in summary['sheets'].values())
+    assert db.conn.outcome == 'rollback'
@@ -0,0 +1,82 @@
+import pytest
+
+from execution_policy import StepGate, parse_dependencies, parse_retry_limits, retry_delay
+
+
+def step(action_type, step_order, depends_on=None, step_group=None):
+    return {'action_type': action_type, 'step_order': step_order, 'depends_on': depends_on, 'step_group': step_group}
+
+
+def run(gate, steps, failing):
+    """Statuses of steps run through a gate, failing the given step orders"""
+    statuses = []
+    for number, current in enumerate(steps, start=1):
+        if gate.skip_reason(current, number):
+            status = 'skipped'
+        else:
+            status = 'failed' if current['step_order'] in failing else 'passed'
+        gate.record(current, number, status)
+        statuses.append(status)
+    return statuses
+
+
+BOOKING = [
+    step('OPEN_BROWSER', 1),
+    step('CLICK', 2),
+    step('CLICK_AND_SELECT', 3),
+    step('CLICK_AND_SELECT', 4),
+    step('CLICK', 5),
+]
+
+
+def test_continue_runs_every_step():
+    assert run(StepGate('continue'), BOOKING, {1}) == ['failed', 'passed', 'passed', 'passed', 'passed']
+
+
+def test_stop_on_failure_skips_everything_after_the_first_failure():
+    assert run(StepGate('stop_on_failure'), BOOKING, {2}) == ['passed', 'failed', 'skipped', 'skipped', 'skipped']
+
+
+def test_skip_dependents_skips_everything_after_a_failed_browser_step():
+    assert run(StepGate('skip_dependents'), BOOKING, {1}) == ['failed', 'skipped', 'skipped', 'skipped', 'skipped']
+
+
+def test_skip_dependents_skips_the_rest_of_the_form_after_a_form_step_fails():
+    assert run(StepGate('skip_dependents'), BOOKING, {3}) == ['passed', 'passed', 'failed', 'skipped', 'skipped']
+
+
+def test_skip_dependents_keeps_running_after_an_independent_click_fails():
+    assert run(StepGate('skip_dependents'), BOOKING, {2}) == ['passed', 'failed', 'passed', 'passed', 'passed']
+
+
+def test_skip_dependents_follows_declared_dependencies_and_groups():
+    steps = [
+        step('OPEN_BROWSER', 1),
+        step('CLICK_AND_SELECT', 2, step_group='popup'),
+        step('SELECT_COUNT', 3, step_group='popup'),
+        step('CLICK', 4, depends_on='2'),
+        step('CLICK', 5, depends_on='1'),
+        step('CLICK', 6, depends_on='popup'),
+    ]
+    assert run(StepGate('skip_dependents'), steps, {2}) == [
+        'passed', 'failed', 'skipped', 'skipped', 'passed', 'skipped'
+    ]
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        StepGate('sometimes')
+
+
+def test_parse_dependencies():
+    assert parse_dependencies('2, 3; Popup') == ({2, 3}, {'popup'})
+    assert parse_dependencies(None) == (set(), set())
+
+
+def test_parse_retry_limits_ignores_malformed_pairs():
+    assert parse_retry_limits('click:2, OPEN_BROWSER:1,bad,SELECT_COUNT:x,:3') == {'CLICK': 2, 'OPEN_BROWSER': 1}
+    assert parse_retry_limits('') == {}
+
+
+def test_retry_delay_doubles_up_to_the_cap():
+    assert [retry_delay(number, 0.5, 4) for number in range(1, 6)] == [0.5, 1.0, 2.0, 4, 4]
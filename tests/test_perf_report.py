@@ -0,0 +1,41 @@
+from execution.perf_report import compare_page_performance
+
+
+def sample(result_id, step_number=1, url='https://www.ixigo.com/search?q=1', **metrics):
+    return {'result_id': result_id, 'step_number': step_number, 'page_url': url, **metrics}
+
+
+def test_no_samples():
+    report = compare_page_performance([], 0.2)
+    assert report == {'latest_result_id': None, 'baseline_runs': 0, 'pages': [], 'regressions': []}
+
+
+def test_latest_run_is_compared_with_the_median_of_earlier_runs():
+    samples = [
+        sample(30, url='https://www.ixigo.com/search?q=3', load_ms=2000, ttfb_ms=300),
+        sample(20, load_ms=1000, ttfb_ms=290),
+        sample(10, load_ms=1200, ttfb_ms=280),
+        sample(5, load_ms=900, ttfb_ms=310),
+    ]
+    report = compare_page_performance(samples, 0.2)
+
+    assert report['latest_result_id'] == 30
+    assert report['baseline_runs'] == 3
+    [page] = report['pages']
+    assert page['path'] == '/search'
+    assert page['metrics']['load_ms'] == {'latest': 2000, 'baseline': 1000, 'delta': 1000, 'delta_pct': 1.0}
+    # ttfb moved by less than its floor, so only load time regressed
+    assert [regression['metric'] for regression in report['regressions']] == ['load_ms']
+
+
+def test_changes_below_the_relative_threshold_are_not_regressions():
+    samples = [sample(2, load_ms=1150), sample(1, load_ms=1000)]
+    assert compare_page_performance(samples, 0.2)['regressions'] == []
+
+
+def test_pages_without_history_have_no_baseline():
+    report = compare_page_performance([sample(2, step_number=4, load_ms=500), sample(1, load_ms=400)], 0.2)
+    [page] = report['pages']
+    assert page['step_number'] == 4
+    assert page['metrics']['load_ms']['baseline'] is None
+    assert report['regressions'] == []
@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+
+from execution.request_coalescer import RequestCoalescer
+
+
+def test_key_ignores_volatile_keys_mode_case_and_key_order():
+    key = RequestCoalescer.make_key('Flight', 'TC1', {'from': 'DEL', 'to': 'BOM', 'noCache': True})
+    assert key == RequestCoalescer.make_key('flight', 'TC1', {'to': 'BOM', 'from': 'DEL', 'mode': 'flight'})
+    assert key != RequestCoalescer.make_key('flight', 'TC1', {'from': 'DEL', 'to': 'GOI'})
+
+
+def test_concurrent_identical_requests_share_one_run():
+    coalescer = RequestCoalescer()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def execute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'status': 'passed'}
+
+    sources = []
+    owner = threading.Thread(target=lambda: sources.append(coalescer.run('key', execute)[1]))
+    owner.start()
+    started.wait(5)
+    waiter = threading.Thread(target=lambda: sources.append(coalescer.run('key', execute)[1]))
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    owner.join(5)
+    waiter.join(5)
+
+    assert len(calls) == 1
+    assert sorted(sources) == ['coalesced', 'executed']
+
+
+def test_cached_results_are_copies_and_errors_are_not_cached():
+    coalescer = RequestCoalescer(ttl_seconds=60)
+    result, source = coalescer.run('key', lambda: {'status': 'passed', 'steps': []})
+    result['steps'].append('changed')
+
+    cached, source = coalescer.run('key', lambda: pytest.fail("should be cached"))
+    assert source == 'cached'
+    assert cached == {'status': 'passed', 'steps': []}
+
+    coalescer.run('broken', lambda: {'status': 'error'})
+    assert coalescer.run('broken', lambda: {'status': 'passed'}) == ({'status': 'passed'}, 'executed')
+    assert coalescer.run('key', lambda: {}, use_cache=False)[1] == 'executed'
+
+
+def test_exceptions_propagate_and_clear_the_in_flight_run():
+    coalescer = RequestCoalescer()
+
+    def explode():
+        raise RuntimeError("browser crashed")
+
+    with pytest.raises(RuntimeError):
+        coalescer.run('key', explode)
+    assert coalescer.run('key', lambda: {'status': 'passed'})[1] == 'executed'
@@ -0,0 +1,54 @@
+import pytest
+
+pytest.importorskip('dotenv')
+pytest.importorskip('pyodbc')
+pytest.importorskip('selenium')
+
+from execution.suite_scheduler import SuiteScheduler, parse_execution_time
+
+
+class FakeHistory:
+    def __init__(self, history, step_counts):
+        self.history = history
+        self.step_counts = step_counts
+
+    def get_execution_history(self, mode, test_case_ids, runs_per_case):
+        return self.history
+
+    def get_available_test_cases(self, mode):
+        return [{'test_case_id': case, 'step_count': count} for case, count in self.step_counts.items()]
+
+
+def test_parse_execution_time():
+    assert parse_execution_time('0:01:23.500000') == 83.5
+    assert parse_execution_time('1 day, 2:00:00') == 93600
+    assert parse_execution_time('soon') is None
+    assert parse_execution_time(None) is None
+
+
+def test_plan_orders_longest_first_onto_the_least_loaded_slot():
+    estimates = {case: {'seconds': seconds} for case, seconds in {'a': 3, 'b': 10, 'c': 6, 'd': 5}.items()}
+    order, makespan, assignment = SuiteScheduler(db_ops=object()).plan(estimates, 2)
+
+    assert order == ['b', 'c', 'd', 'a']
+    assert assignment['b'] != assignment['c']
+    assert assignment['d'] == assignment['c']
+    assert assignment['a'] == assignment['b']
+    assert makespan == 13
+
+
+def test_estimates_prefer_runs_then_steps_then_the_default():
+    history = {
+        'runs': [{'execution_time': '0:00:40', 'total_steps': 4, 'step_results': []},
+                 {'execution_time': '0:00:60', 'total_steps': 3, 'step_results': []},
+                 {'execution_time': '0:00:50', 'total_steps': 4, 'step_results': []}],
+        'steps': [{'execution_time': '0:00:30', 'total_steps': 2, 'step_results': [
+            {'step_number': 1, 'duration': 4.0}, {'step_number': 2, 'duration': 6.0}]}],
+    }
+    scheduler = SuiteScheduler(db_ops=FakeHistory(history, {'runs': 4, 'steps': 3, 'new': 2}))
+    estimates = scheduler.estimate_costs('flight', ['runs', 'steps', 'new'])
+
+    assert estimates['runs'] == {'seconds': 45.0, 'basis': 'runs', 'samples': 2}
+    # Step 3 is new, so it is costed at the median duration of all recorded steps
+    assert estimates['steps'] == {'seconds': 15.0, 'basis': 'steps', 'samples': 1}
+    assert estimates['new'] == {'seconds': 10.0, 'basis': 'default', 'samples': 0}
@@ -0,0 +1,87 @@
+import pytest
+
+pytest.importorskip('dotenv')
+pytest.importorskip('selenium')
+pytest.importorskip('webdriver_manager')
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+from IxigoTestClass import IxigoTestClass
+from selenium_executor import SeleniumExecutor, is_transient_step_error
+
+
+class FakePopupDriver:
+    """Applies nothing, so the popup always reads back the given counts"""
+
+    current_url = 'https://www.ixigo.com/'
+
+    def __init__(self, counts, stale_calls=0):
+        self.counts = counts
+        self.stale_calls = stale_calls
+        self.apply_calls = 0
+
+    def execute_async_script(self, script, *args):
+        self.apply_calls += 1
+        if self.apply_calls <= self.stale_calls:
+            raise StaleElementReferenceException('popup re-rendered')
+        return {'ok': True, 'errors': []}
+
+    def execute_script(self, script, *args):
+        return {'counts': dict(self.counts), 'child_ages': [], 'travel_class': None}
+
+
+def make_executor(counts, retries, stale_calls=0):
+    executor = SeleniumExecutor()
+    executor.retry_limits = {'CLICK': retries}
+    executor.ixigo_test = IxigoTestClass()
+    executor.ixigo_test.driver = FakePopupDriver(counts, stale_calls)
+    executor.ixigo_test.is_session_alive = lambda: True
+    executor.ixigo_test.pause = lambda seconds: None
+    return executor
+
+
+ADULTS_STEP = {'element_name': 'AdultsCount', 'xpath': '//adults', 'action_type': 'SELECT_COUNT', 'test_value': '2'}
+DONE_STEP = {'element_name': 'DoneButton', 'xpath': '//done', 'action_type': 'CLICK', 'test_value': 'Done'}
+
+
+def test_retried_popup_step_still_fails_when_the_popup_is_wrong():
+    executor = make_executor({'adult': 1}, retries=2, stale_calls=1)
+
+    assert executor.execute_database_step(ADULTS_STEP, {}, 1)['status'] == 'passed'
+    result = executor.execute_database_step(DONE_STEP, {}, 2, apply_popup=True)
+
+    assert result['status'] == 'failed'
+    # The stale popup is retried, the wrong counts are not
+    assert result['attempts'] == 2
+    assert 'adult is 1, expected 2' in result['error']
+    # The retry applied the targets again instead of passing with nothing to apply
+    assert executor.ixigo_test.driver.apply_calls == 2
+    assert executor.ixigo_test.popup_targets == {}
+
+
+def test_only_transient_webdriver_errors_are_retried():
+    try:
+        try:
+            raise StaleElementReferenceException('gone')
+        except StaleElementReferenceException as e:
+            raise Exception(f"Could not click: {e}")
+    except Exception as wrapped:
+        assert is_transient_step_error(wrapped)
+
+    assert not is_transient_step_error(RuntimeError("Element not found with any XPath: //missing"))
+    assert not is_transient_step_error(ValueError("Invalid date"))
+
+
+def test_popup_targets_are_applied_by_the_last_popup_step():
+    executor = make_executor({'adult': 2}, retries=0)
+    steps = [ADULTS_STEP, {**ADULTS_STEP, 'element_name': 'ChildrenCount'}, DONE_STEP,
+             {'element_name': 'Search', 'xpath': '//search', 'action_type': 'CLICK'}]
+
+    assert [executor.closes_traveller_popup(steps, index) for index in range(len(steps))] == [
+        False, False, True, False
+    ]
+    assert executor.closes_traveller_popup(steps[:2], 1)
+
+    executor.execute_database_step(ADULTS_STEP, {}, 1, apply_popup=True)
+    assert executor.ixigo_test.driver.apply_calls == 1
+    assert executor.ixigo_test.popup_targets == {}
@@ -0,0 +1,169 @@
+"""
+Standalone test worker for the DB-backed job queue.
+
+Each worker claims queued jobs from test_jobs, runs them through one
+RunPipeline per browser slot and stores the results, so browser capacity
+can be added by starting workers on more machines. Claimed jobs are leased; the worker
+extends the leases on every heartbeat, and any worker requeues jobs whose
+lease expired because their worker died.
+
+Usage:
+    python worker.py                 # capacity from WORKER_CAPACITY
+    python worker.py --capacity 4
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import uuid
+
+from config import Config
+from database.db_operations import DatabaseOperations
+from execution.pipeline import RunPipeline
+from logging_config import setup_logging
+from selenium_automation.selenium_executor import ResourceGovernor
+
+logger = logging.getLogger('worker')
+
+
+class TestWorker:
+    def __init__(self, capacity=None):
+        self.config = Config()
+        self.capacity = capacity or self.config.WORKER_CAPACITY
+        self.hostname = socket.gethostname()
+        self.worker_id = f"{self.hostname}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.db_ops = DatabaseOperations()
+        self.stopping = threading.Event()
+        # Heartbeats continue while running jobs drain, so their leases stay valid
+        self.stopped = threading.Event()
+        self.active_jobs = {}
+        self.active_lock = threading.Lock()
+        self.slot_threads = []
+
+    def start(self):
+        """Register the worker and start one thread per browser slot"""
+        self.db_ops.ensure_job_tables()
+        self.heartbeat()
+
+        for slot in range(self.capacity):
+            thread = threading.Thread(target=self.run_slot, name=f"slot-{slot + 1}", daemon=True)
+            thread.start()
+            self.slot_threads.append(thread)
+
+        threading.Thread(target=self.heartbeat_loop, name="heartbeat", daemon=True).start()
+        logger.info("Worker %s started with capacity %d", self.worker_id, self.capacity)
+
+    def stop(self, timeout=None):
+        """Stop claiming jobs and wait for running ones to finish"""
+        self.stopping.set()
+        for thread in self.slot_threads:
+            thread.join(timeout)
+
+        # A job still running past the timeout may still be driving its browser,
+        # so it is failed rather than handed to another worker
+        with self.active_lock:
+            unfinished = list(self.active_jobs)
+        self.stopped.set()
+        for job_id in unfinished:
+            self.db_ops.complete_job(job_id, self.worker_id, 'failed',
+                                     error="Worker stopped before the test finished")
+
+        self.db_ops.unregister_worker(self.worker_id)
+        logger.info("Worker %s stopped (%d unfinished job(s) failed)", self.worker_id, len(unfinished))
+
+    def run_slot(self):
+        """
+        Run jobs back to back, claiming each only when the slot is free and
+        fetching the steps of the likely next job while the current one runs.
+        Every slot already runs a browser, so slots never pre-warm another one.
+        """
+        pipeline = RunPipeline(db_ops=self.db_ops)
+        try:
+            pipeline.run_lane(self.take_job, self.finish_job,
+                              should_stop=self.stopping.is_set, peek_job=self.db_ops.peek_job)
+        finally:
+            # Waits for the last result to be stored and its job completed
+            pipeline.close()
+
+    def take_job(self):
+        """Claim the next job, polling until one is available or the worker stops"""
+        governor = ResourceGovernor.instance()
+        while not self.stopping.is_set():
+            # Leave jobs for other nodes while this host is short on memory
+            if governor.has_capacity():
+                job = self.db_ops.claim_job(self.worker_id, self.config.JOB_LEASE_SECONDS)
+                if job is not None:
+                    with self.active_lock:
+                        self.active_jobs[job['job_id']] = job
+                    logger.info("Claimed job %s: %s - %s (attempt %d)",
+                                job['job_id'], job['test_case_id'], job['mode'], job['attempts'])
+                    return job
+            self.stopping.wait(self.config.JOB_POLL_SECONDS)
+        return None
+
+    def finish_job(self, prepared, test_result, result_id):
+        """Record the outcome of a job once its result has been stored"""
+        job = prepared.job
+        job_id = job['job_id']
+        try:
+            if prepared.error:
+                self.db_ops.complete_job(job_id, self.worker_id, 'failed', error=prepared.error)
+            elif test_result is None:
+                self.db_ops.complete_job(
+                    job_id, self.worker_id, 'failed',
+                    error=f"No XPath data found for test case '{job['test_case_id']}' and mode '{job['mode']}'"
+                )
+            elif not self.db_ops.complete_job(job_id, self.worker_id, 'completed', result_id=result_id,
+                                              error=test_result.get('error')):
+                logger.warning("Lease on job %s was lost before completion", job_id)
+        finally:
+            with self.active_lock:
+                self.active_jobs.pop(job_id, None)
+
+    def heartbeat(self):
+        with self.active_lock:
+            job_ids = list(self.active_jobs)
+
+        self.db_ops.register_worker(self.worker_id, self.hostname, self.capacity, len(job_ids))
+        held = self.db_ops.extend_job_leases(job_ids, self.worker_id, self.config.JOB_LEASE_SECONDS)
+        for job_id in set(job_ids) - set(held):
+            logger.warning("Lost lease on job %s; it may be rerun by another worker", job_id)
+
+        self.db_ops.requeue_expired_jobs()
+
+    def heartbeat_loop(self):
+        while not self.stopped.wait(self.config.WORKER_HEARTBEAT_SECONDS):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                logger.error("Heartbeat failed: %s", e)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued Ixigo tests")
+    parser.add_argument('--capacity', type=int, help="Concurrent browser sessions (default: WORKER_CAPACITY)")
+    args = parser.parse_args()
+
+    setup_logging()
+    worker = TestWorker(capacity=args.capacity)
+    stopped = threading.Event()
+
+    def handle_signal(signum, frame):
+        logger.info("Received signal %s, finishing running jobs", signum)
+        stopped.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+    if hasattr(signal, 'SIGBREAK'):
+        signal.signal(signal.SIGBREAK, handle_signal)
+
+    worker.start()
+    while not stopped.wait(1):
+        pass
+    worker.stop(timeout=worker.config.SERVER_GRACEFUL_TIMEOUT)
+
+
+if __name__ == '__main__':
+    main()